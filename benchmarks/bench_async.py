@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Latency and throughput of ``AsyncChikkar`` under a local load generator, against calling ``Chikkar.find`` in the loop.
+
+Each client sends its queries one after another, as request handlers of an asyncio web server would.
+The loop lag is the longest delay of a 1 ms timer during the run, i.e. how long the loop was blocked.
+
+Usage: python -m benchmarks.bench_async [--groups N] [--requests N] [--clients N [N ...]] [--window SEC]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chikkarpy import AsyncChikkar, Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+async def _client(find, queries, latencies):
+    for query in queries:
+        start = time.perf_counter()
+        await find(query)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _ticker(lags, stopped):
+    while not stopped.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _load(find, queries, n_clients):
+    latencies = []
+    lags = []
+    stopped = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(lags, stopped))
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(find, queries[i::n_clients], latencies) for i in range(n_clients)])
+    elapsed = time.perf_counter() - start
+    stopped.set()
+    await ticker
+    return elapsed, sorted(latencies), max(lags)
+
+
+def _percentile(latencies, p):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 16, 256])
+    parser.add_argument('--window', type=float, default=0.001)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        queries = zipf_queries(head_words, args.requests)
+        dictionary = Dictionary(dic_path, cache_size=args.cache_size)
+        chikkar = Chikkar()
+        chikkar.add_dictionary(dictionary)
+
+        async def blocking_find(query):
+            return chikkar.find(query)
+
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(1)
+        print('groups: {}, requests: {}, window: {} ms'.format(args.groups, args.requests, args.window * 1e3))
+        print('{:>8} {:>10} {:>14} {:>10} {:>10} {:>12}'.format(
+            'clients', 'mode', 'requests/sec', 'p50 ms', 'p99 ms', 'loop lag ms'))
+        for n_clients in args.clients:
+            async_chikkar = AsyncChikkar(chikkar, window=args.window, executor=executor)
+            for mode, find in (('blocking', blocking_find), ('batched', async_chikkar.find)):
+                elapsed, latencies, lag = loop.run_until_complete(_load(find, queries, n_clients))
+                print('{:>8} {:>10} {:>14,.0f} {:>10.3f} {:>10.3f} {:>12.3f}'.format(
+                    n_clients, mode, args.requests / elapsed, _percentile(latencies, 0.5), _percentile(latencies, 0.99),
+                    lag * 1e3))
+            loop.run_until_complete(async_chikkar.close())
+        executor.shutdown()
+        loop.close()
+        dictionary.close()
+
+
+if __name__ == '__main__':
+    main()
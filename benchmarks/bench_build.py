@@ -0,0 +1,82 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Build time and peak RSS of ``DictionaryBuilder`` and ``StreamingDictionaryBuilder`` on a synthetic input.
+
+Each build runs in a fresh process so that its peak RSS is measured alone.
+
+Usage: python -m benchmarks.bench_build [--groups N] [--spill-size N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from chikkarpy.dictionarylib.dictionaryheader import DictionaryHeader
+from chikkarpy.dictionarylib.streamingdictionarybuilder import DEFAULT_SPILL_SIZE, StreamingDictionaryBuilder
+
+from .common import build, generate_csv
+
+
+def _build_in_child(csv_path, dic_path, streaming, spill_size):
+    start = time.perf_counter()
+    if streaming:
+        build(csv_path, dic_path, builder_class=StreamingDictionaryBuilder, spill_size=spill_size)
+    else:
+        build(csv_path, dic_path)
+    elapsed = time.perf_counter() - start
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return elapsed, max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=1000000)
+    parser.add_argument('--spill-size', type=int, default=DEFAULT_SPILL_SIZE)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        rows = len(generate_csv(csv_path, args.groups))
+        print('groups: {}, rows: {}, input: {:,.1f} MiB, spill size: {}'.format(
+            args.groups, rows, os.path.getsize(csv_path) / (1 << 20), args.spill_size))
+
+        paths = []
+        for streaming in (False, True):
+            dic_path = os.path.join(work_dir, 'streaming.dic' if streaming else 'default.dic')
+            with context.Pool(1) as pool:
+                elapsed, max_rss = pool.apply(_build_in_child, (csv_path, dic_path, streaming, args.spill_size))
+            paths.append(dic_path)
+            print('{:<10} {:>8.1f} s {:>10,.1f} MiB peak RSS'.format(
+                'streaming' if streaming else 'default', elapsed, max_rss / (1 << 20)))
+        # the headers differ only in their timestamps
+        print('same output:', _same_body(*paths))
+
+
+def _same_body(path1, path2):
+    with open(path1, 'rb') as f1, open(path2, 'rb') as f2:
+        data1 = f1.read()
+        data2 = f2.read()
+    header_size = DictionaryHeader.from_bytes(data1, 0).storage_size()
+    return data1[header_size:] == data2[header_size:]
+
+
+if __name__ == '__main__':
+    main()
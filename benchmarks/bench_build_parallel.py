@@ -0,0 +1,52 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Build time of ``DictionaryBuilder`` against the number of parsing processes (``build -j``).
+
+Usage: python -m benchmarks.bench_build_parallel [--groups N] [--processes N [N ...]]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from .common import build, generate_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=200000)
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        rows = len(generate_csv(csv_path, args.groups))
+        print('groups: {}, rows: {}, cpus: {}'.format(args.groups, rows, os.cpu_count()))
+
+        serial = None
+        for processes in args.processes:
+            dic_path = os.path.join(work_dir, 'bench{}.dic'.format(processes))
+            start = time.perf_counter()
+            build(csv_path, dic_path, processes=processes)
+            elapsed = time.perf_counter() - start
+            serial = serial or elapsed
+            print('-j {:<3} {:>8.2f} s {:>12,.0f} rows/sec {:>6.2f}x'.format(
+                processes, elapsed, rows / elapsed, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Expansion of group IDs of tokens: ``Chikkar.find`` per token vs. ``BulkExpander.expand`` on NumPy arrays.
+
+Usage: python -m benchmarks.bench_bulk [--groups N] [--tokens N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.bulk import BulkExpander
+from chikkarpy.dictionarylib import Dictionary
+
+import numpy as np
+
+from .common import build, generate_csv, zipf_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--tokens', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        dic_path = os.path.join(work_dir, 'bench.dic')
+        generate_csv(csv_path, args.groups)
+        build(csv_path, dic_path)
+        with open(csv_path, encoding='utf-8') as f:
+            pairs = [(line.split(',')[8], int(line.split(',')[0])) for line in f if line.strip()]
+        # (word, group ID) pairs of a corpus, as a morphological analyzer would give
+        tokens = zipf_queries(pairs, args.tokens, oov_rate=0.0)
+        words = [word for word, _ in tokens]
+        group_ids = np.array([group_id for _, group_id in tokens], dtype=np.int32)
+
+        dictionary = Dictionary(dic_path)
+        chikkar = Chikkar()
+        chikkar.add_dictionary(dictionary)
+        start = time.perf_counter()
+        expected = [chikkar.find(word, group_ids=[group_id]) for word, group_id in tokens]
+        per_token = time.perf_counter() - start
+
+        expander = BulkExpander(dictionary)
+        start = time.perf_counter()
+        # the vocabulary of the corpus is mapped once, and the tokens index it
+        vocabulary, inverse = np.unique(np.array(words), return_inverse=True)
+        word_ids = expander.word_ids(vocabulary.tolist())[inverse]
+        mapped = time.perf_counter() - start
+        start = time.perf_counter()
+        offsets, ids = expander.expand(group_ids, word_ids=word_ids)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        offsets, ids = expander.expand(group_ids, word_ids=word_ids)
+        warm = time.perf_counter() - start
+
+        sample = range(0, args.tokens, max(1, args.tokens // 1000))
+        assert all([expander.vocabulary[k] for k in ids[offsets[i]:offsets[i + 1]]] == expected[i] for i in sample)
+        del expander
+        dictionary.close()
+
+    print('groups: {}, tokens: {}'.format(args.groups, args.tokens))
+    print('find per token       {:>12,.0f} tokens/s'.format(args.tokens / per_token))
+    print('map the vocabulary   {:>12.3f} s'.format(mapped))
+    print('expand (cold)        {:>12,.0f} tokens/s  {:.1f}x'.format(args.tokens / first, per_token / first))
+    print('expand (warm)        {:>12,.0f} tokens/s  {:.1f}x'.format(args.tokens / warm, per_token / warm))
+
+
+if __name__ == '__main__':
+    main()
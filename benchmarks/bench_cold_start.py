@@ -0,0 +1,79 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import time of chikkarpy and the latency of the first query in a fresh interpreter, as a CLI or serverless call pays.
+
+Usage: python -m benchmarks.bench_cold_start [--groups N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from .common import prepare_dictionary
+
+# run in a fresh interpreter for each measurement
+_CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+imported = time.perf_counter()
+dictionary = Dictionary(sys.argv[1])
+chikkar = Chikkar()
+chikkar.add_dictionary(dictionary)
+opened = time.perf_counter()
+chikkar.find(sys.argv[2])
+found = time.perf_counter()
+chikkar.find(sys.argv[2], group_ids=[int(sys.argv[3])])
+found_by_id = time.perf_counter()
+print(json.dumps({'import': imported - start, 'open': opened - imported,
+                  'first find': found - opened, 'first find by group ID': found_by_id - found,
+                  'modules': len(sys.modules)}))
+'''
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=300000)
+    parser.add_argument('--runs', type=int, default=11)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root] + [p for p in [os.environ.get('PYTHONPATH')] if p]))
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        with open(os.path.join(work_dir, 'bench.csv'), encoding='utf-8') as f:
+            word, group_id = next((line.split(',')[8], line.split(',')[0]) for line in f if line.strip())
+        runs = []
+        for _ in range(args.runs):
+            output = subprocess.check_output([sys.executable, '-c', _CHILD, dic_path, word, group_id], env=env)
+            runs.append(json.loads(output.decode('utf-8')))
+
+    print('groups: {}, median of {} runs'.format(args.groups, args.runs))
+    for name in ('import', 'open', 'first find', 'first find by group ID'):
+        print('{:<24} {:>10.3f} ms'.format(name, _median([run[name] for run in runs]) * 1e3))
+    print('{:<24} {:>10}'.format('modules loaded', _median([run['modules'] for run in runs])))
+
+
+if __name__ == '__main__':
+    main()
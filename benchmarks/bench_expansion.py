@@ -0,0 +1,75 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""``Chikkar.find`` on a version-1 dictionary vs. a version-2 dictionary with the expansion table.
+
+Usage: python -m benchmarks.bench_expansion [--groups N] [--queries N]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import build, generate_csv, zipf_queries
+
+
+def _measure(dic_path, queries, cache_size, enable_verb):
+    dictionary = Dictionary(dic_path, cache_size=cache_size)
+    chikkar = Chikkar()
+    if enable_verb:
+        chikkar.enable_verb()
+    chikkar.add_dictionary(dictionary)
+    start = time.perf_counter()
+    results = [chikkar.find(query) for query in queries]
+    elapsed = time.perf_counter() - start
+    dictionary.close()
+    return len(queries) / elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        head_words = generate_csv(csv_path, args.groups)
+        v1 = os.path.join(work_dir, 'v1.dic')
+        v2 = os.path.join(work_dir, 'v2.dic')
+        build(csv_path, v1)
+        build(csv_path, v2, expansion_table=True)
+        queries = zipf_queries(head_words, args.queries)
+
+        print('groups: {}, queries: {}'.format(args.groups, args.queries))
+        print('file size: v1 {:,} bytes, v2 {:,} bytes'.format(os.path.getsize(v1), os.path.getsize(v2)))
+        for enable_verb in (False, True):
+            for cache_size in (0, 1024):
+                before, expected = _measure(v1, queries, cache_size, enable_verb)
+                after, results = _measure(v2, queries, cache_size, enable_verb)
+                assert results == expected
+                print('verb={!s:<5} cache={:<5} v1 {:>10,.0f} q/s  v2 {:>10,.0f} q/s  {:.1f}x'.format(
+                    enable_verb, cache_size, before, after, after / before))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Searches UTF-8 tokens with ``find_bytes`` vs. decoding them and calling ``find``.
+
+Usage: python -m benchmarks.bench_find_bytes [--groups N] [--queries N] [--cache-size N]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def _measure(chikkar, queries, use_bytes):
+    start = time.perf_counter()
+    if use_bytes:
+        results = [chikkar.find_bytes(query) for query in queries]
+    else:
+        # a tokenizer handing out UTF-8 surfaces makes the caller decode them first
+        results = [chikkar.find(query.decode('utf-8')) for query in queries]
+    elapsed = time.perf_counter() - start
+    return len(queries) / elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200000)
+    parser.add_argument('--cache-size', type=int, default=4096)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        queries = [query.encode('utf-8') for query in zipf_queries(head_words, args.queries)]
+        dictionary = Dictionary(dic_path)
+        chikkar = Chikkar(result_cache_size=args.cache_size)
+        chikkar.add_dictionary(dictionary)
+
+        print('groups: {}, queries: {}, result cache: {}'.format(args.groups, args.queries, args.cache_size))
+        before, expected = _measure(chikkar, queries, False)
+        after, results = _measure(chikkar, queries, True)
+        assert results == expected
+        info = chikkar.result_cache_info()
+        print('find {:>10,.0f} q/s  find_bytes {:>10,.0f} q/s  {:.1f}x  hit rate {:.1%}'.format(
+            before, after, after / before, info.hits / max(1, info.hits + info.misses)))
+        dictionary.close()
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
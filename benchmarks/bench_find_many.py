@@ -0,0 +1,65 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""``Chikkar.find_many`` vs. a Python loop over ``Chikkar.find`` on a Zipfian token stream.
+
+Usage: python -m benchmarks.bench_find_many [--groups N] [--tokens N] [--cache-size N]
+"""
+
+import argparse
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--tokens', type=int, default=200000)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        tokens = zipf_queries(head_words, args.tokens)
+        dictionary = Dictionary(dic_path, cache_size=args.cache_size)
+        chikkar = Chikkar()
+        chikkar.add_dictionary(dictionary)
+
+        chikkar.find_many(tokens)
+
+        start = time.perf_counter()
+        expected = [chikkar.find(token) for token in tokens]
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = chikkar.find_many(tokens)
+        batch = time.perf_counter() - start
+
+        assert results == expected
+        dictionary.close()
+
+    print('groups: {}, tokens: {}, distinct: {}, cache size: {}'.format(
+        args.groups, args.tokens, len(set(tokens)), args.cache_size))
+    print('find loop : {:>12,.0f} tokens/sec'.format(args.tokens / loop))
+    print('find_many : {:>12,.0f} tokens/sec'.format(args.tokens / batch))
+    print('speedup   : {:>12.1f}x'.format(loop / batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Searches by group IDs through the group index vs. decoding whole groups with ``SynonymGroupList``.
+
+Usage: python -m benchmarks.bench_group_index [--groups N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import build, generate_csv
+
+
+def _read_queries(csv_path, n, seed=0):
+    """Samples (head word, group ID) pairs as a morphological analyzer would pass them."""
+    with open(csv_path, encoding='utf-8') as f:
+        pairs = [(line.split(',')[8], int(line.split(',')[0])) for line in f if line.strip()]
+    rng = random.Random(seed)
+    return [rng.choice(pairs) for _ in range(n)]
+
+
+def _measure_groups(dic_path, group_ids, members):
+    dictionary = Dictionary(dic_path, cache_size=0)
+    get = dictionary.get_group_members if members else dictionary.get_synonym_group
+    start = time.perf_counter()
+    for group_id in group_ids:
+        get(group_id)
+    elapsed = time.perf_counter() - start
+    dictionary.close()
+    return len(group_ids) / elapsed
+
+
+def _measure_find(dic_path, queries, cache_size):
+    dictionary = Dictionary(dic_path, cache_size=cache_size)
+    chikkar = Chikkar()
+    chikkar.add_dictionary(dictionary)
+    start = time.perf_counter()
+    results = [chikkar.find(word, group_ids=[group_id]) for word, group_id in queries]
+    elapsed = time.perf_counter() - start
+    dictionary.close()
+    return len(queries) / elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        generate_csv(csv_path, args.groups)
+        v1 = os.path.join(work_dir, 'v1.dic')
+        indexed = os.path.join(work_dir, 'indexed.dic')
+        build(csv_path, v1)
+        build(csv_path, indexed, group_index=True)
+        queries = _read_queries(csv_path, args.queries)
+        group_ids = [group_id for _, group_id in queries]
+
+        print('groups: {}, queries: {}'.format(args.groups, args.queries))
+        print('file size: v1 {:,} bytes, with the group index {:,} bytes'.format(
+            os.path.getsize(v1), os.path.getsize(indexed)))
+        before = _measure_groups(v1, group_ids, False)
+        after = _measure_groups(indexed, group_ids, True)
+        print('decode     get_synonym_group {:>10,.0f} groups/s  get_group_members {:>10,.0f} groups/s  {:.1f}x'.format(
+            before, after, after / before))
+        for cache_size in (0, 1024):
+            before, expected = _measure_find(v1, queries, cache_size)
+            after, results = _measure_find(indexed, queries, cache_size)
+            assert results == expected
+            print('find cache={:<5} v1 {:>10,.0f} q/s  group index {:>10,.0f} q/s  {:.1f}x'.format(
+                cache_size, before, after, after / before))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A full build vs. an incremental build (``build -b``) for a few hundred changed groups.
+
+Usage: python -m benchmarks.bench_incremental [--groups N] [--changes N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from chikkarpy.dictionarylib.dictionaryheader import DictionaryHeader
+from chikkarpy.dictionarylib.incrementaldictionarybuilder import IncrementalDictionaryBuilder
+
+from .common import build, generate_csv
+
+
+def _read_blocks(path):
+    with open(path, encoding='utf-8') as rf:
+        return [block for block in rf.read().split('\n\n') if block.strip()]
+
+
+def _write_blocks(path, blocks):
+    with open(path, 'w', encoding='utf-8') as wf:
+        for block in blocks:
+            wf.write(block.strip('\n') + '\n\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=200000)
+    parser.add_argument('--changes', type=int, default=300, help='the numbers of changed, added and removed groups')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as work_dir:
+        base_csv = os.path.join(work_dir, 'base.csv')
+        base_dic = os.path.join(work_dir, 'base.dic')
+        generate_csv(base_csv, args.groups)
+        build(base_csv, base_dic)
+
+        blocks = _read_blocks(base_csv)
+        new_csv = os.path.join(work_dir, 'new.csv')
+        generate_csv(new_csv, 2 * args.changes, seed=1, group_id_base=1)
+        new_blocks = _read_blocks(new_csv)
+        changed = new_blocks[:args.changes]
+        added = [block.replace('{:06d},'.format(i + 1), '{:06d},'.format(args.groups + i + 1))
+                 for i, block in enumerate(new_blocks[args.changes:], args.changes)]
+        changed_ids = {int(block.split(',', 1)[0]) for block in changed}
+        removed_ids = set(rng.sample([gid for gid in range(1, args.groups + 1) if gid not in changed_ids], args.changes))
+
+        merged = []
+        for block in blocks:
+            group_id = int(block.split(',', 1)[0])
+            if group_id in removed_ids:
+                continue
+            merged.append(changed[group_id - 1] if group_id in changed_ids else block)
+        full_csv = os.path.join(work_dir, 'full.csv')
+        _write_blocks(full_csv, merged + added)
+        changes_csv = os.path.join(work_dir, 'changes.csv')
+        _write_blocks(changes_csv, changed + added)
+
+        start = time.perf_counter()
+        build(full_csv, os.path.join(work_dir, 'full.dic'))
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build(changes_csv, os.path.join(work_dir, 'updated.dic'), builder_class=IncrementalDictionaryBuilder,
+              base_path=base_dic, removed_group_ids=removed_ids)
+        incremental = time.perf_counter() - start
+
+        with open(os.path.join(work_dir, 'full.dic'), 'rb') as f1, open(os.path.join(work_dir, 'updated.dic'), 'rb') as f2:
+            data1 = f1.read()
+            data2 = f2.read()
+        # the headers differ only in their timestamps
+        header_size = DictionaryHeader.from_bytes(data1, 0).storage_size()
+        same = data1[header_size:] == data2[header_size:]
+
+    print('groups: {}, changed/added/removed: {} each'.format(args.groups, args.changes))
+    print('full build        : {:>8.2f} s'.format(full))
+    print('incremental build : {:>8.2f} s ({:.1f}x)'.format(incremental, full / incremental))
+    print('same output:', same)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""``Chikkar.find`` over a stack of dictionaries with and without the merged headword index.
+
+Usage: python -m benchmarks.bench_merged_index [--groups N] [--tokens N] [--stacks 1,3,10]
+"""
+
+import argparse
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def _find_all(chikkar, tokens):
+    start = time.perf_counter()
+    results = [chikkar.find(token) for token in tokens]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=20000, help='synonym groups per dictionary')
+    parser.add_argument('--tokens', type=int, default=200000)
+    parser.add_argument('--stacks', default='1,3,10', help='comma separated numbers of dictionaries')
+    args = parser.parse_args()
+    stacks = [int(n) for n in args.stacks.split(',')]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dictionaries = []
+        head_words = []
+        for i in range(max(stacks)):
+            dic_path, words = prepare_dictionary(work_dir, args.groups, seed=i, name='bench{}'.format(i))
+            dictionaries.append(Dictionary(dic_path, enable_trie=True))
+            head_words.extend(words)
+
+        print('groups: {} per dictionary, tokens: {}'.format(args.groups, args.tokens))
+        for n in stacks:
+            tokens = zipf_queries(head_words[:n * len(head_words) // max(stacks)], args.tokens)
+            chikkar = Chikkar()
+            for dictionary in dictionaries[:n]:
+                chikkar.add_dictionary(dictionary)
+            _find_all(chikkar, tokens)
+            plain, expected = _find_all(chikkar, tokens)
+
+            start = time.perf_counter()
+            chikkar.build_merged_index()
+            build = time.perf_counter() - start
+            _find_all(chikkar, tokens)
+            merged, results = _find_all(chikkar, tokens)
+            assert results == expected
+
+            print('{:>2} dictionaries: per-dictionary {:>10,.0f} tokens/sec, merged {:>10,.0f} tokens/sec'
+                  ' ({:.1f}x, index built in {:.2f}s)'.format(
+                      n, args.tokens / plain, args.tokens / merged, plain / merged, build))
+
+        for dictionary in dictionaries:
+            dictionary.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time and Python heap usage of ``Dictionary()`` and its first lookup for several dictionary sizes.
+
+Usage: python -m benchmarks.bench_open [--groups N [N ...]]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, nargs='+', default=[10000, 100000, 300000])
+    args = parser.parse_args()
+
+    print('{:>10} {:>12} {:>14} {:>12}'.format('groups', 'open [ms]', 'first get [ms]', 'heap [KiB]'))
+    for n_groups in args.groups:
+        with tempfile.TemporaryDirectory() as work_dir:
+            dic_path, _ = prepare_dictionary(work_dir, n_groups)
+
+            start = time.perf_counter()
+            dictionary = Dictionary(dic_path)
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            dictionary.get_synonym_group(n_groups // 2)
+            first = time.perf_counter() - start
+            dictionary.close()
+
+            tracemalloc.start()
+            dictionary = Dictionary(dic_path)
+            dictionary.get_synonym_group(n_groups // 2)
+            heap = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            dictionary.close()
+
+        print('{:>10,} {:>12.3f} {:>14.3f} {:>12,.0f}'.format(n_groups, opened * 1e3, first * 1e3, heap / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Searches token streams with ``find_many`` with and without a ``PersistentResultCache`` kept across runs.
+
+Usage: python -m benchmarks.bench_result_cache [--groups N] [--queries N] [--chunk-size N]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.resultcache import PersistentResultCache
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def _run(dic_path, queries, chunk_size, cache_path):
+    # a run opens the dictionary and the cache as a new process of ``chikkarpy search`` would
+    start = time.perf_counter()
+    dictionary = Dictionary(dic_path)
+    chikkar = Chikkar()
+    chikkar.add_dictionary(dictionary)
+    cache = PersistentResultCache(cache_path) if cache_path is not None else None
+    results = []
+    for i in range(0, len(queries), chunk_size):
+        results.extend(chikkar.find_many(queries[i:i + chunk_size], persistent_cache=cache))
+    elapsed = time.perf_counter() - start
+    info = cache.info() if cache is not None else None
+    if cache is not None:
+        cache.close()
+    dictionary.close()
+    return len(queries) / elapsed, results, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        queries = zipf_queries(head_words, args.queries)
+        cache_path = os.path.join(work_dir, 'results.sqlite')
+
+        print('groups: {}, queries: {}, chunk size: {}'.format(args.groups, args.queries, args.chunk_size))
+        baseline, expected, _ = _run(dic_path, queries, args.chunk_size, None)
+        print('no cache   {:>10,.0f} q/s'.format(baseline))
+        for name in ('cold cache', 'warm cache'):
+            throughput, results, info = _run(dic_path, queries, args.chunk_size, cache_path)
+            assert results == expected
+            print('{} {:>10,.0f} q/s  {:.2f}x  hit rate {:.1%}  {} results in {:,} bytes'.format(
+                name, throughput, throughput / baseline, info.hits / max(1, info.hits + info.misses), info.size,
+                os.path.getsize(cache_path)))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of ``Chikkar.scan`` over untokenized text.
+
+Usage: python -m benchmarks.bench_scan [--groups N] [--words N]
+"""
+
+import argparse
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.chikkar import ALL_MATCHES, LONGEST_MATCH
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--words', type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for expansion_table in (False, True):
+            dic_path, head_words = prepare_dictionary(work_dir, args.groups, expansion_table=expansion_table)
+            text = ''.join(zipf_queries(head_words, args.words))
+            size = len(text.encode('utf-8'))
+            dictionary = Dictionary(dic_path)
+            chikkar = Chikkar()
+            chikkar.add_dictionary(dictionary)
+            for policy in (LONGEST_MATCH, ALL_MATCHES):
+                start = time.perf_counter()
+                n_spans = sum(1 for _ in chikkar.scan(text, policy=policy))
+                elapsed = time.perf_counter() - start
+                print('expansion table={!s:<5} policy={:<7} {:>8,} spans {:>10,.0f} chars/sec {:>6.2f} MB/sec'.format(
+                    expansion_table, policy, n_spans, len(text) / elapsed, size / elapsed / 1e6))
+            dictionary.close()
+
+
+if __name__ == '__main__':
+    main()
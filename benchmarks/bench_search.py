@@ -0,0 +1,76 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of ``chikkarpy search``: opening the dictionaries per line vs. once per process.
+
+Usage: python -m benchmarks.bench_search [--groups N] [--lines N]
+"""
+
+import argparse
+import io
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.command_line import load_chikkar, write_synonyms
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def search_synonyms_per_line(enable_verb, dictionaries, input_, output):
+    """The former implementation, which opened every dictionary for each line."""
+    for word in input_:
+        word = word.rstrip('\n')
+        chikkar = Chikkar()
+        if enable_verb:
+            chikkar.enable_verb()
+        opened = [Dictionary(filename=dictionary) for dictionary in dictionaries]
+        for dic in opened:
+            chikkar.add_dictionary(dic)
+        output.write("{}\t{}\n".format(word, ','.join(chikkar.find(word))))
+        for dic in opened:
+            dic.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--lines', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        lines = [q + '\n' for q in zipf_queries(head_words, args.lines)]
+
+        legacy_lines = lines[:max(1, args.lines // 20)]
+        start = time.perf_counter()
+        search_synonyms_per_line(False, [dic_path], legacy_lines, io.StringIO())
+        before = len(legacy_lines) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        chikkar = load_chikkar(False, [dic_path])
+        write_synonyms(chikkar, lines, io.StringIO())
+        after = len(lines) / (time.perf_counter() - start)
+        for dic in chikkar._dictionaries:
+            dic.close()
+
+    print('groups: {}, lines: {}'.format(args.groups, args.lines))
+    print('per-line open : {:>12,.0f} lines/sec'.format(before))
+    print('open once     : {:>12,.0f} lines/sec'.format(after))
+    print('speedup       : {:>12.1f}x'.format(after / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of ``chikkarpy search -j N`` for several numbers of worker processes.
+
+Run it on a machine with at least as many CPUs as workers; otherwise the workers share the CPUs and no scaling shows up.
+
+Usage: python -m benchmarks.bench_search_parallel [--groups N] [--lines N] [--workers N [N ...]]
+"""
+
+import argparse
+import io
+import multiprocessing
+import tempfile
+import time
+
+from chikkarpy.command_line import load_chikkar, search_synonyms_parallel, write_synonyms
+
+from .common import prepare_dictionary, zipf_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--lines', type=int, default=500000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+        lines = [q + '\n' for q in zipf_queries(head_words, args.lines)]
+
+        chikkar = load_chikkar(False, [dic_path])
+        expected = io.StringIO()
+        start = time.perf_counter()
+        write_synonyms(chikkar, lines, expected)
+        serial = args.lines / (time.perf_counter() - start)
+
+        cpus = multiprocessing.cpu_count()
+        print('groups: {}, lines: {}, cpus: {}'.format(args.groups, args.lines, cpus))
+        if max(args.workers) > cpus:
+            print('warning: more workers than cpus, so the speedup does not show the scaling across cores')
+        print('{:>8} {:>14} {:>8}'.format('workers', 'lines/sec', 'speedup'))
+        print('{:>8} {:>14,.0f} {:>8}'.format('serial', serial, '1.0x'))
+        for workers in args.workers:
+            output = io.StringIO()
+            start = time.perf_counter()
+            search_synonyms_parallel(False, [dic_path], lines, output, workers)
+            throughput = args.lines / (time.perf_counter() - start)
+            assert output.getvalue() == expected.getvalue()
+            print('{:>8} {:>14,.0f} {:>7.1f}x'.format(workers, throughput, throughput / serial))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Latency of ``chikkarpy serve`` on localhost, measured by clients with kept-alive connections.
+
+Without ``--url`` or ``--unix``, a server is started in this process on a synthetic dictionary.
+Each client sends ``--batch`` queries per request, one request after another.
+
+Usage: python -m benchmarks.bench_server [--url http://HOST:PORT/find | --unix PATH] [--groups N] [--requests N]
+                                         [--clients N] [--batch N] [--workers N]
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.server import SynonymService, make_server
+
+from .common import generate_csv, prepare_dictionary, zipf_queries
+
+
+class _HTTPClient(object):
+
+    def __init__(self, url):
+        url = urlsplit(url)
+        self.path = url.path or '/find'
+        self.connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+
+    def request(self, line):
+        self.connection.request('POST', self.path, line)
+        response = self.connection.getresponse()
+        body = response.read()
+        assert response.status == 200, body
+        return body
+
+    def close(self):
+        self.connection.close()
+
+
+class _UnixClient(object):
+
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.reader = self.socket.makefile('rb')
+
+    def request(self, line):
+        self.socket.sendall(line)
+        return self.reader.readline()
+
+    def close(self):
+        self.reader.close()
+        self.socket.close()
+
+
+def _encode(queries, batch):
+    if batch == 1:
+        return [json.dumps({'word': q}, ensure_ascii=False).encode('utf-8') + b'\n' for q in queries]
+    return [json.dumps([{'word': q} for q in queries[i:i + batch]], ensure_ascii=False).encode('utf-8') + b'\n'
+            for i in range(0, len(queries), batch)]
+
+
+def _run_client(make_client, lines, latencies):
+    client = make_client()
+    try:
+        for line in lines:
+            start = time.perf_counter()
+            client.request(line)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        client.close()
+
+
+def _percentile(latencies, p):
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=None, help='URL of a running server')
+    parser.add_argument('--unix', default=None, help='Unix socket of a running server')
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=8, help='worker threads of the in-process server')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        server = None
+        service = None
+        if args.url is None and args.unix is None:
+            dic_path, head_words = prepare_dictionary(work_dir, args.groups)
+            service = SynonymService([Dictionary(dic_path)])
+            server = make_server(service, port=0, workers=args.workers)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = 'http://{}:{}/find'.format(*server.server_address[:2])
+        else:
+            # the vocabulary of a running server is unknown, so the queries follow the synthetic distribution
+            head_words = generate_csv('{}/queries.csv'.format(work_dir), args.groups)
+            url = args.url
+
+        if args.unix is not None:
+            def make_client():
+                return _UnixClient(args.unix)
+            target = args.unix
+        else:
+            def make_client():
+                return _HTTPClient(url)
+            target = url
+
+        lines = _encode(zipf_queries(head_words, args.requests * args.batch), args.batch)
+        latencies = []
+        threads = [threading.Thread(target=_run_client, args=(make_client, lines[i::args.clients], latencies))
+                   for i in range(args.clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    print('target: {}, requests: {}, clients: {}, batch: {}'.format(target, len(latencies), args.clients, args.batch))
+    print('requests/sec: {:>10,.0f}'.format(len(latencies) / elapsed))
+    print('queries/sec : {:>10,.0f}'.format(len(latencies) * args.batch / elapsed))
+    print('p50 ms      : {:>10.3f}'.format(_percentile(latencies, 0.5)))
+    print('p99 ms      : {:>10.3f}'.format(_percentile(latencies, 0.99)))
+
+
+if __name__ == '__main__':
+    main()
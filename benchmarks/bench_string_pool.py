@@ -0,0 +1,96 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""File size and decode speed of a version-3 dictionary with the string pool against version 1.
+
+Usage: python -m benchmarks.bench_string_pool [--groups N] [--queries N] [--repeat N]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import build, generate_csv, zipf_queries
+
+# categories of the Sudachi synonym dictionary are few and mostly empty
+_CATEGORIES = ['()'] * 8 + ['(医療)', '(IT)', '(法律)', '(料理)', '(スポーツ)', '(経済)']
+
+
+def _measure_decode(dic_path, repeat):
+    dictionary = Dictionary(dic_path, cache_size=0)
+    offset_table = dictionary.group_list.offset_table
+    group_ids = [offset_table.group_id_at(i) for i in range(len(offset_table))]
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        groups = [dictionary.get_synonym_group(group_id) for group_id in group_ids]
+        elapsed = min(elapsed, time.perf_counter() - start)
+    head_words = [[synonym.head_word for synonym in group.get_synonyms()] for group in groups]
+    dictionary.close()
+    return len(group_ids) / elapsed, head_words
+
+
+def _measure_find(dic_path, queries, repeat):
+    dictionary = Dictionary(dic_path, cache_size=0)
+    chikkar = Chikkar()
+    chikkar.add_dictionary(dictionary)
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [chikkar.find(query) for query in queries]
+        elapsed = min(elapsed, time.perf_counter() - start)
+    dictionary.close()
+    return len(queries) / elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3, help='the best of the runs is reported')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(work_dir, 'bench.csv')
+        head_words = generate_csv(csv_path, args.groups, categories=_CATEGORIES)
+        v1 = os.path.join(work_dir, 'v1.dic')
+        v3 = os.path.join(work_dir, 'v3.dic')
+        build(csv_path, v1)
+        build(csv_path, v3, string_pool=True)
+        queries = zipf_queries(head_words, args.queries)
+
+        size1 = os.path.getsize(v1)
+        size3 = os.path.getsize(v3)
+        print('groups: {}, queries: {}'.format(args.groups, args.queries))
+        print('file size: v1 {:,} bytes, v3 {:,} bytes ({:+.1f}%)'.format(size1, size3, 100.0 * (size3 - size1) / size1))
+        before, expected = _measure_decode(v1, args.repeat)
+        after, results = _measure_decode(v3, args.repeat)
+        assert results == expected
+        print('decode all groups  v1 {:>10,.0f} groups/s  v3 {:>10,.0f} groups/s  {:.2f}x'.format(before, after, after / before))
+        before, expected = _measure_find(v1, queries, args.repeat)
+        after, results = _measure_find(v3, queries, args.repeat)
+        assert results == expected
+        print('find (no cache)    v1 {:>10,.0f} q/s       v3 {:>10,.0f} q/s       {:.2f}x'.format(before, after, after / before))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
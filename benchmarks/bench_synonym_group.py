@@ -0,0 +1,59 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Decode time and Python heap usage of ``SynonymGroup`` objects.
+
+Usage: python -m benchmarks.bench_synonym_group [--groups N]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import prepare_dictionary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        dic_path, _ = prepare_dictionary(work_dir, args.groups)
+        dictionary = Dictionary(dic_path, cache_size=0)
+        group_ids = range(1, args.groups + 1)
+
+        start = time.perf_counter()
+        for gid in group_ids:
+            dictionary.get_synonym_group(gid)
+        decode = time.perf_counter() - start
+
+        tracemalloc.start()
+        groups = [dictionary.get_synonym_group(gid) for gid in group_ids]
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        n_synonyms = sum(len(group.get_synonyms()) for group in groups)
+        del groups
+        dictionary.close()
+
+    print('groups: {}, synonyms: {}'.format(args.groups, n_synonyms))
+    print('decode : {:>10.2f} us/group'.format(decode / args.groups * 1e6))
+    print('heap   : {:>10,.0f} bytes/group'.format(heap / args.groups))
+
+
+if __name__ == '__main__':
+    main()
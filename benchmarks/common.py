@@ -0,0 +1,137 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import time
+from logging import NullHandler, getLogger
+
+from chikkarpy.dictionarylib.dictionarybuilder import DictionaryBuilder
+from chikkarpy.dictionarylib.dictionaryheader import DictionaryHeader
+
+_KANA = [chr(c) for c in range(0x30A1, 0x30F7)]
+_KANJI = [chr(c) for c in range(0x4E00, 0x4E00 + 2000)]
+
+
+def _random_word(rng):
+    chars = _KANA if rng.random() < 0.5 else _KANJI
+    return ''.join(rng.choice(chars) for _ in range(rng.randint(2, 6)))
+
+
+def generate_csv(path, n_groups, seed=0, group_id_base=1, categories=('()',)):
+    """Writes a synthetic synonym dictionary source to ``path``.
+
+    About one in ten head words also appears in another group, so that some keys resolve to several groups.
+
+    Args:
+        path (str): the output csv file
+        n_groups (int): the number of synonym groups
+        seed (int): a random seed
+        group_id_base (int): the first group ID
+        categories (Sequence[str]): categories to be chosen for each synonym at random
+
+    Returns:
+        list[str]: all the head words in the order they were written
+    """
+    rng = random.Random(seed)
+    # a separate generator keeps the other columns the same for any categories
+    category_rng = random.Random(seed + 1)
+    head_words = []
+    with open(path, 'w', encoding='utf-8') as wf:
+        for i in range(n_groups):
+            group_id = group_id_base + i
+            words = set()
+            for j in range(rng.randint(2, 6)):
+                if head_words and rng.random() < 0.1:
+                    word = rng.choice(head_words)
+                else:
+                    word = _random_word(rng)
+                if word in words:
+                    continue
+                words.add(word)
+                is_noun = 1 if rng.random() < 0.8 else 2
+                ambiguity = 1 if rng.random() < 0.05 else 0
+                wf.write('{:06d},{},{},{},0,0,{},{},{},,\n'.format(
+                    group_id, is_noun, ambiguity, j + 1, rng.randint(0, 3), category_rng.choice(categories), word))
+                head_words.append(word)
+            wf.write('\n')
+    return head_words
+
+
+def quiet_logger():
+    """Returns a logger which discards the progress of the builder."""
+    logger = getLogger('chikkarpy.benchmarks')
+    if not logger.handlers:
+        logger.addHandler(NullHandler())
+    logger.propagate = False
+    return logger
+
+
+def build(csv_path, dic_path, description='benchmark', builder_class=DictionaryBuilder, **options):
+    """Builds a binary dictionary without logging the progress.
+
+    Args:
+        csv_path (str): the input csv file
+        dic_path (str): the output dictionary file
+        description (str): description comment embedded on the dictionary
+        builder_class (type): ``DictionaryBuilder`` or its subclass
+        **options: keyword arguments of ``builder_class``
+    """
+    builder = builder_class(logger=quiet_logger(), **options)
+    header = DictionaryHeader(builder.version, int(time.time()), description)
+    with open(dic_path, 'wb') as wf:
+        wf.write(header.to_byte())
+        builder.build(csv_path, wf)
+
+
+def prepare_dictionary(work_dir, n_groups, seed=0, name='bench', **options):
+    """Generates and builds a synthetic dictionary in ``work_dir``.
+
+    Returns:
+        tuple[str, list[str]]: the dictionary path and its head words
+    """
+    csv_path = os.path.join(work_dir, '{}.csv'.format(name))
+    dic_path = os.path.join(work_dir, '{}.dic'.format(name))
+    head_words = generate_csv(csv_path, n_groups, seed=seed)
+    build(csv_path, dic_path, **options)
+    return dic_path, head_words
+
+
+def zipf_queries(words, n, seed=0, s=1.1, oov_rate=0.3):
+    """Samples ``n`` queries with a Zipfian rank distribution like the tokens of a real corpus.
+
+    Args:
+        words (list[str]): the vocabulary
+        n (int): the number of queries
+        seed (int): a random seed
+        s (float): the exponent of the distribution
+        oov_rate (float): the rate of queries which are not in ``words``
+
+    Returns:
+        list[str]: the queries
+    """
+    rng = random.Random(seed)
+    vocab = list(dict.fromkeys(words))
+    rng.shuffle(vocab)
+    oov = [_random_word(rng) + 'ー' for _ in range(max(1, len(vocab) // 2))]
+    queries = rng.choices(vocab, weights=_zipf_weights(len(vocab), s), k=n)
+    oov_queries = rng.choices(oov, weights=_zipf_weights(len(oov), s), k=n)
+    for i in range(n):
+        if rng.random() < oov_rate:
+            queries[i] = oov_queries[i]
+    return queries
+
+
+def _zipf_weights(n, s):
+    return [1.0 / (r + 1) ** s for r in range(n)]
@@ -0,0 +1,294 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs every hot path on synthetic dictionaries and writes the latencies, throughput and peak memory as JSON.
+
+Usage: python -m benchmarks.suite [--groups N [N ...]] [--queries N] [--output FILE] [--compare FILE]
+
+The stages are ``build`` (``DictionaryBuilder.build``), ``open`` (``Dictionary()``), ``lookup``
+(``DoubleArrayTrie.lookup_by_exact_match``), ``decode`` (``SynonymGroupList.get_synonym_group`` without a cache)
+and ``find`` (``Chikkar.find``). Each stage runs in a fresh process, so its peak RSS is not inflated by the others.
+Save the JSON of two commits and pass one of them with ``--compare`` to print the ratios of the other.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+from .common import build, generate_csv, zipf_queries
+
+STAGES = ('build', 'open', 'lookup', 'decode', 'find')
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def _max_rss():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _run_build(csv_path, dic_path, repeat):
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(csv_path, dic_path)
+        yield time.perf_counter() - start
+
+
+def _run_open(dic_path, repeat):
+    for _ in range(repeat):
+        start = time.perf_counter()
+        dictionary = Dictionary(dic_path)
+        elapsed = time.perf_counter() - start
+        dictionary.close()
+        yield elapsed
+
+
+def _run_lookup(dic_path, queries):
+    dictionary = Dictionary(dic_path)
+    trie = dictionary.dict_.trie
+    keys = [query.encode('utf-8') for query in queries]
+    clock = time.perf_counter
+    try:
+        for key in keys:
+            start = clock()
+            trie.lookup_by_exact_match(key)
+            yield clock() - start
+    finally:
+        # the trie holds a view of the mapped file, which cannot be closed while it is exported
+        del trie
+        dictionary.close()
+
+
+def _run_decode(dic_path, group_ids):
+    dictionary = Dictionary(dic_path, cache_size=0)
+    clock = time.perf_counter
+    try:
+        for group_id in group_ids:
+            start = clock()
+            dictionary.get_synonym_group(group_id)
+            yield clock() - start
+    finally:
+        dictionary.close()
+
+
+def _run_find(dic_path, queries):
+    dictionary = Dictionary(dic_path)
+    chikkar = Chikkar()
+    chikkar.add_dictionary(dictionary)
+    clock = time.perf_counter
+    try:
+        for query in queries:
+            start = clock()
+            chikkar.find(query)
+            yield clock() - start
+    finally:
+        dictionary.close()
+
+
+_RUNNERS = {
+    'build': _run_build,
+    'open': _run_open,
+    'lookup': _run_lookup,
+    'decode': _run_decode,
+    'find': _run_find,
+}
+
+
+def _measure_in_child(stage, args):
+    """Runs a stage and summarizes it. This is called in a fresh process."""
+    baseline = _max_rss()
+    latencies = []
+    start = time.perf_counter()
+    for latency in _RUNNERS[stage](*args):
+        latencies.append(latency)
+    elapsed = time.perf_counter() - start
+    peak = _max_rss()
+    return summarize(latencies, elapsed, peak, peak - baseline)
+
+
+def summarize(latencies, elapsed, peak_rss, rss_growth):
+    """Summarizes the latencies of the operations of a stage.
+
+    Args:
+        latencies (list[float]): the seconds taken by each operation
+        elapsed (float): the seconds taken by the whole stage, including the timer overhead
+        peak_rss (int): the peak resident set size of the process in bytes
+        rss_growth (int): how much the peak resident set size grew during the stage in bytes
+
+    Returns:
+        dict: the statistics of the stage
+    """
+    latencies = sorted(latencies)
+    n = len(latencies)
+    result = {
+        'operations': n,
+        'seconds': elapsed,
+        'throughput': n / elapsed if elapsed > 0 else 0.0,
+        'latency_us': {
+            'mean': sum(latencies) / n * 1e6 if n else 0.0,
+            'max': latencies[-1] * 1e6 if n else 0.0,
+        },
+        'peak_rss_bytes': peak_rss,
+        'rss_growth_bytes': rss_growth,
+    }
+    for p in PERCENTILES:
+        value = latencies[min(n - 1, int(n * p / 100))] * 1e6 if n else 0.0
+        result['latency_us']['p{:g}'.format(p)] = value
+    return result
+
+
+def _environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(os.path.abspath(__file__))).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': int(time.time()),
+    }
+
+
+def run_suite(n_groups, n_queries, work_dir, stages=STAGES, seed=0, repeat=5, context=None):
+    """Runs the stages on a synthetic dictionary of ``n_groups`` synonym groups.
+
+    Args:
+        n_groups (int): the number of synonym groups
+        n_queries (int): the number of queries of ``lookup``, ``decode`` and ``find``
+        work_dir (str): a directory for the source and the dictionary
+        stages (Sequence[str]): the stages to run. The dictionary is built even if ``build`` is not included.
+        seed (int): a random seed of the dictionary and the queries
+        repeat (int): the number of runs of ``build`` and ``open``
+        context (multiprocessing.context.BaseContext): the context to start the processes of the stages
+
+    Returns:
+        dict: the statistics of each stage by its name
+    """
+    context = context if context is not None else multiprocessing.get_context('spawn')
+    csv_path = os.path.join(work_dir, 'suite.csv')
+    dic_path = os.path.join(work_dir, 'suite.dic')
+    head_words = generate_csv(csv_path, n_groups, seed=seed)
+    queries = zipf_queries(head_words, n_queries, seed=seed)
+    group_ids = zipf_queries(list(range(1, n_groups + 1)), n_queries, seed=seed, oov_rate=0.0)
+    del head_words
+
+    arguments = {
+        'build': (csv_path, dic_path, repeat if 'build' in stages else 1),
+        'open': (dic_path, repeat),
+        'lookup': (dic_path, queries),
+        'decode': (dic_path, group_ids),
+        'find': (dic_path, queries),
+    }
+    results = {}
+    for stage in ('build',) + tuple(s for s in STAGES if s != 'build'):
+        if stage != 'build' and stage not in stages:
+            continue
+        with context.Pool(1) as pool:
+            result = pool.apply(_measure_in_child, (stage, arguments[stage]))
+        if stage in stages:
+            results[stage] = result
+    return results
+
+
+def compare(base, current):
+    """Returns the ratios of ``current`` to ``base`` for the stages and the sizes in both.
+
+    Args:
+        base (dict): the JSON of a previous run
+        current (dict): the JSON of this run
+
+    Returns:
+        list[tuple[int, str, float, float, float]]: the number of groups, the stage and the ratios of
+        the throughput, the p99 latency and the peak RSS
+    """
+    base_runs = {run['groups']: run['stages'] for run in base['runs']}
+    ratios = []
+    for run in current['runs']:
+        base_stages = base_runs.get(run['groups'], {})
+        for stage, result in run['stages'].items():
+            if stage not in base_stages:
+                continue
+            before = base_stages[stage]
+            ratios.append((
+                run['groups'], stage,
+                _ratio(result['throughput'], before['throughput']),
+                _ratio(result['latency_us']['p99'], before['latency_us']['p99']),
+                _ratio(result['peak_rss_bytes'], before['peak_rss_bytes'])))
+    return ratios
+
+
+def _ratio(value, base):
+    return value / base if base else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5, help='runs of build and open')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='write the JSON to this file instead of stdout')
+    parser.add_argument('--compare', default=None, help='JSON of a previous run to compare with')
+    args = parser.parse_args()
+
+    report = {
+        'environment': _environment(),
+        'queries': args.queries,
+        'seed': args.seed,
+        'runs': [],
+    }
+    for n_groups in args.groups:
+        with tempfile.TemporaryDirectory() as work_dir:
+            stages = run_suite(n_groups, args.queries, work_dir, stages=args.stages, seed=args.seed,
+                               repeat=args.repeat)
+        report['runs'].append({'groups': n_groups, 'stages': stages})
+        for stage, result in stages.items():
+            print('{:>10,} {:<7} {:>12,.0f} ops/s  p50 {:>10.1f} us  p99 {:>10.1f} us  peak RSS {:>8,.1f} MiB'.format(
+                n_groups, stage, result['throughput'], result['latency_us']['p50'], result['latency_us']['p99'],
+                result['peak_rss_bytes'] / (1 << 20)), file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as wf:
+            json.dump(report, wf, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as f:
+            base = json.load(f)
+        print('{:>10} {:<7} {:>12} {:>10} {:>10}'.format('groups', 'stage', 'throughput', 'p99', 'peak RSS'),
+              file=sys.stderr)
+        for n_groups, stage, throughput, p99, rss in compare(base, report):
+            print('{:>10,} {:<7} {:>11.2f}x {:>9.2f}x {:>9.2f}x'.format(n_groups, stage, throughput, p99, rss),
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from .chikkar import Chikkar
+from .dictionarylib import Dictionary
+
+if sys.version_info < (3, 7):
+    # a module ``__getattr__`` is not supported
+    from .asyncchikkar import AsyncChikkar
+
+
+def __getattr__(name):
+    """Imports the attributes which are not needed by lookups on their first access.
+
+    ``AsyncChikkar`` imports asyncio, and ``__version__`` reads the package metadata,
+    both of which take longer than importing the lookup path.
+    """
+    if name == 'AsyncChikkar':
+        from . import asyncchikkar
+        return asyncchikkar.AsyncChikkar
+    if name == '__version__':
+        version = _read_version()
+        if version is not None:
+            globals()['__version__'] = version
+            return version
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def _read_version():
+    """Returns the version of the installed package, or ``None`` if the package is not installed."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        from pkg_resources import DistributionNotFound as PackageNotFoundError, get_distribution
 
-from pkg_resources import get_distribution, DistributionNotFound
-try:
-    __version__ = get_distribution(__name__).version
-except DistributionNotFound:
-    # package is not installed
-    pass
+        def version(name):
+            return get_distribution(name).version
+    try:
+        return version(__name__)
+    except PackageNotFoundError:
+        return None
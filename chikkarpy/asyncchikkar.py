@@ -0,0 +1,173 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from functools import partial
+
+DEFAULT_WINDOW = 0.001
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_PENDING = 4096
+
+
+class AsyncChikkar(object):
+    """
+    An asyncio facade of ``Chikkar`` which batches concurrent lookups and runs them in an executor
+    """
+    def __init__(self, chikkar, window=DEFAULT_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_pending=DEFAULT_MAX_PENDING, executor=None):
+        """Constructs a facade. It must be used from a single event loop.
+
+        Requests arriving within ``window`` seconds of the first one are resolved by one ``Chikkar.find_many()`` call
+        in the ``executor``, so the event loop is not blocked while synonym groups are decoded.
+
+        Args:
+            chikkar (Chikkar): a ``Chikkar`` with the dictionaries
+            window (float): the maximum time in seconds for which a request waits for others to join its batch
+            max_batch_size (int): the number of requests which makes a batch run at once
+            max_pending (int): the number of requests which may be queued or running at a time.
+                ``self.find()`` waits for a slot when the limit is reached.
+            executor (concurrent.futures.Executor | None): an executor, or ``None`` for the default one of the loop
+        """
+        if max_batch_size < 1 or max_pending < 1:
+            raise ValueError('max_batch_size and max_pending must be positive')
+        self.chikkar = chikkar
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.executor = executor
+        self._loop = None
+        self._semaphore = None
+        self._batch = []
+        self._timer = None
+        self._running = set()
+
+    async def find(self, word, group_ids=None):
+        """Returns synonyms for the specified word as ``Chikkar.find()`` does.
+
+        Args:
+            word (str): keyword
+            group_ids (list[int] | None): synonym group IDs
+
+        Returns:
+            list[str]: a list of synonym head words
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        async with self._semaphore:
+            future = self._loop.create_future()
+            self._batch.append((word, group_ids, future))
+            if len(self._batch) >= self.max_batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = self._loop.call_later(self.window, self.flush)
+            return await future
+
+    async def find_many(self, words, group_ids=None):
+        """Returns synonyms for each of the specified words as ``Chikkar.find_many()`` does.
+
+        The words are looked up as separate requests, so they may share batches with other requests.
+
+        Args:
+            words (Iterable[str]): keywords
+            group_ids (Iterable[list[int] | None] | None): synonym group IDs for each keyword
+
+        Returns:
+            list[list[str]]: lists of synonym head words in the same order as ``words``
+        """
+        keys = zip(words, group_ids) if group_ids is not None else ((word, None) for word in words)
+        return list(await asyncio.gather(*[self.find(word, gids) for word, gids in keys]))
+
+    def flush(self):
+        """Starts the lookup of the queued requests without waiting for the window to pass."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = self._batch
+        if not batch:
+            return
+        self._batch = []
+
+        words = [word for word, _, _ in batch]
+        group_ids = [gids for _, gids, _ in batch]
+        if all(gids is None for gids in group_ids):
+            group_ids = None
+        running = self._loop.run_in_executor(self.executor, self._find_batch, words, group_ids)
+        self._running.add(running)
+        running.add_done_callback(partial(self._resolve, batch))
+
+    def _find_batch(self, words, group_ids):
+        """Looks up a batch by one ``Chikkar.find_many()`` call, or word by word if it raises.
+
+        Args:
+            words (list[str]): keywords
+            group_ids (list[list[int] | None] | None): synonym group IDs for each keyword
+
+        Returns:
+            list[list[str] | Exception]: lists of synonym head words, or the errors of the invalid requests
+        """
+        try:
+            return self.chikkar.find_many(words, group_ids)
+        except Exception:
+            # finds the invalid requests one by one, so that they do not fail the others
+            if group_ids is None:
+                group_ids = [None] * len(words)
+            results = []
+            for word, gids in zip(words, group_ids):
+                try:
+                    results.append(self.chikkar.find(word, gids))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def _resolve(self, batch, running):
+        """Resolves the futures of the requests in a batch with the results of its lookup.
+
+        Args:
+            batch (list[tuple[str, list[int] | None, asyncio.Future]]): the requests
+            running (asyncio.Future): the lookup of the batch
+        """
+        self._running.discard(running)
+        if running.cancelled():
+            for _, _, future in batch:
+                future.cancel()
+            return
+        error = running.exception()
+        if error is not None:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, _, future), synonyms in zip(batch, running.result()):
+            # the request may have been cancelled by its caller
+            if future.done():
+                continue
+            if isinstance(synonyms, Exception):
+                future.set_exception(synonyms)
+            else:
+                future.set_result(synonyms)
+
+    async def close(self):
+        """Runs the queued requests and waits for all the running lookups to finish."""
+        if self._loop is None:
+            return
+        self.flush()
+        while self._running:
+            await asyncio.wait(list(self._running))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,271 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk expansion of synonym group IDs with NumPy.
+
+NumPy is an optional dependency of this module: ``pip install chikkarpy[numpy]``.
+"""
+
+import threading
+
+from .dictionarylib.groupoffsettable import DENSE, SORTED, UNSORTED
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class BulkExpander(object):
+    """
+    Expands arrays of synonym group IDs of tokens into synonym head word IDs without a Python object per token
+
+    The group IDs are resolved against an array view of the group offset table of the dictionary,
+    and the members of each distinct group are decoded once and kept as arrays of IDs into ``self.vocabulary``,
+    a vocabulary shared by all the calls. The results are in the CSR layout: the head word IDs of the synonyms
+    of the token ``i`` are ``ids[offsets[i]:offsets[i + 1]]``.
+
+    For each token, this gives the same synonyms as ``Chikkar.find(word, group_ids)`` with only ``dictionary``
+    whose trie is disabled, when the word of the token is passed by ``word_ids``.
+    """
+    def __init__(self, dictionary, can_search_verb=False):
+        """Constructs an expander with an empty vocabulary.
+
+        Args:
+            dictionary (Dictionary): a synonym dictionary
+            can_search_verb (bool): ``True`` to include verb and adjective synonyms
+
+        Raises:
+            ImportError: NumPy is not installed
+        """
+        if np is None:
+            raise ImportError('BulkExpander requires NumPy. Install it with `pip install chikkarpy[numpy]`.')
+        self.dictionary = dictionary
+        self.can_search_verb = can_search_verb
+        self.vocabulary = []
+        self._word_ids = {}
+        self._lock = threading.Lock()
+
+        table = dictionary.group_list.offset_table
+        self._size = len(table)
+        self._layout = None
+        self._first_id = 0
+        self._order = None
+        # the range of the members of each group in the member arrays, by the position in the offset table.
+        # ``-1`` marks a group which is not decoded yet.
+        self._member_start = np.full(self._size, -1, dtype=np.int64)
+        self._member_count = np.zeros(self._size, dtype=np.int64)
+        self._member_word = np.zeros(0, dtype=np.int32)
+        self._member_noun = np.zeros(0, dtype=bool)
+        self._member_ambiguous = np.zeros(0, dtype=bool)
+
+    def word_id(self, word):
+        """Returns the ID of the ``word`` in ``self.vocabulary``, adding it if it is not in the vocabulary yet.
+
+        Args:
+            word (str): a head word
+
+        Returns:
+            int: the ID of the ``word``
+        """
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            with self._lock:
+                word_id = self._add_word(word)
+        return word_id
+
+    def word_ids(self, words):
+        """Returns the IDs of the ``words`` by ``self.word_id()``.
+
+        Map the vocabulary of a corpus once and index the result by the tokens, rather than passing every token.
+
+        Args:
+            words (Iterable[str]): head words
+
+        Returns:
+            numpy.ndarray: the IDs as int32
+        """
+        return np.array([self.word_id(word) for word in words], dtype=np.int32)
+
+    def positions(self, group_ids):
+        """Returns the positions of the group IDs in the group offset table.
+
+        Args:
+            group_ids (numpy.ndarray): synonym group IDs
+
+        Returns:
+            numpy.ndarray: the positions as int64, ``-1`` for the IDs which are not in the dictionary
+        """
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        if self._size == 0:
+            return np.full(group_ids.shape, -1, dtype=np.int64)
+        table_ids = self._table_ids()
+        try:
+            layout = self._layout if self._layout is not None else self._inspect(table_ids)
+            if layout == DENSE:
+                positions = group_ids - self._first_id
+                positions[(positions < 0) | (positions >= self._size)] = -1
+                return positions
+            if layout != SORTED and layout != UNSORTED:
+                raise ValueError('The group offset table has an unknown layout: {}'.format(layout))
+            order = self._order
+            sorted_ids = table_ids if order is None else table_ids[order]
+            found = np.searchsorted(sorted_ids, group_ids)
+            np.minimum(found, self._size - 1, out=found)
+            hit = sorted_ids[found] == group_ids
+            if order is not None:
+                found = order[found]
+            return np.where(hit, found, -1)
+        finally:
+            # releases the view so that the dictionary can be closed
+            del table_ids
+
+    def expand(self, group_ids, offsets=None, word_ids=None):
+        """Returns the synonyms of tokens by their synonym group IDs.
+
+        Args:
+            group_ids (numpy.ndarray): the synonym group IDs of the tokens, one per token if ``offsets`` is ``None``
+            offsets (numpy.ndarray | None): the CSR offsets of ``group_ids``, where the group IDs of the token ``i``
+                are ``group_ids[offsets[i]:offsets[i + 1]]``, or ``None`` for one group ID per token
+            word_ids (numpy.ndarray | None): the ID of the word of each token in ``self.vocabulary``,
+                given by ``self.word_ids()``. The word itself is excluded from its synonyms and a group in which
+                the word is ambiguous is skipped, as ``Chikkar.find()`` does. If ``None``, all the members
+                of the groups are returned.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: the CSR offsets (int64) and the head word IDs (int32)
+            of the synonyms of each token
+
+        Raises:
+            ValueError: the lengths of the arrays do not match, or a group does not contain the word of its token
+        """
+        group_ids = np.asarray(group_ids, dtype=np.int64).ravel()
+        if offsets is None:
+            offsets = np.arange(len(group_ids) + 1, dtype=np.int64)
+        else:
+            offsets = np.asarray(offsets, dtype=np.int64)
+            if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(group_ids) or np.any(np.diff(offsets) < 0):
+                raise ValueError('offsets must ascend from 0 to the length of group_ids.')
+        n_tokens = len(offsets) - 1
+        if word_ids is not None:
+            word_ids = np.asarray(word_ids, dtype=np.int32)
+            if len(word_ids) != n_tokens:
+                raise ValueError('{} word IDs are given for {} tokens.'.format(len(word_ids), n_tokens))
+
+        positions = self.positions(group_ids)
+        with self._lock:
+            self._decode(positions)
+            starts = self._member_start
+            counts = self._member_count
+            member_word = self._member_word
+            member_noun = self._member_noun
+            member_ambiguous = self._member_ambiguous
+
+        # each (token, group) pair spans the members of its group
+        valid = positions >= 0
+        pair_start = np.where(valid, starts[positions], 0)
+        pair_count = np.where(valid, counts[positions], 0)
+        pair_token = np.repeat(np.arange(n_tokens, dtype=np.int64), np.diff(offsets))
+        pair_offsets = np.concatenate(([0], np.cumsum(pair_count)))
+        element_pair = np.repeat(np.arange(len(group_ids), dtype=np.int64), pair_count)
+        elements = pair_start[element_pair] + np.arange(pair_offsets[-1], dtype=np.int64) - pair_offsets[element_pair]
+        element_token = pair_token[element_pair]
+        words = member_word[elements]
+
+        keep = np.ones(len(elements), dtype=bool) if self.can_search_verb else member_noun[elements].copy()
+        if word_ids is not None:
+            is_self = words == word_ids[element_token]
+            has_self = np.zeros(len(group_ids), dtype=bool)
+            has_self[element_pair[is_self]] = True
+            missing = np.flatnonzero(valid & ~has_self)
+            if len(missing) > 0:
+                pair = missing[0]
+                raise ValueError(
+                    "The dictionary (``{}``) has a group ID of {}, but the word of the token {} "
+                    "dose not exist in the group.".format(self.dictionary.filename, group_ids[pair], pair_token[pair]))
+            ambiguous = np.zeros(len(group_ids), dtype=bool)
+            ambiguous[element_pair[is_self & member_ambiguous[elements]]] = True
+            keep &= ~is_self & ~ambiguous[element_pair]
+
+        result_offsets = np.concatenate(([0], np.cumsum(np.bincount(element_token[keep], minlength=n_tokens))))
+        return result_offsets.astype(np.int64), words[keep]
+
+    def _table_ids(self):
+        """Returns the group IDs of the offset table as a strided view of the memory-mapped dictionary."""
+        table = self.dictionary.group_list.offset_table
+        pairs = np.frombuffer(self.dictionary.dict_.bytes_, dtype='<i4', count=2 * self._size,
+                              offset=table.pairs_offset)
+        return pairs[0::2]
+
+    def _inspect(self, table_ids):
+        """Checks the order of the group IDs once and decides how to look them up."""
+        with self._lock:
+            if self._layout is None:
+                steps = np.diff(table_ids)
+                if np.all(steps == 1):
+                    self._first_id = int(table_ids[0])
+                    self._layout = DENSE
+                elif np.all(steps > 0):
+                    self._layout = SORTED
+                else:
+                    # the last of the duplicated IDs wins as in ``GroupOffsetTable``
+                    order = np.argsort(table_ids, kind='stable')
+                    sorted_ids = table_ids[order]
+                    last = np.append(sorted_ids[1:] != sorted_ids[:-1], True)
+                    self._order = order[last]
+                    self._layout = UNSORTED
+            return self._layout
+
+    def _decode(self, positions):
+        """Decodes the members of the groups at the ``positions`` which are not decoded yet.
+
+        Must be called with ``self._lock``.
+        """
+        candidates = np.unique(positions[positions >= 0])
+        new_positions = candidates[self._member_start[candidates] < 0]
+        if len(new_positions) == 0:
+            return
+
+        dictionary = self.dictionary
+        offset_table = dictionary.group_list.offset_table
+        words = []
+        nouns = []
+        ambiguities = []
+        start = len(self._member_word)
+        for position in new_positions.tolist():
+            if dictionary.group_index is not None:
+                members = dictionary.group_index.get(position)
+            else:
+                group = dictionary.group_list.read_synonym_group(
+                    offset_table.group_id_at(position), offset_table.offset_at(position))
+                members = [(synonym.head_word, synonym.flags) for synonym in group.get_synonyms()]
+            self._member_start[position] = start + len(words)
+            self._member_count[position] = len(members)
+            for head_word, flags in members:
+                words.append(self._add_word(head_word))
+                nouns.append(flags.is_noun)
+                ambiguities.append(flags.has_ambiguity)
+
+        self._member_word = np.concatenate((self._member_word, np.array(words, dtype=np.int32)))
+        self._member_noun = np.concatenate((self._member_noun, np.array(nouns, dtype=bool)))
+        self._member_ambiguous = np.concatenate((self._member_ambiguous, np.array(ambiguities, dtype=bool)))
+
+    def _add_word(self, word):
+        """Returns the ID of the ``word``, adding it to the vocabulary. Must be called with ``self._lock``."""
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = len(self.vocabulary)
+            self.vocabulary.append(word)
+            self._word_ids[word] = word_id
+        return word_id
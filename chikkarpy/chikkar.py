@@ -12,20 +12,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING
+import struct
+import threading
+import time
 
+from .dictionarylib import Dictionary
+from .dictionarylib.mergedindex import MergedIndex
+from .lrucache import LRUCache
+from .stats import ChikkarStats
 
-if TYPE_CHECKING:
-    from .dictionarylib import Dictionary
+# the default maximum number of results cached by ``Chikkar.find_bytes()``
+DEFAULT_RESULT_CACHE_SIZE = 4096
+
+# policies of ``Chikkar.scan()``
+LONGEST_MATCH = 'longest'
+ALL_MATCHES = 'all'
+
+
+class _Generation(object):
+    """
+    The dictionaries searched by ``Chikkar`` at a time, and the lookups running on them
+    """
+    __slots__ = ('dictionaries', 'merged_index', 'results', 'fingerprint', 'readers', 'retired', 'closing')
+
+    def __init__(self, dictionaries, merged_index, results):
+        self.dictionaries = dictionaries
+        self.merged_index = merged_index
+        # the results of ``Chikkar.find_bytes()`` on the dictionaries
+        self.results = results
+        # the key of the dictionaries in a ``PersistentResultCache``, computed on the first use
+        self.fingerprint = None
+        # the number of running lookups
+        self.readers = 0
+        self.retired = False
+        # the dictionaries to be closed when the generation is retired and no lookup is running
+        self.closing = []
 
 
 class Chikkar(object):
     """
     A container of synonym dictionaries.
     """
-    def __init__(self):
-        self._dictionaries = []
+    def __init__(self, result_cache_size=DEFAULT_RESULT_CACHE_SIZE):
+        """Constructs an empty container.
+
+        Args:
+            result_cache_size (int): the maximum number of results cached by ``self.find_bytes()``.
+                ``0`` disables the cache.
+        """
         self._can_search_verb = False
+        self._result_cache_size = result_cache_size
+        self._lock = threading.Lock()
+        self._generation = _Generation([], None, LRUCache(result_cache_size))
+        # the counters of ``self.enable_stats()``, or ``None`` if the lookups are not counted
+        self._stats = None
+
+    @property
+    def _dictionaries(self):
+        return self._generation.dictionaries
+
+    @property
+    def _merged_index(self):
+        return self._generation.merged_index
 
     def enable_verb(self):
         """Enable verb and adjective synonyms.
@@ -34,15 +82,172 @@ class Chikkar(object):
         """
         self._can_search_verb = True
 
+    def enable_stats(self):
+        """Starts counting and timing the lookups in this object and in its dictionaries.
+
+        The dictionaries added or reloaded later are counted as well. The counters of a reloaded dictionary
+        are continued by the new one. While the stats are disabled, the lookups are not slowed down by them.
+
+        Returns:
+            ChikkarStats: the counters of this object
+        """
+        with self._lock:
+            if self._stats is None:
+                self._stats = ChikkarStats()
+            for dictionary in self._generation.dictionaries:
+                dictionary.enable_stats()
+            return self._stats
+
+    def disable_stats(self):
+        """Stops counting the lookups in this object and in its dictionaries. The counters are discarded."""
+        with self._lock:
+            self._stats = None
+            for dictionary in self._generation.dictionaries:
+                dictionary.disable_stats()
+
+    def stats_snapshot(self):
+        """Returns the counters of ``self.enable_stats()``.
+
+        The time of a lookup is split into ``trie_seconds`` and ``decode_seconds`` of each dictionary
+        and ``filter_seconds``, with the rest spent on the merged index, the expansion tables and the calls.
+
+        Returns:
+            dict | None: the counters of ``ChikkarStats`` by their names with ``result_cache_hits`` and
+            ``result_cache_misses`` of ``self.find_bytes()``, and ``dictionaries``, the snapshots of
+            ``Dictionary.stats_snapshot()`` in the order of the search (``None`` for a dictionary whose stats
+            are disabled). ``None`` if the lookups are not counted.
+        """
+        stats = self._stats
+        if stats is None:
+            return None
+        generation = self._generation
+        snapshot = stats.snapshot()
+        result_cache_info = generation.results.info()
+        snapshot['result_cache_hits'] = result_cache_info.hits
+        snapshot['result_cache_misses'] = result_cache_info.misses
+        snapshot['dictionaries'] = [dictionary.stats_snapshot() for dictionary in generation.dictionaries]
+        return snapshot
+
     def add_dictionary(self, dictionary):
         """Add a synonym dictionary.
 
         Adds a ``dictionary`` to be used for search. When searching, the dictionary added later takes precedence.
+        The merged index built by ``self.build_merged_index()`` is discarded.
 
         Args:
             dictionary (Dictionary): a synonym dictionary
         """
-        self._dictionaries.insert(0, dictionary)
+        with self._lock:
+            if self._stats is not None:
+                dictionary.enable_stats()
+            results = LRUCache(self._result_cache_size)
+            self._swap(_Generation([dictionary] + self._generation.dictionaries, None, results), [])
+
+    def build_merged_index(self):
+        """Compiles the headwords of all the dictionaries into one index.
+
+        After this method is called, ``self.find()`` answers with a single probe of the merged index
+        instead of probing the trie of each dictionary in turn. The results are the same.
+        Building the index decodes the headwords of every dictionary once.
+        """
+        generation = self._generation
+        merged_index = MergedIndex(generation.dictionaries)
+        with self._lock:
+            if self._generation is generation:
+                # the results stay the same
+                self._swap(_Generation(generation.dictionaries, merged_index, generation.results), [])
+
+    def reload(self, dictionary, filename=None):
+        """Replaces a dictionary with a newly opened one without blocking lookups.
+
+        The new dictionary is opened, validated and indexed while lookups continue on the current one.
+        Then the dictionaries are swapped at once, and the old one is closed when the lookups running on it finish.
+        The file of the old dictionary must not be modified in place; replace it by renaming a new file instead.
+
+        Args:
+            dictionary (Dictionary): a dictionary added to this object
+            filename (str | None): path of the new dictionary file, or ``None`` to reopen ``dictionary.filename``
+
+        Returns:
+            Dictionary: the new dictionary, opened with the same options as ``dictionary``
+
+        Raises:
+            ValueError: ``dictionary`` is not added to this object, or the new dictionary is broken
+        """
+        if dictionary not in self._generation.dictionaries:
+            raise ValueError('The dictionary (``{}``) is not added.'.format(dictionary.filename))
+        new_dictionary = Dictionary(filename if filename is not None else dictionary.filename,
+                                    dictionary.enable_trie, cache_size=dictionary.cache_size)
+        if dictionary.stats is not None:
+            new_dictionary.enable_stats(dictionary.stats)
+        try:
+            _validate(new_dictionary)
+            while True:
+                generation = self._generation
+                if dictionary not in generation.dictionaries:
+                    raise ValueError('The dictionary (``{}``) is not added.'.format(dictionary.filename))
+                dictionaries = [new_dictionary if d is dictionary else d for d in generation.dictionaries]
+                merged_index = MergedIndex(dictionaries) if generation.merged_index is not None else None
+                with self._lock:
+                    # retries if another thread has changed the dictionaries meanwhile
+                    if self._generation is generation:
+                        self._swap(_Generation(dictionaries, merged_index, LRUCache(self._result_cache_size)), [dictionary])
+                        return new_dictionary
+        except Exception:
+            new_dictionary.close()
+            raise
+
+    def watch(self, dictionary, interval=1.0):
+        """Starts a thread which reloads the ``dictionary`` by ``self.reload()`` whenever its file is replaced.
+
+        Args:
+            dictionary (Dictionary): a dictionary added to this object
+            interval (float): the polling interval in seconds
+
+        Returns:
+            DictionaryWatcher: the started watcher. Call its ``stop()`` to stop watching.
+        """
+        # imported here, as the watcher imports logging
+        from .dictionarywatcher import DictionaryWatcher
+        watcher = DictionaryWatcher(self, dictionary, interval)
+        watcher.start()
+        return watcher
+
+    def _swap(self, generation, closing):
+        """Makes the ``generation`` current and retires the previous one. Must be called with ``self._lock``.
+
+        Args:
+            generation (_Generation): the new generation
+            closing (list[Dictionary]): the dictionaries of the previous generation to be closed
+        """
+        previous = self._generation
+        self._generation = generation
+        previous.retired = True
+        previous.closing = closing
+        if previous.readers == 0:
+            _close_all(previous)
+
+    def _enter(self):
+        """Returns the current generation and counts a lookup on it.
+
+        Returns:
+            _Generation: the current generation
+        """
+        with self._lock:
+            generation = self._generation
+            generation.readers += 1
+            return generation
+
+    def _leave(self, generation):
+        """Uncounts a lookup on the ``generation``, and closes its dictionaries if it is the last one after a reload.
+
+        Args:
+            generation (_Generation): a generation returned by ``self._enter()``
+        """
+        with self._lock:
+            generation.readers -= 1
+            if generation.retired and generation.readers == 0:
+                _close_all(generation)
 
     def find(self, word, group_ids=None):
         """Returns synonyms for the specified word.
@@ -58,20 +263,280 @@ class Chikkar(object):
         Returns:
             list[str]: a list of synonym head words
         """
-        for dictionary in self._dictionaries:
+        generation = self._enter()
+        try:
+            return self._find(generation, word, group_ids, None)
+        finally:
+            self._leave(generation)
+
+    def find_bytes(self, data, group_ids=None):
+        """Returns synonyms for the specified UTF-8 encoded word, caching the results.
+
+        This gives the same result as ``self.find()`` for the decoded word. The results are cached by the bytes,
+        the verb mode and the ``group_ids`` in a least-recently-used cache, so a repeated word is answered
+        without decoding it or the synonym groups. The cache is emptied when the dictionaries change.
+
+        Args:
+            data (bytes | bytearray | memoryview): a UTF-8 encoded keyword
+            group_ids (list[int]): synonym group IDs
+
+        Returns:
+            list[str]: a new list of synonym head words
+        """
+        if type(data) is not bytes:
+            data = bytes(data)
+        key = (data, self._can_search_verb, tuple(group_ids) if group_ids is not None else None)
+        # a cached result is read without entering the generation, as it does not touch the dictionaries
+        synonyms = self._generation.results.get(key)
+        if synonyms is not None:
+            return list(synonyms)
+
+        generation = self._enter()
+        try:
+            synonyms = tuple(self._find(generation, data.decode('utf-8'), group_ids, None))
+        finally:
+            self._leave(generation)
+        generation.results.put(key, synonyms)
+        return list(synonyms)
+
+    def result_cache_info(self):
+        """Returns the statistics of the result cache of ``self.find_bytes()`` for the current dictionaries.
+
+        Returns:
+            CacheInfo: the numbers of hits, misses and evictions, the current size and the maximum size
+        """
+        return self._generation.results.info()
+
+    def find_many(self, words, group_ids=None, persistent_cache=None):
+        """Returns synonyms for each of the specified words.
+
+        This is equivalent to calling ``self.find()`` for each word, but each distinct key is resolved only once
+        and synonym groups are decoded only once per call, which pays off for token streams with many repeated words.
+
+        With a ``persistent_cache``, the results of the distinct keys are read from it at once,
+        and only the others are resolved and then written to it.
+
+        Args:
+            words (Iterable[str]): keywords
+            group_ids (Iterable[list[int] | None] | None): synonym group IDs for each keyword
+            persistent_cache (PersistentResultCache | None): a cache of results kept across runs and processes
+
+        Returns:
+            list[list[str]]: lists of synonym head words in the same order as ``words``
+        """
+        keys = zip(words, group_ids) if group_ids is not None else ((word, None) for word in words)
+        resolved = {}
+        synonym_groups = {}
+        results = []
+        can_search_verb = self._can_search_verb
+        generation = self._enter()
+        try:
+            if persistent_cache is not None:
+                keys = [(word, tuple(gids) if gids is not None else None) for word, gids in keys]
+                resolved = persistent_cache.get_many(self._fingerprint(generation), can_search_verb, set(keys))
+                computed = {}
+            for word, gids in keys:
+                key = (word, tuple(gids) if gids is not None else None)
+                synonyms = resolved.get(key)
+                if synonyms is None:
+                    synonyms = self._find(generation, word, gids, synonym_groups)
+                    resolved[key] = synonyms
+                    if persistent_cache is not None:
+                        computed[key] = synonyms
+                results.append(list(synonyms))
+            if persistent_cache is not None:
+                persistent_cache.put_many(self._fingerprint(generation), can_search_verb, computed)
+        finally:
+            self._leave(generation)
+        return results
+
+    @staticmethod
+    def _fingerprint(generation):
+        """Returns the key of the dictionaries of the ``generation`` in a ``PersistentResultCache``."""
+        if generation.fingerprint is None:
+            # imported here, as the persistent cache imports sqlite3
+            from .resultcache import fingerprint
+            generation.fingerprint = fingerprint(generation.dictionaries)
+        return generation.fingerprint
+
+    def scan(self, text, policy=LONGEST_MATCH):
+        """Finds headwords in a raw text and yields their synonyms.
+
+        The text is walked once from each character with a common prefix search in the tries,
+        so no tokenizer is needed. For each span, the dictionary added later takes precedence as in ``self.find()``,
+        and only spans with at least one synonym are yielded.
+
+        Args:
+            text (str | bytes): a text, or a UTF-8 encoded text
+            policy (str): ``LONGEST_MATCH`` to yield the longest span from a position and continue after it,
+                or ``ALL_MATCHES`` to yield every span from every position
+
+        Yields:
+            tuple[int, int, list[str]]: the start and end offsets of a span and its synonyms.
+            The offsets are character offsets for ``str`` and byte offsets for ``bytes``.
+
+        Raises:
+            ValueError: ``policy`` is invalid
+        """
+        if policy not in (LONGEST_MATCH, ALL_MATCHES):
+            raise ValueError("'{}' is an invalid policy. '{}' or '{}' are allowed.".format(policy, LONGEST_MATCH, ALL_MATCHES))
+
+        generation = self._enter()
+        try:
+            for span in self._scan(generation, text, policy):
+                yield span
+        finally:
+            self._leave(generation)
+
+    def _scan(self, generation, text, policy):
+        """Yields the spans of ``self.scan()`` on the dictionaries of the ``generation``."""
+        is_str = isinstance(text, str)
+        data = text.encode('utf-8') if is_str else bytes(text)
+        length = len(data)
+        position = 0
+        char_position = 0
+        while position < length:
+            if data[position] & 0xC0 == 0x80:
+                # a continuation byte of UTF-8
+                position += 1
+                continue
+
+            matches = {}
+            for dictionary in generation.dictionaries:
+                for index, end in dictionary.lookup_prefixes(data, position):
+                    if end not in matches:
+                        matches[end] = (dictionary, index)
+
+            next_position = position + 1
+            next_char_position = char_position + 1
+            for end in sorted(matches, reverse=(policy == LONGEST_MATCH)):
+                dictionary, index = matches[end]
+                word = data[position:end].decode('utf-8')
+                synonyms = self._expand_index(word, index, dictionary)
+                if not synonyms:
+                    continue
+                if is_str:
+                    yield char_position, char_position + len(word), synonyms
+                else:
+                    yield position, end, synonyms
+                if policy == LONGEST_MATCH:
+                    next_position = end
+                    next_char_position = char_position + len(word)
+                    break
+
+            position = next_position
+            char_position = next_char_position
+
+    def _expand_index(self, word, index, dictionary, synonym_groups=None):
+        """Returns synonyms for the headword at the ``index`` of the ID table of the ``dictionary``.
+
+        Args:
+            word (str): keyword
+            index (int): the index of the ``word`` in the ID table
+            dictionary (Dictionary): a synonym dictionary
+            synonym_groups (dict[tuple[int, int], SynonymGroup | None] | None): decoded groups to be shared between calls
+
+        Returns:
+            list[str]: a list of synonym head words
+        """
+        if dictionary.expansion_table is not None:
+            return dictionary.expand_index(index, self._can_search_verb)
+        return self._gather(word, dictionary.get_group_ids(index), dictionary, synonym_groups)
+
+    def _find(self, generation, word, group_ids, synonym_groups):
+        """Returns synonyms for the specified word.
+
+        Args:
+            generation (_Generation): the dictionaries to search
+            word (str): keyword
+            group_ids (list[int] | None): synonym group IDs
+            synonym_groups (dict[tuple[int, int], SynonymGroup | None] | None): decoded groups to be shared between calls
+
+        Returns:
+            list[str]: a list of synonym head words
+        """
+        stats = self._stats
+        if stats is None:
+            return self._search(generation, word, group_ids, synonym_groups)
+        start = time.perf_counter()
+        try:
+            return self._search(generation, word, group_ids, synonym_groups)
+        finally:
+            stats.add_find(time.perf_counter() - start)
+
+    def _search(self, generation, word, group_ids, synonym_groups):
+        """Returns synonyms for the specified word without counting the lookup. See ``self._find()``."""
+        if generation.merged_index is not None:
+            return self._find_merged(generation.merged_index, word, group_ids, synonym_groups)
+
+        for dictionary in generation.dictionaries:
+            if dictionary.expansion_table is not None and (dictionary.enable_trie or group_ids is None):
+                synonyms = dictionary.expand(word, self._can_search_verb)
+                if synonyms is None:
+                    continue
+                return synonyms
+
             gids = dictionary.lookup(word, group_ids)
             if len(gids) == 0:
                 continue
-
-            synonyms = []
-            for gid in gids:
-                ret = self.gather_head_word(word, gid, dictionary)
-                if ret:
-                    synonyms += ret
-            return synonyms
+            return self._gather(word, gids, dictionary, synonym_groups)
 
         return []
 
+    def _find_merged(self, merged_index, word, group_ids, synonym_groups):
+        """Returns synonyms for the specified word with a single probe of the ``merged_index``.
+
+        This gives the same result as ``self._find()`` without the merged index.
+        """
+        position, index = merged_index.lookup(word, trie_only=group_ids is not None)
+        stats = self._stats
+        if stats is not None:
+            stats.add_merged_probe(position >= 0)
+        if group_ids and 0 <= merged_index.group_id_position and (position < 0 or merged_index.group_id_position < position):
+            # a dictionary searched by the group IDs precedes the dictionaries with the word
+            dictionary = merged_index.dictionaries[merged_index.group_id_position]
+            return self._gather(word, group_ids, dictionary, synonym_groups)
+        if position < 0:
+            return []
+        return self._expand_index(word, index, merged_index.dictionaries[position], synonym_groups)
+
+    def _gather(self, word, group_ids, dictionary, synonym_groups):
+        """Returns synonyms for the specified word in the groups with the ``group_ids``.
+
+        Args:
+            word (str): keyword
+            group_ids (Iterable[int]): synonym group IDs
+            dictionary (Dictionary): a synonym dictionary
+            synonym_groups (dict[tuple[int, int], SynonymGroup | list | None] | None): decoded groups, or their members
+                if the dictionary has the group index, to be shared between calls
+
+        Returns:
+            list[str]: a list of synonym head words
+        """
+        if dictionary.group_index is not None:
+            # only the head words and flags are needed
+            get_group, gather_head_word = dictionary.get_group_members, self._gather_member_head_word
+        else:
+            get_group, gather_head_word = dictionary.get_synonym_group, self._gather_head_word
+        stats = self._stats
+        if stats is not None:
+            gather_head_word = stats.timed_filter(gather_head_word)
+        synonyms = []
+        for gid in group_ids:
+            if synonym_groups is None:
+                synonym_group = get_group(gid)
+            else:
+                key = (id(dictionary), gid)
+                if key in synonym_groups:
+                    synonym_group = synonym_groups[key]
+                else:
+                    synonym_group = get_group(gid)
+                    synonym_groups[key] = synonym_group
+            ret = gather_head_word(word, gid, synonym_group, dictionary)
+            if ret:
+                synonyms += ret
+        return synonyms
+
     def gather_head_word(self, word, group_id, dictionary):
         """Searches synonyms by the ``group_id`` from the ``dictionary``.
 
@@ -92,9 +557,13 @@ class Chikkar(object):
         Raises:
             ValueError: The ``group_id`` is defined in the dictionary, but the ``key`` does not exist in the group.
         """
-        head_words = []
+        return self._gather_head_word(word, group_id, dictionary.get_synonym_group(group_id), dictionary)
 
-        synonym_group = dictionary.get_synonym_group(group_id)
+    def _gather_head_word(self, word, group_id, synonym_group, dictionary):
+        """Returns head words of the ``synonym_group`` with the ``group_id``.
+
+        See ``self.gather_head_word()`` for the details.
+        """
         if synonym_group is None:
             return None
 
@@ -107,6 +576,7 @@ class Chikkar(object):
         if looked_up.has_ambiguity:
             return None
 
+        head_words = []
         for synonym in synonym_group.get_synonyms():
             if synonym.head_word == word:
                 continue
@@ -115,3 +585,71 @@ class Chikkar(object):
 
             head_words.append(synonym.head_word)
         return head_words
+
+    def _gather_member_head_word(self, word, group_id, members, dictionary):
+        """Returns head words of the group with the ``group_id`` from its ``members`` in the group index.
+
+        This gives the same result as ``self._gather_head_word()`` for the decoded group.
+
+        Args:
+            word (str): keyword
+            group_id (int): synonym group ID
+            members (list[tuple[str, Flags]] | None): the head words and flags of the group
+            dictionary (Dictionary): a synonym dictionary
+
+        Returns:
+            list[str] | None: head words of synonyms
+
+        Raises:
+            ValueError: The ``group_id`` is defined in the dictionary, but the ``key`` does not exist in the group.
+        """
+        if members is None:
+            return None
+
+        for head_word, flags in members:
+            if head_word == word:
+                if flags.has_ambiguity:
+                    return None
+                break
+        else:
+            raise ValueError(
+                "The dictionary (``{}``) has a group ID of {}, "
+                "but the key (``{}``) dose not exist in the group.".format(dictionary.filename, group_id, word)
+            )
+
+        can_search_verb = self._can_search_verb
+        return [head_word for head_word, flags in members
+                if head_word != word and (can_search_verb or flags.is_noun)]
+
+
+def _validate(dictionary):
+    """Checks that the groups at both ends of the offset table can be decoded and that all the data fit in the file.
+
+    Args:
+        dictionary (Dictionary): a synonym dictionary
+
+    Raises:
+        ValueError: the dictionary is broken, e.g. truncated while it was written
+    """
+    group_list = dictionary.group_list
+    offset_table = group_list.offset_table
+    size = len(dictionary.dict_.bytes_)
+    try:
+        if len(offset_table) > 0:
+            group_list.read_synonym_group(offset_table.group_id_at(0), offset_table.offset_at(0))
+            last = len(offset_table) - 1
+            group_list.read_synonym_group(offset_table.group_id_at(last), offset_table.offset_at(last))
+            _, end = group_list.read_head_words(offset_table.offset_at(last))
+            if end > size:
+                raise ValueError('the last synonym group exceeds the file')
+        for offset, length in dictionary.dict_.sections.values():
+            if offset + length > size:
+                raise ValueError('a section exceeds the file')
+    except (IndexError, ValueError, struct.error) as e:
+        raise ValueError('The dictionary (``{}``) is broken: {}'.format(dictionary.filename, e))
+
+
+def _close_all(generation):
+    for dictionary in generation.closing:
+        dictionary.close()
+    generation.closing = []
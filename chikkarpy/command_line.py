@@ -14,16 +14,27 @@
 
 import argparse
 import fileinput
-import logging
+import multiprocessing
 import os
 import sys
 import time
+from collections import deque
 
 from . import Chikkar
 from .dictionarylib import Dictionary
+from .dictionarylib.dictionary import DEFAULT_CACHE_SIZE
 from .dictionarylib.dictionarybuilder import DictionaryBuilder
 from .dictionarylib.dictionaryheader import DictionaryHeader
-from .dictionarylib.dictionaryversion import SYSTEM_DICT_VERSION_1
+from .dictionarylib.incrementaldictionarybuilder import IncrementalDictionaryBuilder
+from .dictionarylib.streamingdictionarybuilder import StreamingDictionaryBuilder
+from .resultcache import DEFAULT_MAX_ENTRIES, PersistentResultCache
+from .server import DEFAULT_IDLE_TIMEOUT, DEFAULT_WORKERS, SynonymService, make_server
+from .stats import to_prometheus
+
+# the buffer size of the output file for ``search``
+OUTPUT_BUFFER_SIZE = 1 << 20
+# the number of lines processed at once by a worker of ``search -j``
+CHUNK_SIZE = 10000
 
 
 def _set_default_subparser(self, name, args=None):
@@ -59,39 +70,180 @@ def print_version():
     print('chikkarpy {}'.format(__version__))
 
 
-def search_synonyms(enable_verb, dictionaries, input_, stdout_logger):
+def load_chikkar(enable_verb, dictionaries):
+    """Opens the dictionaries once and returns a ``Chikkar`` to be reused for the whole input.
+
+    Args:
+        enable_verb (bool): ``True`` to enable verb and adjective synonyms
+        dictionaries (list[str | None]): paths of synonym dictionaries, ``None`` for the system dictionary
+
+    Returns:
+        Chikkar: a ``Chikkar`` with the dictionaries
+    """
+    chikkar = Chikkar()
+    if enable_verb:
+        chikkar.enable_verb()
+    for dictionary in dictionaries:
+        # the groups are not handed out, so they can be cached
+        chikkar.add_dictionary(Dictionary(filename=dictionary, cache_size=DEFAULT_CACHE_SIZE))
+    return chikkar
+
+
+def write_synonyms(chikkar, input_, output, persistent_cache=None):
+    """Searches synonyms for each line of ``input_`` and writes them to ``output``.
+
+    Args:
+        chikkar (Chikkar): a ``Chikkar`` with the dictionaries already loaded
+        input_ (Iterable[str]): lines of keywords
+        output (TextIO): a buffered text stream
+        persistent_cache (PersistentResultCache | None): a cache of results kept across runs,
+            which is read and written a chunk of lines at a time
+    """
+    write = output.write
+    if persistent_cache is not None:
+        for chunk in _chunks(input_, CHUNK_SIZE):
+            write(_search_lines(chikkar, chunk, persistent_cache))
+        return
+    find = chikkar.find
     for word in input_:
         word = word.rstrip('\n')
-        chikkar = Chikkar()
-        if enable_verb:
-            chikkar.enable_verb()
-        for dictionary in dictionaries:
-            dic = Dictionary(filename=dictionary)
-            chikkar.add_dictionary(dic)
-        stdout_logger.info("{}\t{}".format(word, ','.join(chikkar.find(word))))
+        write('{}\t{}\n'.format(word, ','.join(find(word))))
+
+
+def search_synonyms(enable_verb, dictionaries, input_, stdout_logger):
+    """Searches synonyms for each line of ``input_`` and logs them to ``stdout_logger``.
+
+    This is kept for compatibility; ``write_synonyms()`` reuses a ``Chikkar`` and writes to a buffered stream.
+
+    Args:
+        enable_verb (bool): ``True`` to enable verb and adjective synonyms
+        dictionaries (list[str | None]): paths of synonym dictionaries, ``None`` for the system dictionary
+        input_ (Iterable[str]): lines of keywords
+        stdout_logger (logging.Logger): a logger to which a line is logged for each keyword
+    """
+    chikkar = load_chikkar(enable_verb, dictionaries)
+    try:
+        for word in input_:
+            word = word.rstrip('\n')
+            stdout_logger.info('{}\t{}'.format(word, ','.join(chikkar.find(word))))
+    finally:
+        for dictionary in chikkar._dictionaries:
+            dictionary.close()
+
+
+# a ``Chikkar`` and a ``PersistentResultCache`` opened by each worker process of ``search_synonyms_parallel``
+_worker_chikkar = None
+_worker_cache = None
+# the error raised while opening them, which is raised again by each task
+_worker_error = None
+
+
+def _init_search_worker(enable_verb, dictionaries, cache_path=None, cache_size=DEFAULT_MAX_ENTRIES):
+    global _worker_chikkar, _worker_cache, _worker_error
+    # an error raised by the initializer would make the pool start new workers forever
+    try:
+        _worker_chikkar = load_chikkar(enable_verb, dictionaries)
+        if cache_path is not None:
+            _worker_cache = PersistentResultCache(cache_path, max_entries=cache_size)
+    except Exception as e:
+        _worker_error = e
+
+
+def _search_chunk(lines):
+    if _worker_error is not None:
+        raise _worker_error
+    return _search_lines(_worker_chikkar, lines, _worker_cache)
+
+
+def _search_lines(chikkar, lines, persistent_cache):
+    words = [line.rstrip('\n') for line in lines]
+    results = chikkar.find_many(words, persistent_cache=persistent_cache)
+    return ''.join('{}\t{}\n'.format(word, ','.join(synonyms)) for word, synonyms in zip(words, results))
+
+
+def _chunks(input_, chunk_size):
+    chunk = []
+    for line in input_:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def search_synonyms_parallel(enable_verb, dictionaries, input_, output, processes, chunk_size=CHUNK_SIZE,
+                             cache_path=None, cache_size=DEFAULT_MAX_ENTRIES):
+    """Searches synonyms for each line of ``input_`` in worker processes and writes them to ``output`` in order.
+
+    Each worker opens the dictionaries by path once, so the memory-mapped pages are shared through the page cache.
+    At most ``2 * processes`` chunks are read ahead of the output.
+    With a ``cache_path``, the workers share the ``PersistentResultCache`` in the file.
+    The dictionaries and the cache file are opened once before starting the workers, so that an error is raised here.
+
+    Args:
+        enable_verb (bool): ``True`` to enable verb and adjective synonyms
+        dictionaries (list[str | None]): paths of synonym dictionaries, ``None`` for the system dictionary
+        input_ (Iterable[str]): lines of keywords
+        output (TextIO): a buffered text stream
+        processes (int): the number of worker processes
+        chunk_size (int): the number of lines sent to a worker at once
+        cache_path (str | None): path of the file of a ``PersistentResultCache``, or ``None`` not to cache results
+        cache_size (int): the maximum number of results in the cache file
+    """
+    chikkar = load_chikkar(enable_verb, dictionaries)
+    for dictionary in chikkar._dictionaries:
+        dictionary.close()
+    if cache_path is not None:
+        PersistentResultCache(cache_path, max_entries=cache_size).close()
+
+    pending = deque()
+    initargs = (enable_verb, dictionaries, cache_path, cache_size)
+    with multiprocessing.Pool(processes, initializer=_init_search_worker, initargs=initargs) as pool:
+        for chunk in _chunks(input_, chunk_size):
+            pending.append(pool.apply_async(_search_chunk, (chunk,)))
+            if len(pending) >= 2 * processes:
+                output.write(pending.popleft().get())
+        while pending:
+            output.write(pending.popleft().get())
 
 
 def _command_search(args, print_usage):
     if args.version:
         print_version()
         return
+    if args.stats and args.processes > 1:
+        print_usage()
+        print('{}: error: --stats cannot be used with -j'.format(__name__), file=sys.stderr)
+        exit(1)
 
-    stdout_logger = logging.getLogger(__name__)
-
-    output = open(args.fpath_out, "w", encoding="utf-8") if args.fpath_out else sys.stdout
-
-    handler = logging.StreamHandler(output)
-    handler.setLevel(logging.DEBUG)
-    stdout_logger.addHandler(handler)
-    stdout_logger.setLevel(logging.DEBUG)
-    stdout_logger.propagate = False
+    output = open(args.fpath_out, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) if args.fpath_out else sys.stdout
 
     try:
         input_ = fileinput.input(args.in_files, openhook=fileinput.hook_encoded("utf-8"))
-        search_synonyms(args.enable_verb, args.dictionaries, input_, stdout_logger)
+        if args.processes > 1:
+            search_synonyms_parallel(args.enable_verb, args.dictionaries, input_, output, args.processes,
+                                     cache_path=args.cache_path, cache_size=args.cache_size)
+        else:
+            chikkar = load_chikkar(args.enable_verb, args.dictionaries)
+            if args.stats:
+                chikkar.enable_stats()
+            persistent_cache = None
+            if args.cache_path is not None:
+                persistent_cache = PersistentResultCache(args.cache_path, max_entries=args.cache_size)
+            try:
+                write_synonyms(chikkar, input_, output, persistent_cache)
+            finally:
+                if persistent_cache is not None:
+                    persistent_cache.close()
+            if args.stats:
+                output.flush()
+                sys.stderr.write(to_prometheus(chikkar.stats_snapshot()))
     finally:
         if args.fpath_out:
             output.close()
+        else:
+            output.flush()
 
 
 def _input_files_checker(args, print_usage):
@@ -102,17 +254,71 @@ def _input_files_checker(args, print_usage):
             exit(1)
 
 
-def build_dictionary(input_file, output_file, description):
-    header = DictionaryHeader(SYSTEM_DICT_VERSION_1, int(time.time()), description)
+def build_dictionary(input_file, output_file, description, expansion_table=False, streaming=False, processes=1,
+                     base_file=None, removed_group_ids=(), group_index=False, string_pool=False):
+    if removed_group_ids and base_file is None:
+        raise ValueError('groups can be removed only from the base dictionary')
+    if base_file is not None:
+        if streaming:
+            raise ValueError('a dictionary cannot be updated in the streaming mode')
+        builder = IncrementalDictionaryBuilder(base_file, expansion_table=expansion_table, processes=processes,
+                                               removed_group_ids=removed_group_ids, group_index=group_index,
+                                               string_pool=string_pool)
+    elif streaming:
+        builder = StreamingDictionaryBuilder(expansion_table=expansion_table, processes=processes, group_index=group_index,
+                                             string_pool=string_pool)
+    else:
+        builder = DictionaryBuilder(expansion_table=expansion_table, processes=processes, group_index=group_index,
+                                    string_pool=string_pool)
+    header = DictionaryHeader(builder.version, int(time.time()), description)
     with open(output_file, 'wb') as wf:
         wf.write(header.to_byte())
-
-        builder = DictionaryBuilder()
         builder.build(input_file, wf)
 
 
+def read_group_ids(path):
+    """Reads synonym group IDs written one per line.
+
+    Args:
+        path (str): a file path
+
+    Returns:
+        list[int]: the group IDs
+    """
+    with open(path, 'r', encoding='utf-8') as rf:
+        return [int(line) for line in rf if line.strip()]
+
+
 def _command_build(args, print_usage):
-    build_dictionary(args.input_file, args.out_file, args.description)
+    if args.removed_file and not args.base_file:
+        print_usage()
+        print('{}: error: -r can be used only with -b'.format(__name__), file=sys.stderr)
+        exit(1)
+    removed_group_ids = read_group_ids(args.removed_file) if args.removed_file else ()
+    build_dictionary(args.input_file, args.out_file, args.description, expansion_table=args.expansion_table,
+                     streaming=args.streaming, processes=args.processes, base_file=args.base_file,
+                     removed_group_ids=removed_group_ids, group_index=args.group_index, string_pool=args.string_pool)
+
+
+def _command_serve(args, print_usage):
+    dictionaries = [Dictionary(filename=dictionary, cache_size=DEFAULT_CACHE_SIZE) for dictionary in args.dictionaries]
+    service = SynonymService(dictionaries, args.enable_verb)
+    try:
+        server = make_server(service, args.host, args.port, args.unix_path, args.workers, args.idle_timeout)
+    except OSError:
+        service.close()
+        raise
+    if args.unix_path is not None:
+        print('serving on {}'.format(args.unix_path), file=sys.stderr)
+    else:
+        print('serving on http://{}:{}/find'.format(*server.server_address[:2]), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
 
 
 def main():
@@ -127,6 +333,14 @@ def main():
     parser_ss.add_argument('-ev', dest='enable_verb', action='store_true', default=False,
                            help='Enable verb and adjective synonyms.')
     parser_ss.add_argument('-o', dest='fpath_out', metavar='file', help='the output file')
+    parser_ss.add_argument('-j', dest='processes', metavar='N', type=int, default=1,
+                           help='the number of worker processes (default: 1)')
+    parser_ss.add_argument('--cache', dest='cache_path', metavar='file', default=None,
+                           help='an SQLite file keeping the results across runs and processes')
+    parser_ss.add_argument('--cache-size', dest='cache_size', metavar='N', type=int, default=DEFAULT_MAX_ENTRIES,
+                           help='the maximum number of results in the cache file (default: {})'.format(DEFAULT_MAX_ENTRIES))
+    parser_ss.add_argument('--stats', dest='stats', action='store_true', default=False,
+                           help='print the counters of the lookups in the Prometheus text format to stderr')
     parser_ss.add_argument('in_files', metavar='file', nargs=argparse.ZERO_OR_MORE, help='text written in utf-8')
     parser_ss.add_argument('-v', '--version', action='store_true', dest='version', help='print chikkarpy version')
     parser_ss.set_defaults(handler=_command_search, print_usage=parser_ss.print_usage)
@@ -139,9 +353,40 @@ def main():
                            help='output file (default: synonym.dic)')
     parser_bd.add_argument('-d', dest='description', metavar='string', default='', required=False,
                            help='description comment to be embedded on dictionary')
+    parser_bd.add_argument('-e', dest='expansion_table', action='store_true', default=False,
+                           help='embed the precomputed expansion table (dictionary version 2)')
+    parser_bd.add_argument('-g', dest='group_index', action='store_true', default=False,
+                           help='embed the group index for searches by group IDs (dictionary version 2)')
+    parser_bd.add_argument('-p', dest='string_pool', action='store_true', default=False,
+                           help='store each distinct string once in UTF-8 (dictionary version 3)')
+    parser_bd.add_argument('-s', dest='streaming', action='store_true', default=False,
+                           help='write synonym groups while reading to save memory (cannot be used with -e or -g)')
+    parser_bd.add_argument('-j', dest='processes', metavar='N', type=int, default=1,
+                           help='the number of worker processes to parse the input (default: 1)')
+    parser_bd.add_argument('-b', dest='base_file', metavar='file', default=None,
+                           help='dictionary to be updated with the groups in the input (cannot be used with -s)')
+    parser_bd.add_argument('-r', dest='removed_file', metavar='file', default=None,
+                           help='group IDs to be removed from the dictionary of -b, one per line')
 
     parser_bd.set_defaults(handler=_command_build, print_usage=parser_bd.print_usage)
 
+    # serve synonyms parser
+    parser_sv = subparsers.add_parser('serve', help='see `serve -h`', description='Serve synonyms over HTTP or a Unix socket')
+    parser_sv.add_argument('-d', dest='dictionaries', metavar='file', nargs=argparse.ZERO_OR_MORE, default=[None],
+                           help='synonym dictionary (default: system synonym dictionary)')
+    parser_sv.add_argument('-ev', dest='enable_verb', action='store_true', default=False,
+                           help='Enable verb and adjective synonyms unless a query specifies "enable_verb".')
+    parser_sv.add_argument('--host', dest='host', default='127.0.0.1', help='the host name to listen on (default: 127.0.0.1)')
+    parser_sv.add_argument('--port', dest='port', type=int, default=8080, help='the port to listen on (default: 8080)')
+    parser_sv.add_argument('--unix', dest='unix_path', metavar='file', default=None,
+                           help='listen on a Unix domain socket instead of HTTP')
+    parser_sv.add_argument('-w', dest='workers', metavar='N', type=int, default=DEFAULT_WORKERS,
+                           help='the number of worker threads, i.e. connections served at once (default: {})'.format(
+                               DEFAULT_WORKERS))
+    parser_sv.add_argument('--idle-timeout', dest='idle_timeout', metavar='sec', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                           help='seconds after which an idle connection is closed (default: {})'.format(DEFAULT_IDLE_TIMEOUT))
+    parser_sv.set_defaults(handler=_command_serve, print_usage=parser_sv.print_usage)
+
     parser.set_default_subparser('search')
 
     args = parser.parse_args()
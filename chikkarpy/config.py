@@ -16,8 +16,6 @@ import os
 from logging import getLogger
 from pathlib import Path
 from urllib.parse import urlparse
-from urllib.request import urlretrieve
-from zipfile import ZipFile
 
 
 DEFAULT_RESOURCEDIR = Path(__file__).absolute().parent / 'resources'
@@ -39,6 +37,10 @@ logger = getLogger(__name__)
 
 
 def download_dictionary():
+    # imported here, as they take longer to import than the lookup path
+    from urllib.request import urlretrieve
+    from zipfile import ZipFile
+
     if not os.path.exists(DEFAULT_RESOURCEDIR):
         logger.warning("Downloading the Sudachi Synonym dictionary (It may take a while) ...")
 
@@ -15,13 +15,14 @@
 import mmap
 
 from .dictionaryheader import DictionaryHeader
-from .dictionaryversion import is_dictionary
+from .dictionaryversion import has_sections, is_dictionary
 from .doublearraytrie import DoubleArrayTrie
+from .sections import read_sections
 
 
 class BinaryDictionary(object):
 
-    def __init__(self, bytes_, header, trie, offset):
+    def __init__(self, bytes_, header, trie, offset, sections=None):
         """Constructs a new dictionary.
 
         Args:
@@ -29,11 +30,13 @@ class BinaryDictionary(object):
             header (DictionaryHeader): a header of dictionary
             trie (DoubleArrayTrie): a double array trie
             offset (int): byte offset
+            sections (dict[int, tuple[int, int]] | None): byte offsets and sizes of optional sections by tag
         """
         self._bytes = bytes_
         self._header = header
         self._trie = trie
         self._offset = offset
+        self._sections = sections if sections is not None else {}
 
     @staticmethod
     def _read_dictionary(filename, access=mmap.ACCESS_READ):
@@ -44,7 +47,7 @@ class BinaryDictionary(object):
             access (int): file-open mode
 
         Returns:
-            tuple[mmap.mmap, DictionaryHeader, DoubleArrayTrie, int]: byte data to be read
+            tuple[mmap.mmap, DictionaryHeader, DoubleArrayTrie, int, dict[int, tuple[int, int]]]: byte data to be read
         """
         with open(filename, 'rb') as system_dic:
             bytes_ = mmap.mmap(system_dic.fileno(), 0, access=access)
@@ -59,7 +62,13 @@ class BinaryDictionary(object):
         trie = DoubleArrayTrie(bytes_, offset)
         offset += trie.get_storage_size()
 
-        return bytes_, header, trie, offset
+        sections = {}
+        if has_sections(header.version):
+            sections_offset = int.from_bytes(bytes_[offset:offset + 4], 'little')
+            offset += 4
+            sections = read_sections(bytes_, sections_offset)
+
+        return bytes_, header, trie, offset, sections
 
     @classmethod
     def from_system_dictionary(cls, filename):
@@ -97,3 +106,19 @@ class BinaryDictionary(object):
     def offset(self):
         """int: byte offset"""
         return self._offset
+
+    @property
+    def sections(self):
+        """dict[int, tuple[int, int]]: byte offsets and sizes of optional sections by tag"""
+        return self._sections
+
+    def get_section(self, tag):
+        """Returns the location of the optional section with the specified tag.
+
+        Args:
+            tag (int): a section tag
+
+        Returns:
+            tuple[int, int] | None: byte offset and size of the section, or ``None`` if the dictionary does not have it
+        """
+        return self._sections.get(tag)
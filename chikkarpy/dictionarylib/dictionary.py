@@ -12,29 +12,102 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
+from . import sections
 from .binarydictionary import BinaryDictionary
+from .expansiontable import ExpansionTable
+from .groupindex import GroupIndex
+from .stringpool import open_string_pool
 from .synonym_group_list import SynonymGroupList
-from ..config import get_system_dictionary_path
+from ..stats import DictionaryStats
 from ..synonymgroup import SynonymGroup
 
 
+# a size of the cache of decoded synonym groups for callers which do not keep the groups,
+# such as ``Chikkar.find()``
+DEFAULT_CACHE_SIZE = 1024
+
+
 class Dictionary(object):
     """
     A container of synonyms
     """
-    def __init__(self, filename=None, enable_trie=False):
+    def __init__(self, filename=None, enable_trie=False, cache_size=0):
         """Reads the synonym dictionary from the specified file.
 
         If ``enable_trie`` is ``False``, a search by synonym group IDs takes precedence over a search by the headword.
 
+        With a positive ``cache_size``, decoded synonym groups are kept in a least-recently-used cache of
+        at most ``cache_size`` groups, e.g. ``DEFAULT_CACHE_SIZE``. ``self.get_synonym_group()`` then returns
+        the same ``SynonymGroup`` to every caller, so the callers must not modify it.
+
         Args:
             filename (str | None): path of synonym dictionary file
             enable_trie (bool): ``True`` to enable trie, otherwise ``False``
+            cache_size (int): the maximum number of cached synonym groups. ``0`` disables the cache.
         """
-        self.filename = filename if filename is not None else get_system_dictionary_path()
+        if filename is None:
+            # the configuration imports the modules to download the dictionary
+            from ..config import get_system_dictionary_path
+            filename = get_system_dictionary_path()
+        self.filename = filename
         self.dict_ = BinaryDictionary.from_system_dictionary(self.filename)
         self.enable_trie = enable_trie
-        self.group_list = SynonymGroupList(self.dict_.bytes_, self.dict_.offset)
+        self.cache_size = cache_size
+        self.group_list = SynonymGroupList(self.dict_.bytes_, self.dict_.offset, cache_size=cache_size,
+                                           string_pool=open_string_pool(self.dict_))
+
+        self.expansion_table = None
+        section = self.dict_.get_section(sections.EXPANSION_TABLE)
+        if section is not None:
+            self.expansion_table = ExpansionTable(self.dict_.bytes_, section[0], self.group_list.read_string)
+
+        self.group_index = None
+        section = self.dict_.get_section(sections.GROUP_INDEX)
+        if section is not None:
+            self.group_index = GroupIndex(self.dict_.bytes_, section[0], self.group_list.read_string)
+
+        # the counters of ``self.enable_stats()``, or ``None`` if the lookups are not counted
+        self.stats = None
+
+    def enable_stats(self, stats=None):
+        """Starts counting the trie probes, decoded groups and bytes read, and timing them.
+
+        Args:
+            stats (DictionaryStats | None): counters to be continued, e.g. those of the dictionary reloaded by this one,
+                or ``None`` to keep the current counters or start new ones
+
+        Returns:
+            DictionaryStats: the counters
+        """
+        if stats is None:
+            stats = self.stats if self.stats is not None else DictionaryStats()
+        self.stats = stats
+        self.group_list.stats = stats
+        return stats
+
+    def disable_stats(self):
+        """Stops counting the lookups."""
+        self.stats = None
+        self.group_list.stats = None
+
+    def stats_snapshot(self):
+        """Returns the counters of ``self.enable_stats()`` and the statistics of the synonym group cache.
+
+        Returns:
+            dict[str, str | int | float] | None: the counters by their names with ``filename``, ``group_cache_hits``
+            and ``group_cache_misses``, or ``None`` if the lookups are not counted
+        """
+        stats = self.stats
+        if stats is None:
+            return None
+        snapshot = stats.snapshot()
+        snapshot['filename'] = self.filename
+        cache_info = self.cache_info()
+        snapshot['group_cache_hits'] = cache_info.hits if cache_info is not None else 0
+        snapshot['group_cache_misses'] = cache_info.misses if cache_info is not None else 0
+        return snapshot
 
     def lookup(self, word, group_ids):
         """Returns a synonym group ID that contains the specified headword or a specified synonym group ID.
@@ -47,10 +120,103 @@ class Dictionary(object):
             list[int]: an array of synonym group IDs found, or an empty array if not found
         """
         if self.enable_trie or group_ids is None:
+            stats = self.stats
+            if stats is not None:
+                start = time.perf_counter()
+                gids = self.dict_.trie.lookup_by_exact_match(word.encode('utf-8'))
+                stats.add_probe(len(gids) > 0, time.perf_counter() - start)
+                return gids
             return self.dict_.trie.lookup_by_exact_match(word.encode('utf-8'))
         else:
             return group_ids
 
+    def lookup_index(self, word):
+        """Returns the index of the specified headword in the ID table of the trie.
+
+        Args:
+            word (str): a headword to search for
+
+        Returns:
+            int: the index in the ID table, or ``-1`` if the ``word`` is not in the dictionary
+        """
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+            index = self.dict_.trie.lookup_index_by_exact_match(word.encode('utf-8'))
+            stats.add_probe(index >= 0, time.perf_counter() - start)
+            return index
+        return self.dict_.trie.lookup_index_by_exact_match(word.encode('utf-8'))
+
+    def lookup_prefixes(self, text, offset):
+        """Returns the headwords which are prefixes of the ``text`` from the ``offset``.
+
+        Args:
+            text (bytes): a UTF-8 encoded text
+            offset (int): byte offset to start the search
+
+        Returns:
+            list[tuple[int, int]]: the indices in the ID table and the end offsets of the headwords, shortest first
+        """
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+            matches = self.dict_.trie.lookup_index_by_common_prefix(text, offset)
+            stats.add_probe(len(matches) > 0, time.perf_counter() - start)
+            return matches
+        return self.dict_.trie.lookup_index_by_common_prefix(text, offset)
+
+    def get_group_ids(self, index):
+        """Returns the synonym group IDs at the specified index of the ID table.
+
+        Args:
+            index (int): an index in the ID table
+
+        Returns:
+            tuple[int]: synonym group IDs
+        """
+        return self.dict_.trie.group_id_table.get(index)
+
+    def expand(self, word, can_search_verb):
+        """Returns head words of the synonyms of the specified headword by the precomputed expansion table.
+
+        This gives the same result as looking up the ``word`` in the trie and gathering the head words of its groups,
+        without decoding the groups.
+
+        Args:
+            word (str): a headword to search for
+            can_search_verb (bool): ``True`` to include verb and adjective synonyms
+
+        Returns:
+            list[str] | None: head words of the synonyms, or ``None`` if the ``word`` is not in the dictionary
+
+        Raises:
+            ValueError: the dictionary does not have the expansion table
+        """
+        index = self.lookup_index(word)
+        if index < 0:
+            return None
+        return self.expand_index(index, can_search_verb)
+
+    def expand_index(self, index, can_search_verb):
+        """Returns head words of the synonyms of the headword at the specified index by the precomputed expansion table.
+
+        Args:
+            index (int): the index of a headword in the ID table
+            can_search_verb (bool): ``True`` to include verb and adjective synonyms
+
+        Returns:
+            list[str]: head words of the synonyms
+
+        Raises:
+            ValueError: the dictionary does not have the expansion table
+        """
+        if self.expansion_table is None:
+            raise ValueError('The dictionary (``{}``) does not have the expansion table.'.format(self.filename))
+        stats = self.stats
+        if stats is not None:
+            stats.add_expansion()
+        return self.expansion_table.get(index, can_search_verb)
+
     def get_synonym_group(self, group_id):
         """Returns a group of synonyms with the specified ID.
 
@@ -62,5 +228,45 @@ class Dictionary(object):
         """
         return self.group_list.get_synonym_group(group_id)
 
+    def get_group_members(self, group_id):
+        """Returns the head words and flags of the synonyms in the group with the specified ID by the group index.
+
+        Only the head words are decoded, while ``self.get_synonym_group()`` also decodes lexeme IDs and categories.
+
+        Args:
+            group_id (int): a synonym group ID
+
+        Returns:
+            list[tuple[str, Flags]] | None: the head words and flags of the synonyms in the order of the group,
+            or ``None`` if no ID matches
+
+        Raises:
+            ValueError: the dictionary does not have the group index
+        """
+        if self.group_index is None:
+            raise ValueError('The dictionary (``{}``) does not have the group index.'.format(self.filename))
+        index = self.group_list.offset_table.index_of(group_id)
+        if index < 0:
+            return None
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+            members = self.group_index.get(index)
+            # the pointer, the number of members, and the flags and the reference of each member
+            stats.add_decode(4 + 2 + 6 * len(members), time.perf_counter() - start)
+            return members
+        return self.group_index.get(index)
+
+    def cache_info(self):
+        """Returns the statistics of the synonym group cache.
+
+        Returns:
+            CacheInfo | None: the numbers of hits, misses and evictions, the current size and the maximum size,
+            or ``None`` if the cache is disabled
+        """
+        if self.group_list.cache is None:
+            return None
+        return self.group_list.cache.info()
+
     def close(self):
         self.dict_.close()
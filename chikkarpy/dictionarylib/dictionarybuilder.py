@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import multiprocessing
+import struct
+from collections import deque
 from io import BufferedWriter, TextIOWrapper
 from logging import DEBUG, StreamHandler, getLogger
 
@@ -19,11 +22,46 @@ from dartsclone import DoubleArray
 
 from sortedcontainers import SortedDict
 
+from . import sections
+from .dictionaryversion import SYSTEM_DICT_VERSION_1, SYSTEM_DICT_VERSION_2, SYSTEM_DICT_VERSION_3, has_sections
+from .expansiontable import build_expansion_table
 from .flags import Flags
 from .format import Acronym, Ambiguity, Column, Form, IsNoun, Variant
-from .jtypedbytebuffer import JTypedByteBuffer
+from .groupindex import build_group_index
+from .stringpool import StringPoolBuilder
 from ..synonym import Synonym
 
+# the size of the buffer of synonym group records to be written to the output at once
+WRITE_BUFFER_SIZE = 1 << 20
+# the number of lines parsed at once by a worker of ``DictionaryBuilder.build_synonym_parallel``
+PARSE_CHUNK_SIZE = 10000
+
+_SHORT = struct.Struct('<h')
+_INT = struct.Struct('<i')
+_INT_PAIR = struct.Struct('<2i')
+# compiled structs of short arrays by their lengths
+_SHORT_ARRAYS = {}
+
+# plain int copies of the format constants, which ``parse_line`` would otherwise compute or convert for each line
+_GROUP_ID = int(Column.GROUP_ID)
+_IS_NOUN = int(Column.IS_NOUN)
+_AMBIGUITY = int(Column.AMBIGUITY)
+_LEXEME_IDS = int(Column.LEXEME_IDS)
+_FORM_TYPE = int(Column.FORM_TYPE)
+_ACRONYM_TYPE = int(Column.ACRONYM_TYPE)
+_VARIANT_TYPE = int(Column.VARIANT_TYPE)
+_CATEGORY = int(Column.CATEGORY)
+_HEAD_WORD = int(Column.HEAD_WORD)
+_MAX_COLUMN = max(map(int, Column))
+_IS_NOUN_TRUE = int(IsNoun.TRUE)
+_IS_NOUN_FALSE = int(IsNoun.FALSE)
+_AMBIGUITY_TRUE = int(Ambiguity.TRUE)
+_AMBIGUITY_FALSE = int(Ambiguity.FALSE)
+_AMBIGUITY_INVALID = int(Ambiguity.INVALID)
+_MAX_FORM = max(map(int, Form))
+_MAX_ACRONYM = max(map(int, Acronym))
+_MAX_VARIANT = max(map(int, Variant))
+
 
 class SynonymWithGroupId:
     def __init__(self, group_id, synonym):
@@ -77,16 +115,41 @@ class DictionaryBuilder:
 
         return logger
 
-    def __init__(self, *, logger=None):
-        self.byte_buffer = JTypedByteBuffer()
+    def __init__(self, *, logger=None, expansion_table=False, processes=1, group_index=False, string_pool=False):
+        """Constructs a new builder.
+
+        Args:
+            logger (Logger | None): a logger
+            expansion_table (bool): ``True`` to write the precomputed expansion table section
+            group_index (bool): ``True`` to write the group index section
+            string_pool (bool): ``True`` to intern the head words and categories into the string pool section
+            processes (int): the number of worker processes to parse the input. ``1`` parses it in this process.
+        """
+        self.byte_buffer = bytearray()
         self.trie_keys = SortedDict()
         self.synonym_groups = []
+        self.head_word_refs = []
         self.is_dictionary = False
+        self.expansion_table = expansion_table
+        self.group_index = group_index
+        self.string_pool = string_pool
+        # the distinct strings referred to by the groups if ``string_pool`` is ``True``
+        self.strings = StringPoolBuilder() if string_pool else None
+        self.processes = processes
         self.logger = logger or self.__default_logger()
 
+    @property
+    def version(self):
+        """int: the version of the dictionary to be written"""
+        if self.string_pool:
+            return SYSTEM_DICT_VERSION_3
+        return SYSTEM_DICT_VERSION_2 if self.expansion_table or self.group_index else SYSTEM_DICT_VERSION_1
+
     def build(self, input_path, out_stream):
         """Builds the synonym dictionary from the specified input file and writes it to the specified output.
 
+        The header of the ``self.version`` must already be written to ``out_stream``.
+
         Args:
             input_path (str): an input file path
             out_stream (BufferedWriter):
@@ -95,7 +158,13 @@ class DictionaryBuilder:
         with open(input_path, 'r', encoding='utf-8') as rf:
             self.build_synonym(rf)
         self.write_trie(out_stream)
+        sections_mark = None
+        if has_sections(self.version):
+            sections_mark = out_stream.tell()
+            out_stream.write(b'\x00' * 4)
         self.write_synonym_groups(out_stream)
+        if sections_mark is not None:
+            self.write_sections(out_stream, sections_mark)
 
     def build_synonym(self, synonym_input_stream):
         """Reads lines in the specified input file.
@@ -106,6 +175,10 @@ class DictionaryBuilder:
         Raises:
             ValueError: Group ID is changed in a group.
         """
+        if self.processes > 1:
+            self.build_synonym_parallel(synonym_input_stream)
+            return
+
         block = []
         line_no = -1
         group_id = -1
@@ -116,7 +189,7 @@ class DictionaryBuilder:
                     if len(block) == 0:
                         continue
                     else:
-                        self.synonym_groups.append(block)
+                        self.add_synonym_group(block)
                         block = []
                         group_id = -1
                 else:
@@ -130,13 +203,98 @@ class DictionaryBuilder:
                     self.add_to_trie(entry.headword, group_id)
                     block.append(entry)
             if len(block) > 0:
-                self.synonym_groups.append(block)
+                self.add_synonym_group(block)
+        except Exception as e:
+            if line_no >= 0:
+                self.logger.error(
+                    '{} at line {} in {}\n'.format(e.args[0], line_no, synonym_input_stream.name))
+            raise e
+
+    def build_synonym_parallel(self, synonym_input_stream):
+        """Reads lines in the specified input file and parses the blocks of them in worker processes.
+
+        The lines are parsed by ``DictionaryBuilder.parse_line()`` in the workers, and the parsed blocks are added
+        in the order of the input, so the dictionary is identical to that built serially.
+        Errors are reported with the same line numbers as ``self.build_synonym()``.
+
+        Args:
+            synonym_input_stream (TextIOWrapper): an input stream
+
+        Raises:
+            ValueError: Group ID is changed in a group.
+        """
+        line_no = -1
+        pending = deque()
+        try:
+            with multiprocessing.Pool(self.processes, initializer=_init_parse_worker) as pool:
+                chunk = []
+                n_lines = 0
+                block = []
+                block_start = -1
+                for i, row in enumerate(synonym_input_stream):
+                    line_no = i
+                    if not row or row.isspace():
+                        if len(block) == 0:
+                            continue
+                        chunk.append((block_start, block))
+                        n_lines += len(block)
+                        block = []
+                        if n_lines < PARSE_CHUNK_SIZE:
+                            continue
+                        pending.append(pool.apply_async(_parse_blocks, (chunk,)))
+                        chunk = []
+                        n_lines = 0
+                        if len(pending) >= 2 * self.processes:
+                            error = self._add_parsed_blocks(*pending.popleft().get())
+                            if error is not None:
+                                line_no, e = error
+                                raise e
+                    else:
+                        if len(block) == 0:
+                            block_start = i
+                        block.append(row)
+                if len(block) > 0:
+                    chunk.append((block_start, block))
+                if chunk:
+                    pending.append(pool.apply_async(_parse_blocks, (chunk,)))
+                while pending:
+                    error = self._add_parsed_blocks(*pending.popleft().get())
+                    if error is not None:
+                        line_no, e = error
+                        raise e
         except Exception as e:
             if line_no >= 0:
                 self.logger.error(
                     '{} at line {} in {}\n'.format(e.args[0], line_no, synonym_input_stream.name))
             raise e
 
+    def _add_parsed_blocks(self, blocks, error):
+        """Adds the blocks parsed by ``_parse_blocks()``.
+
+        Args:
+            blocks (list[list[tuple]]): the parsed entries of each block
+            error (tuple[int, Exception] | None): the first error in the chunk and its line number
+
+        Returns:
+            tuple[int, Exception] | None: the ``error``
+        """
+        for entries in blocks:
+            block = []
+            for group_id, headword, lexeme_ids, flags, category in entries:
+                self.add_to_trie(headword, group_id)
+                block.append(SynonymWithGroupId(group_id, Synonym(headword, lexeme_ids, Flags.from_int(flags), category)))
+            if len(block) > 0:
+                self.add_synonym_group(block)
+        return error
+
+    def add_synonym_group(self, entries):
+        """Adds a block of synonyms sharing a group ID.
+
+        Args:
+            entries (list[SynonymWithGroupId]): synonyms in a group
+        """
+        self.synonym_groups.append(entries)
+
     def parse_line(self, line):
         """Parses a line in a dictionary file (csv).
 
@@ -150,22 +308,22 @@ class DictionaryBuilder:
             ValueError: Too few columns in a specified line
         """
         cols = line.split(",")
-        if len(cols) <= max(map(int, Column)):
-            raise ValueError('Too few columns. {} <= n are allowed.'.format(max(map(int, Column))))
-        if int(cols[Column.AMBIGUITY]) == Ambiguity.INVALID:
+        if len(cols) <= _MAX_COLUMN:
+            raise ValueError('Too few columns. {} <= n are allowed.'.format(_MAX_COLUMN))
+        if int(cols[_AMBIGUITY]) == _AMBIGUITY_INVALID:
             return None
 
-        group_id = int(cols[Column.GROUP_ID])
+        group_id = int(cols[_GROUP_ID])
 
-        lexeme_ids = cols[Column.GROUP_ID] if cols[Column.LEXEME_IDS] == "" else list(map(int, cols[Column.LEXEME_IDS].split("/")))
-        headword = cols[Column.HEAD_WORD]
-        _is_noun = self.parse_boolean(cols[Column.IS_NOUN], IsNoun.FALSE, IsNoun.TRUE)
-        _has_ambiguity = self.parse_boolean(cols[Column.AMBIGUITY], Ambiguity.FALSE, Ambiguity.TRUE)
-        _form_type = self.parse_int(cols[Column.FORM_TYPE], max(map(int, Form)))
-        _acronym_type = self.parse_int(cols[Column.ACRONYM_TYPE], max(map(int, Acronym)))
-        _variant_type = self.parse_int(cols[Column.VARIANT_TYPE], max(map(int, Variant)))
+        lexeme_ids = cols[_GROUP_ID] if cols[_LEXEME_IDS] == "" else list(map(int, cols[_LEXEME_IDS].split("/")))
+        headword = cols[_HEAD_WORD]
+        _is_noun = self.parse_boolean(cols[_IS_NOUN], _IS_NOUN_FALSE, _IS_NOUN_TRUE)
+        _has_ambiguity = self.parse_boolean(cols[_AMBIGUITY], _AMBIGUITY_FALSE, _AMBIGUITY_TRUE)
+        _form_type = self.parse_int(cols[_FORM_TYPE], _MAX_FORM)
+        _acronym_type = self.parse_int(cols[_ACRONYM_TYPE], _MAX_ACRONYM)
+        _variant_type = self.parse_int(cols[_VARIANT_TYPE], _MAX_VARIANT)
         flags = Flags(_has_ambiguity, _is_noun, _form_type, _acronym_type, _variant_type)
-        category = cols[Column.CATEGORY]
+        category = cols[_CATEGORY]
 
         entry = SynonymWithGroupId(group_id, Synonym(headword, lexeme_ids, flags, category))
 
@@ -222,6 +380,14 @@ class DictionaryBuilder:
             self.trie_keys[key] = []
         self.trie_keys[key].append(group_id)
 
+    def iter_trie_keys(self):
+        """Returns the keys of the trie in ascending order with their group IDs.
+
+        Returns:
+            Iterable[tuple[bytes, list[int]]]: UTF-8 encoded headwords and their group IDs in the order of appearance
+        """
+        return self.trie_keys.items()
+
     def write_trie(self, io_out):
         """Writes ``headword``-``group_id`` pairs to the specified output file.
 
@@ -231,36 +397,27 @@ class DictionaryBuilder:
         trie = DoubleArray()
         keys = []
         vals = []
-        id_table = JTypedByteBuffer()
-        for key, ids in self.trie_keys.items():
+        id_table = bytearray()
+        for key, ids in self.iter_trie_keys():
             keys.append(key)
-            vals.append(id_table.tell())
-            id_table.write_int(len(ids), 'byte')
-            for _id in ids:
-                id_table.write_int(_id, 'int')
+            vals.append(len(id_table))
+            id_table.append(len(ids))
+            id_table += struct.pack('<{}i'.format(len(ids)), *ids)
 
         self.logger.info('building the trie...')
         trie.build(keys, lengths=[len(k) for k in keys], values=vals)
         self.logger.info('done\n')
         self.logger.info('writing the trie...')
-        self.byte_buffer.clear()
-        self.byte_buffer.write_int(trie.size(), 'int')
-        self.byte_buffer.seek(0)
-        io_out.write(self.byte_buffer.read())
-        self.byte_buffer.clear()
+        io_out.write(_INT.pack(trie.size()))
         io_out.write(trie.array())
         self.__logging_size(trie.size() * 4 + 4)
         trie.clear()
         del trie
 
         self.logger.info('writing the word-ID table...')
-        self.byte_buffer.write_int(id_table.tell(), 'int')
-        self.byte_buffer.seek(0)
-        io_out.write(self.byte_buffer.read())
-        self.byte_buffer.clear()
-        id_table.seek(0)
-        io_out.write(id_table.read())
-        self.__logging_size(id_table.tell() + 4)
+        io_out.write(_INT.pack(len(id_table)))
+        io_out.write(id_table)
+        self.__logging_size(len(id_table) + 4)
         del id_table
 
     def write_synonym_groups(self, io_out):
@@ -271,32 +428,125 @@ class DictionaryBuilder:
         """
         mark = io_out.tell()
         io_out.seek(mark + 4 * len(self.synonym_groups) * 2 + 4)
-        offsets = JTypedByteBuffer()
-        offsets.write_int(len(self.synonym_groups), 'int')
+        group_offsets = []
         self.logger.info('writing the word_infos...')
         base = io_out.tell()
+        # the file offset of ``self.byte_buffer``
+        position = base
+        self.byte_buffer.clear()
         for entries in self.synonym_groups:
             if len(entries) == 0:
+                self.head_word_refs.append([])
                 continue
-            offsets.write_int(entries[0].group_id, 'int')
-            offsets.write_int(io_out.tell(), 'int')
+            if len(self.byte_buffer) >= WRITE_BUFFER_SIZE:
+                io_out.write(self.byte_buffer)
+                position += len(self.byte_buffer)
+                self.byte_buffer.clear()
+            group_offsets.append((entries[0].group_id, position + len(self.byte_buffer)))
+            self.head_word_refs.append(self.resolve_refs(self.write_synonym_group(entries), position))
+        io_out.write(self.byte_buffer)
+        self.byte_buffer.clear()
+
+        self.__logging_size(io_out.tell() - base)
+        self.logger.info('writing synonym groups offsets...')
+        # sorted by group ID so that readers can find a group by binary search
+        group_offsets.sort(key=lambda pair: pair[0])
+        offsets = bytearray(_INT.pack(len(self.synonym_groups)))
+        for group_offset in group_offsets:
+            offsets += _INT_PAIR.pack(*group_offset)
+        io_out.seek(mark)
+        io_out.write(offsets)
+        self.__logging_size(len(offsets))
 
-            self.byte_buffer.write_int(len(entries), 'short')
+    def write_synonym_group(self, entries):
+        """Appends the record of a synonym group to the buffer.
+
+        Args:
+            entries (list[SynonymWithGroupId]): synonyms in a group
+
+        Returns:
+            list[int]: the positions of the headwords in the buffer, or their references in the string pool
+        """
+        buffer = self.byte_buffer
+        buffer += _SHORT.pack(len(entries))
+        refs = []
+        if self.strings is not None:
+            add = self.strings.add
             for entry in entries:
-                self.write_string(entry.headword)
+                ref = add(entry.headword)
+                refs.append(ref)
+                buffer += _INT.pack(ref)
                 self.write_short_array(entry.lexeme_ids)
-                self.byte_buffer.write_int(entry.flags.encode(), 'short')
-                self.write_string(entry.category)
-            self.byte_buffer.seek(0)
-            io_out.write(self.byte_buffer.read())
-            self.byte_buffer.clear()
+                buffer += _SHORT.pack(entry.flags.encode())
+                buffer += _INT.pack(add(entry.category))
+            return refs
+        for entry in entries:
+            refs.append(len(buffer))
+            self.write_string(entry.headword)
+            self.write_short_array(entry.lexeme_ids)
+            buffer += _SHORT.pack(entry.flags.encode())
+            self.write_string(entry.category)
+        return refs
+
+    def resolve_refs(self, refs, position):
+        """Returns the references to the headwords returned by ``self.write_synonym_group()``.
 
-        self.__logging_size(io_out.tell() - base)
-        self.logger.info('writing synonym groups offsets...')
+        Args:
+            refs (list[int]): the return value of ``self.write_synonym_group()``
+            position (int): the file offset of the buffer
+
+        Returns:
+            list[int]: the file offsets of the headwords, or their references in the string pool
+        """
+        if self.strings is not None:
+            return refs
+        return [position + ref for ref in refs]
+
+    def write_sections(self, io_out, mark):
+        """Writes optional sections at the end of the specified output file.
+
+        Args:
+            io_out (BufferedWriter): an output stream
+            mark (int): byte offset to write the offset of the sections
+        """
+        payloads = []
+        if self.strings is not None:
+            self.logger.info('writing the string pool of {} strings...'.format(len(self.strings)))
+            payloads.append((sections.STRING_POOL, bytes(self.strings.buffer)))
+            self.__logging_size(len(self.strings.buffer))
+        if self.expansion_table:
+            self.logger.info('writing the expansion table...')
+            payload = self.encode_expansion_table()
+            payloads.append((sections.EXPANSION_TABLE, payload))
+            self.__logging_size(len(payload))
+        if self.group_index:
+            self.logger.info('writing the group index...')
+            payload = self.encode_group_index()
+            payloads.append((sections.GROUP_INDEX, payload))
+            self.__logging_size(len(payload))
+
+        io_out.seek(0, 2)
+        sections_offset = io_out.tell()
+        sections.write_sections(io_out, payloads)
         io_out.seek(mark)
-        offsets.seek(0)
-        io_out.write(offsets.read())
-        self.__logging_size(offsets.tell())
+        io_out.write(_INT.pack(sections_offset))
+        io_out.seek(0, 2)
+
+    def encode_expansion_table(self):
+        """Encodes the expansion table of the groups written by ``self.write_synonym_groups()``.
+
+        Returns:
+            bytes: the payload of the section
+        """
+        return build_expansion_table(self.trie_keys, self.synonym_groups, self.head_word_refs)
+
+    def encode_group_index(self):
+        """Encodes the group index of the groups written by ``self.write_synonym_groups()``.
+
+        Returns:
+            bytes: the payload of the section
+        """
+        return build_group_index(self.synonym_groups, self.head_word_refs)
 
     def write_string(self, text):
         """Converts a string to bytes and writes it to a buffer.
@@ -304,14 +554,9 @@ class DictionaryBuilder:
         Args:
             text (str): a string
         """
-        len_ = 0
-        for c in text:
-            if 0x10000 <= ord(c) <= 0x10FFFF:
-                len_ += 2
-            else:
-                len_ += 1
-        self.write_string_length(len_)
-        self.byte_buffer.write_str(text)
+        data = text.encode('utf-16-le')
+        self.write_string_length(len(data) >> 1)
+        self.byte_buffer += data
 
     def write_short_array(self, array):
         """Converts a list of short to bytes and writes it to a buffer.
@@ -319,9 +564,8 @@ class DictionaryBuilder:
         Args:
             array (list[int]): a list of short
         """
-        self.byte_buffer.write_int(len(array), 'byte')
-        for item in array:
-            self.byte_buffer.write_int(item, 'short')
+        self.byte_buffer.append(len(array))
+        self.byte_buffer += _short_array_struct(len(array)).pack(*array)
 
     def write_string_length(self, len_):
         """Converts a length of a string and writes it to a buffer.
@@ -330,10 +574,58 @@ class DictionaryBuilder:
             len_ (int): a length of a string
         """
         if len_ <= self.__BYTE_MAX_VALUE:
-            self.byte_buffer.write_int(len_, 'byte')
+            self.byte_buffer.append(len_)
         else:
-            self.byte_buffer.write_int((len_ >> 8) | 0x80, 'byte')
-            self.byte_buffer.write_int((len_ & 0xFF), 'byte')
+            self.byte_buffer.append((len_ >> 8) | 0x80)
+            self.byte_buffer.append(len_ & 0xFF)
 
     def __logging_size(self, size):
         self.logger.info('{} bytes\n'.format(size))
+
+
+# a builder used by each worker process of ``DictionaryBuilder.build_synonym_parallel`` to parse lines
+_worker_builder = None
+
+
+def _init_parse_worker():
+    global _worker_builder
+    _worker_builder = DictionaryBuilder(logger=getLogger(__name__))
+
+
+def _parse_blocks(chunk):
+    """Parses the blocks of lines as ``DictionaryBuilder.build_synonym`` does.
+
+    Args:
+        chunk (list[tuple[int, list[str]]]): the line number of the first line and the lines of each block
+
+    Returns:
+        tuple[list[list[tuple]], tuple[int, Exception] | None]: the entries of the blocks before the first error,
+        and the error with its line number
+    """
+    blocks = []
+    for first_line, rows in chunk:
+        entries = []
+        group_id = -1
+        line_no = first_line
+        try:
+            for line_no, row in enumerate(rows, first_line):
+                entry = _worker_builder.parse_line(row)
+                if not entry:
+                    continue
+                if group_id < 0:
+                    group_id = entry.group_id
+                elif group_id != entry.group_id:
+                    raise ValueError("Group ID is changed in block.")
+                entries.append((group_id, entry.headword, entry.lexeme_ids, entry.flags.encode(), entry.category))
+        except Exception as e:
+            return blocks, (line_no, e)
+        blocks.append(entries)
+    return blocks, None
+
+
+def _short_array_struct(length):
+    """Returns a compiled ``struct.Struct`` for ``length`` little-endian shorts."""
+    packer = _SHORT_ARRAYS.get(length)
+    if packer is None:
+        packer = _SHORT_ARRAYS[length] = struct.Struct('<{}h'.format(length))
+    return packer
@@ -15,6 +15,12 @@
 # the first version of system dictionaries
 SYSTEM_DICT_VERSION_1 = 0xeb5b87cc8b3f406c
 
+# the second version of system dictionaries, which has optional sections
+SYSTEM_DICT_VERSION_2 = 0xef064d2ecd9e38dd
+
+# the third version of system dictionaries, whose synonym groups refer to strings in the string pool section
+SYSTEM_DICT_VERSION_3 = 0xa3d1c0f25e7b4916
+
 
 def is_dictionary(version):
     """Returns ``True`` if, and only if, the file is a system dictionary.
@@ -25,4 +31,28 @@ def is_dictionary(version):
     Returns:
         bool: ``True`` if the file is a system dictionary, otherwise ``False``
     """
-    return version == SYSTEM_DICT_VERSION_1
+    return version == SYSTEM_DICT_VERSION_1 or version == SYSTEM_DICT_VERSION_2 or version == SYSTEM_DICT_VERSION_3
+
+
+def has_sections(version):
+    """Returns ``True`` if, and only if, the file may have optional sections.
+
+    Args:
+        version (int): a dictionary version ID
+
+    Returns:
+        bool: ``True`` if the file may have optional sections, otherwise ``False``
+    """
+    return version == SYSTEM_DICT_VERSION_2 or version == SYSTEM_DICT_VERSION_3
+
+
+def has_string_pool(version):
+    """Returns ``True`` if, and only if, the synonym groups refer to strings in the string pool section.
+
+    Args:
+        version (int): a dictionary version ID
+
+    Returns:
+        bool: ``True`` if the strings are pooled, otherwise ``False``
+    """
+    return version == SYSTEM_DICT_VERSION_3
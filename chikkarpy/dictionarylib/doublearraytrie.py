@@ -18,6 +18,9 @@ from dartsclone import DoubleArray
 
 from . import idtable
 
+# the number of bytes searched at once by ``lookup_index_by_common_prefix``
+_PREFIX_WINDOW = 64
+
 
 class DoubleArrayTrie(object):
 
@@ -30,10 +33,9 @@ class DoubleArrayTrie(object):
         """
         position = offset
         self.trie = DoubleArray()
-        bytes_.seek(position)
 
         # trie size
-        size = int.from_bytes(bytes_.read(4), 'little')
+        size = int.from_bytes(bytes_[position:position + 4], 'little')
         position += 4
 
         # trie array
@@ -64,6 +66,23 @@ class DoubleArrayTrie(object):
             for group_id in group_ids:
                 yield group_id, length
 
+    def lookup_index_by_common_prefix(self, text, offset):
+        """Searches the ``text`` from the ``offset`` by common prefix and returns the indices in the ID table.
+
+        Only a window of the ``text`` is copied for the search unless a key may be longer than the window.
+
+        Args:
+            text (bytes): a text to search in
+            offset (int): byte offset to start the search
+
+        Returns:
+            list[tuple[int, int]]: the indices in the ID table and the end offsets of the matched keys
+        """
+        key = text[offset:offset + _PREFIX_WINDOW]
+        if len(key) == _PREFIX_WINDOW and self.trie.traverse(key, 0, 0, len(key)) != -2:
+            key = text[offset:]
+        return [(index, offset + length) for index, length in self.trie.common_prefix_search(key, length=len(key))]
+
     def lookup_by_exact_match(self, text):
         """Searches group IDs with the ``text`` by exact match.
 
@@ -79,6 +98,18 @@ class DoubleArrayTrie(object):
         else:
             return list(self.group_id_table.get(results[0]))
 
+    def lookup_index_by_exact_match(self, text):
+        """Searches the ``text`` by exact match and returns its index in the ID table.
+
+        Args:
+            text (bytes): a head word to search for
+
+        Returns:
+            int: the index of the group IDs in the ID table, or ``-1`` if the ``text`` is not found
+        """
+        index = self.trie.exact_match_search(text)[0]
+        return index if index >= 0 else -1
+
     def get_storage_size(self):
         """int: a storage size of the double-array trie"""
         return self.storage_size
@@ -0,0 +1,137 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+# flags of an expansion record
+AMBIGUOUS = 0x01
+
+_INT = struct.Struct('<i')
+_COUNTS = struct.Struct('<2H')
+
+
+class ExpansionTable(object):
+    """
+    Precomputed synonym expansions for each (head word, synonym group) pair
+
+    The table starts with pointers laid out exactly like the word-ID table of the trie:
+    for the index of a head word, the byte at that index holds the number of its groups,
+    and it is followed by one int32 offset per group pointing at the expansion record.
+
+    A record consists of its flags (byte), the numbers of noun-only and all expansions (short, short)
+    and the references to the head words of these expansions (int32 each).
+    """
+    def __init__(self, bytes_, offset, read_string):
+        """Constructs a new expansion table.
+
+        Args:
+            bytes_ (mmap.mmap): a memory-mapped dictionary
+            offset (int): byte offset of the section
+            read_string (Callable[[int], tuple[str, int]]): a function to decode a head word from its reference
+        """
+        self._bytes = bytes_
+        self._offset = offset
+        self._pointers = offset + 4
+        self._read_string = read_string
+
+    def get(self, index, can_search_verb):
+        """Returns the head words to be expanded for the head word at the ``index`` of the ID table.
+
+        Args:
+            index (int): the index of a head word in the ID table
+            can_search_verb (bool): ``True`` to include verb and adjective synonyms
+
+        Returns:
+            list[str]: head words of the synonyms
+        """
+        bytes_ = self._bytes
+        position = self._pointers + index
+        n = bytes_[position]
+        head_words = []
+        for i in range(n):
+            record = self._offset + _INT.unpack_from(bytes_, position + 1 + 4 * i)[0]
+            if bytes_[record] & AMBIGUOUS:
+                continue
+            n_noun, n_all = _COUNTS.unpack_from(bytes_, record + 1)
+            if can_search_verb:
+                refs = struct.unpack_from('<{}i'.format(n_all), bytes_, record + 5 + 4 * n_noun)
+            else:
+                refs = struct.unpack_from('<{}i'.format(n_noun), bytes_, record + 5)
+            read_string = self._read_string
+            for ref in refs:
+                head_words.append(read_string(ref)[0])
+        return head_words
+
+
+def build_expansion_table(trie_keys, synonym_groups, head_word_refs):
+    """Builds the payload of an expansion table.
+
+    Args:
+        trie_keys (Mapping[bytes, list[int]]): group IDs for each head word, in the order of the ID table
+        synonym_groups (list[list[SynonymWithGroupId]]): synonym groups
+        head_word_refs (list[list[int]]): the references to the head words of each group in ``synonym_groups``
+
+    Returns:
+        bytes: the payload of the section
+    """
+    groups = {}
+    for entries, refs in zip(synonym_groups, head_word_refs):
+        if len(entries) > 0:
+            groups[entries[0].group_id] = (entries, refs)
+
+    table_size = 0
+    for ids in trie_keys.values():
+        table_size += 1 + 4 * len(ids)
+
+    pointers = bytearray(table_size)
+    records = bytearray()
+    record_ids = {}
+    position = 0
+    for key, ids in trie_keys.items():
+        head_word = key.decode('utf-8')
+        pointers[position] = len(ids)
+        for i, group_id in enumerate(ids):
+            record = _encode_record(head_word, *groups[group_id])
+            record_offset = record_ids.get(record)
+            if record_offset is None:
+                record_offset = 4 + table_size + len(records)
+                record_ids[record] = record_offset
+                records += record
+            _INT.pack_into(pointers, position + 1 + 4 * i, record_offset)
+        position += 1 + 4 * len(ids)
+
+    return _INT.pack(table_size) + bytes(pointers) + bytes(records)
+
+
+def _encode_record(head_word, entries, refs):
+    flags = 0
+    nouns = []
+    others = []
+    found = False
+    for entry, ref in zip(entries, refs):
+        if entry.headword == head_word:
+            if not found:
+                found = True
+                if entry.flags.has_ambiguity:
+                    flags |= AMBIGUOUS
+            continue
+        others.append(ref)
+        if entry.flags.is_noun:
+            nouns.append(ref)
+    if not found or flags & AMBIGUOUS:
+        return bytes((AMBIGUOUS,)) + _COUNTS.pack(0, 0)
+    record = bytes((flags,)) + _COUNTS.pack(len(nouns), len(others))
+    record += struct.pack('<{}i'.format(len(nouns)), *nouns)
+    record += struct.pack('<{}i'.format(len(others)), *others)
+    return record
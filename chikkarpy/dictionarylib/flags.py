@@ -13,6 +13,13 @@
 # limitations under the License.
 
 class Flags:
+    """
+    Flags of a synonym
+
+    The flags are held as the encoded int and decoded by the properties.
+    """
+    __slots__ = ('_code',)
+
     def __init__(self, has_ambiguity, is_noun, form_type, acronym_type, variant_type):
         """Constructs flags of a synonym.
 
@@ -23,53 +30,60 @@ class Flags:
             acronym_type (int): an acronym type of a synonym
             variant_type (int): a variant type of a synonym
         """
-        self._has_ambiguity = has_ambiguity
-        self._is_noun = is_noun
-        self._form_type = form_type
-        self._acronym_type = acronym_type
-        self._variant_type = variant_type
+        flags = 0
+        flags |= 1 if has_ambiguity else 0
+        flags |= (1 if is_noun else 0) << 1
+        flags |= form_type << 2
+        flags |= acronym_type << 5
+        flags |= variant_type << 7
+        self._code = flags
 
     @classmethod
     def from_int(cls, flags):
         """Reads and returns flags from the specified int value.
 
+        The returned object is shared among the synonyms with the same flags.
+
         Args:
             flags (int): int-type flag
 
         Returns:
             Flags: a flags of a synonym
         """
-        has_ambiguity = ((flags & 0x0001) == 1)
-        is_noun = ((flags & 0x0002) == 2)
-        form_type = (flags >> 2) & 0x0007
-        acronym_type = (flags >> 5) & 0x0003
-        variant_type = (flags >> 7) & 0x0003
-        return cls(has_ambiguity, is_noun, form_type, acronym_type, variant_type)
+        if 0 <= flags < len(_INTERNED):
+            return _INTERNED[flags]
+        return cls._from_code(flags)
+
+    @classmethod
+    def _from_code(cls, code):
+        flags = cls.__new__(cls)
+        flags._code = code
+        return flags
 
     @property
     def has_ambiguity(self):
         """bool: ``True`` if a synonym is ambiguous, ``False`` otherwise"""
-        return self._has_ambiguity
+        return (self._code & 0x0001) == 1
 
     @property
     def is_noun(self):
         """bool: ``True`` if a synonym is a noun, ``False`` otherwise"""
-        return self._is_noun
+        return (self._code & 0x0002) == 2
 
     @property
     def form_type(self):
         """int: a word form type of a synonym"""
-        return self._form_type
+        return (self._code >> 2) & 0x0007
 
     @property
     def acronym_type(self):
         """int: an acronym type of a synonym"""
-        return self._acronym_type
+        return (self._code >> 5) & 0x0003
 
     @property
     def variant_type(self):
         """int: a variant type of a synonym"""
-        return self._variant_type
+        return (self._code >> 7) & 0x0003
 
     def encode(self):
         """Encodes this ``Flags`` object.
@@ -77,10 +91,18 @@ class Flags:
         Returns:
             int: encoded flags
         """
-        flags = 0
-        flags |= 1 if self.has_ambiguity else 0
-        flags |= (1 if self.is_noun else 0) << 1
-        flags |= self.form_type << 2
-        flags |= self.acronym_type << 5
-        flags |= self.variant_type << 7
-        return flags
+        return self._code
+
+    def __eq__(self, other):
+        if not isinstance(other, Flags):
+            return NotImplemented
+        return self._code == other._code
+
+    def __hash__(self):
+        return hash(self._code)
+
+    def __reduce__(self):
+        return Flags.from_int, (self._code,)
+
+
+_INTERNED = tuple(Flags._from_code(code) for code in range(1 << 9))
@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+from .flags import Flags
+
+_INT = struct.Struct('<i')
+_SHORT = struct.Struct('<H')
+
+_member_structs = {}
+
+
+def _members_struct(n):
+    """Returns a struct for ``n`` members, caching one per count."""
+    s = _member_structs.get(n)
+    if s is None:
+        s = struct.Struct('<' + 'Hi' * n)
+        _member_structs[n] = s
+    return s
+
+
+class GroupIndex(object):
+    """
+    The head words and flags of the members of each synonym group
+
+    The index starts with the number of groups and an int32 offset of the record for each position
+    of the group offset table. A record consists of the number of members (short)
+    and the flags (short) and the reference to the head word (int32) of each member.
+    References point at the head words in the synonym group records, and each distinct head word is referred
+    to at one place, so the index shares the strings of the records instead of storing its own.
+    """
+    def __init__(self, bytes_, offset, read_string):
+        """Constructs a new group index.
+
+        Args:
+            bytes_ (mmap.mmap): a memory-mapped dictionary
+            offset (int): byte offset of the section
+            read_string (Callable[[int], tuple[str, int]]): a function to decode a head word from its reference
+        """
+        self._bytes = bytes_
+        self._offset = offset
+        self.size, = _INT.unpack_from(bytes_, offset)
+        self._read_string = read_string
+
+    def get(self, index):
+        """Returns the members of the group at the ``index`` of the group offset table.
+
+        Args:
+            index (int): a position in the group offset table
+
+        Returns:
+            list[tuple[str, Flags]]: the head words and flags of the members
+        """
+        bytes_ = self._bytes
+        record = self._offset + _INT.unpack_from(bytes_, self._offset + 4 + 4 * index)[0]
+        n, = _SHORT.unpack_from(bytes_, record)
+        values = _members_struct(n).unpack_from(bytes_, record + 2)
+        read_string = self._read_string
+        from_int = Flags.from_int
+        return [(read_string(values[i + 1])[0], from_int(values[i])) for i in range(0, 2 * n, 2)]
+
+
+def build_group_index(synonym_groups, head_word_refs):
+    """Builds the payload of a group index.
+
+    Args:
+        synonym_groups (list[list[SynonymWithGroupId]]): synonym groups
+        head_word_refs (list[list[int]]): the references to the head words of each group in ``synonym_groups``
+
+    Returns:
+        bytes: the payload of the section
+    """
+    pool = {}
+    records = []
+    for entries, refs in zip(synonym_groups, head_word_refs):
+        if len(entries) == 0:
+            continue
+        values = []
+        for entry, ref in zip(entries, refs):
+            values.append(entry.flags.encode())
+            values.append(pool.setdefault(entry.headword, ref))
+        records.append((entries[0].group_id, _SHORT.pack(len(entries)) + _members_struct(len(entries)).pack(*values)))
+    # in the order of the group offset table
+    records.sort(key=lambda record: record[0])
+
+    pointers = bytearray(_INT.pack(len(records)))
+    payload = bytearray()
+    position = 4 + 4 * len(records)
+    for _, record in records:
+        pointers += _INT.pack(position + len(payload))
+        payload += record
+    return bytes(pointers + payload)
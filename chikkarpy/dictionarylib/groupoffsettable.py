@@ -0,0 +1,198 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import operator
+import struct
+import sys
+import threading
+from itertools import islice
+
+_INT = struct.Struct('<i')
+
+# layouts of the table
+DENSE = 0
+SORTED = 1
+UNSORTED = 2
+# the IDs at both ends span as many IDs as the table has, so the table is likely to be dense
+PRESUMED_DENSE = 3
+
+
+class GroupOffsetTable(object):
+    """
+    A table of (synonym group ID, byte offset) pairs read directly from the memory-mapped dictionary
+
+    Nothing is copied when the table is opened. If the IDs at both ends span as many IDs as the table has,
+    as in a dictionary built from consecutive IDs, a group is found by its index and the ID at the index is checked,
+    so the first lookup does not read the whole table. Otherwise, or when the check fails, the group IDs are checked
+    once: if they are consecutive, a group is found by its index; if they are ascending, by binary search.
+    Otherwise, the table falls back to a dict built from the pairs.
+    """
+    def __init__(self, bytes_, offset):
+        """Constructs a new group offset table.
+
+        Args:
+            bytes_ (mmap.mmap): a memory-mapped dictionary
+            offset (int): byte offset
+        """
+        self._bytes = bytes_
+        self.size, = _INT.unpack_from(bytes_, offset)
+        self._base = offset + 4
+        self._layout = None
+        self._first_id = 0
+        self._index = None
+        self._lock = threading.Lock()
+
+    def storage_size(self):
+        """int: a storage size of the group offset table"""
+        return 4 + 8 * self.size
+
+    @property
+    def pairs_offset(self):
+        """int: byte offset of the first (synonym group ID, byte offset) pair, each of which is two int32"""
+        return self._base
+
+    def group_id_at(self, index):
+        """Returns the synonym group ID at the specified position of the table.
+
+        Args:
+            index (int): a position in the table
+
+        Returns:
+            int: a synonym group ID
+        """
+        return _INT.unpack_from(self._bytes, self._base + 8 * index)[0]
+
+    def offset_at(self, index):
+        """Returns the byte offset of the synonym group at the specified position of the table.
+
+        Args:
+            index (int): a position in the table
+
+        Returns:
+            int: byte offset of the synonym group
+        """
+        return _INT.unpack_from(self._bytes, self._base + 8 * index + 4)[0]
+
+    def index_of(self, group_id):
+        """Returns the position of the specified synonym group ID in the table.
+
+        Args:
+            group_id (int): a synonym group ID
+
+        Returns:
+            int: the position of the ``group_id``, or ``-1`` if it is not in the table
+        """
+        layout = self._layout
+        if layout is None:
+            layout = self._inspect()
+
+        if layout == DENSE:
+            index = group_id - self._first_id
+            return index if 0 <= index < self.size else -1
+        if layout == PRESUMED_DENSE:
+            index = group_id - self._first_id
+            if 0 <= index < self.size and self.group_id_at(index) == group_id:
+                return index
+            # the ID may be elsewhere unless all the IDs are checked
+            self._scan()
+            return self.index_of(group_id)
+        if layout == UNSORTED:
+            return self._index.get(group_id, -1)
+
+        low = 0
+        high = self.size
+        while low < high:
+            mid = (low + high) >> 1
+            mid_id = _INT.unpack_from(self._bytes, self._base + 8 * mid)[0]
+            if mid_id < group_id:
+                low = mid + 1
+            elif mid_id > group_id:
+                high = mid
+            else:
+                return mid
+        return -1
+
+    def get(self, group_id):
+        """Returns the byte offset of the synonym group with the specified ID.
+
+        Args:
+            group_id (int): a synonym group ID
+
+        Returns:
+            int | None: byte offset of the synonym group, or ``None`` if the ``group_id`` is not in the table
+        """
+        index = self.index_of(group_id)
+        if index < 0:
+            return None
+        return self.offset_at(index)
+
+    def __contains__(self, group_id):
+        return self.index_of(group_id) >= 0
+
+    def __len__(self):
+        return self.size
+
+    def _inspect(self):
+        """Decides how to look up the group IDs from the IDs at both ends, or by ``self._scan()`` if it is not enough.
+
+        Returns:
+            int: the layout of the table
+        """
+        with self._lock:
+            if self._layout is not None:
+                return self._layout
+
+            if self.size == 0:
+                self._layout = DENSE
+                return self._layout
+
+            first_id = self.group_id_at(0)
+            if self.group_id_at(self.size - 1) - first_id == self.size - 1:
+                self._first_id = first_id
+                self._layout = PRESUMED_DENSE
+                return self._layout
+        return self._scan()
+
+    def _scan(self):
+        """Checks the order of all the group IDs and decides how to look them up.
+
+        Returns:
+            int: the layout of the table
+        """
+        with self._lock:
+            if self._layout is not None and self._layout != PRESUMED_DENSE:
+                return self._layout
+
+            if sys.byteorder == 'little':
+                end = self._base + 8 * self.size
+                with memoryview(self._bytes) as whole, whole[self._base:end] as raw, raw.cast('i') as pairs, \
+                        pairs[0::2] as ids:
+                    ascending = all(map(operator.lt, ids, islice(ids, 1, None)))
+            else:
+                ids = [self.group_id_at(i) for i in range(self.size)]
+                ascending = all(map(operator.lt, ids, islice(ids, 1, None)))
+
+            first_id = self.group_id_at(0)
+            if ascending and self.group_id_at(self.size - 1) - first_id == self.size - 1:
+                self._first_id = first_id
+                self._layout = DENSE
+            elif ascending:
+                self._layout = SORTED
+            else:
+                index = {}
+                for i in range(self.size):
+                    index[self.group_id_at(i)] = i
+                self._index = index
+                self._layout = UNSORTED
+            return self._layout
@@ -23,8 +23,7 @@ class IdTable(object):
             bytes_ (mmap.mmap): a memory-mapped dictionary
             offset (int): byte offset
         """
-        bytes_.seek(offset)
-        self.size = int.from_bytes(bytes_.read(4), 'little')
+        self.size = int.from_bytes(bytes_[offset:offset + 4], 'little')
 
         self.offset = offset + 4
         self._bytes_view = memoryview(bytes_)[self.offset: self.offset + self.size]
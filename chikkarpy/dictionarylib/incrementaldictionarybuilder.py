@@ -0,0 +1,230 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from io import BufferedWriter, TextIOWrapper
+
+from sortedcontainers import SortedDict
+
+from .binarydictionary import BinaryDictionary
+from .dictionarybuilder import DictionaryBuilder, SynonymWithGroupId, WRITE_BUFFER_SIZE
+from .expansiontable import build_expansion_table
+from .groupindex import build_group_index
+from .stringpool import open_string_pool
+from .synonym_group_list import SynonymGroupList
+
+_INT = struct.Struct('<i')
+_INT_PAIR = struct.Struct('<2i')
+
+
+class BaseGroup(object):
+    """
+    A synonym group record to be copied from the base dictionary
+    """
+    __slots__ = ('group_id', 'offset', 'end', 'head_words')
+
+    def __init__(self, group_id, offset, end, head_words):
+        """Constructs a reference to a group record.
+
+        Args:
+            group_id (int): a synonym group ID
+            offset (int): byte offset of the record in the base dictionary
+            end (int): byte offset next to the record
+            head_words (list[tuple[str, int]]): the head words of the group with their byte offsets
+        """
+        self.group_id = group_id
+        self.offset = offset
+        self.end = end
+        self.head_words = head_words
+
+
+class IncrementalDictionaryBuilder(DictionaryBuilder):
+    """
+    A dictionary builder which updates an existing dictionary
+
+    A block in the input replaces the groups with the same group ID in the base dictionary, or is added
+    after all the other groups if the group ID is new. The records of the other groups are copied from the base
+    dictionary without their source, and only the trie and the ID table are rebuilt.
+    The groups keep the order of the base dictionary, so lookups give the same results as a full build
+    of the updated source. If either dictionary has the string pool, the records are decoded and encoded again
+    instead of copied.
+    """
+    def __init__(self, base_path, *, logger=None, expansion_table=False, processes=1, removed_group_ids=(),
+                 group_index=False, string_pool=False):
+        """Constructs a new builder.
+
+        Args:
+            base_path (str): the file path of the dictionary to be updated
+            logger (Logger | None): a logger
+            expansion_table (bool): ``True`` to write the precomputed expansion table section
+            processes (int): the number of worker processes to parse the input. ``1`` parses it in this process.
+            removed_group_ids (Iterable[int]): the IDs of the groups to be removed from the base dictionary
+            group_index (bool): ``True`` to write the group index section
+            string_pool (bool): ``True`` to intern the head words and categories into the string pool section
+        """
+        super().__init__(logger=logger, expansion_table=expansion_table, processes=processes, group_index=group_index,
+                         string_pool=string_pool)
+        self.base_path = base_path
+        self.removed_group_ids = set(removed_group_ids)
+        self.groups = []
+        self._base = None
+        self._group_list = None
+
+    def build(self, input_path, out_stream):
+        """Builds the updated dictionary from the specified input file and writes it to the specified output.
+
+        The header of the ``self.version`` must already be written to ``out_stream``.
+
+        Args:
+            input_path (str): an input file path with the added and changed groups
+            out_stream (BufferedWriter):
+        """
+        self._base = BinaryDictionary.from_system_dictionary(self.base_path)
+        try:
+            self._group_list = SynonymGroupList(self._base.bytes_, self._base.offset,
+                                                string_pool=open_string_pool(self._base))
+            super().build(input_path, out_stream)
+        finally:
+            self._group_list = None
+            self._base.close()
+            self._base = None
+
+    def build_synonym(self, synonym_input_stream):
+        """Reads lines in the specified input file and merges them with the groups of the base dictionary.
+
+        Args:
+            synonym_input_stream (TextIOWrapper): an input stream
+
+        Raises:
+            ValueError: Group ID is changed in a group.
+        """
+        super().build_synonym(synonym_input_stream)
+        self.merge_base_groups()
+
+    def merge_base_groups(self):
+        """Merges the parsed groups with those of the base dictionary and adds their head words to the trie."""
+        self.logger.info('reading the base dictionary...')
+        changes = {}
+        for entries in self.synonym_groups:
+            changes.setdefault(entries[0].group_id, []).append(entries)
+        replaced = set(changes)
+
+        offset_table = self._group_list.offset_table
+        # the records are written in the order of the source
+        base_groups = sorted((offset_table.offset_at(i), offset_table.group_id_at(i)) for i in range(len(offset_table)))
+        # records referring to a string pool cannot be copied from one file to another
+        copy = self.strings is None and self._group_list.string_pool is None
+        n_copied = 0
+        for offset, group_id in base_groups:
+            if group_id in replaced:
+                self.groups.extend(changes.pop(group_id, []))
+            elif group_id not in self.removed_group_ids:
+                if copy:
+                    head_words, end = self._group_list.read_head_words(offset)
+                    self.groups.append(BaseGroup(group_id, offset, end, head_words))
+                else:
+                    synonym_group = self._group_list.read_synonym_group(group_id, offset)
+                    self.groups.append([SynonymWithGroupId(group_id, synonym) for synonym in synonym_group.get_synonyms()])
+                n_copied += 1
+        for entries in self.synonym_groups:
+            if entries[0].group_id in changes:
+                self.groups.append(entries)
+        self.logger.info('{} groups copied, {} groups parsed\n'.format(n_copied, len(self.synonym_groups)))
+
+        # the group IDs of a head word are in the order of the merged groups, not in that of the input
+        self.trie_keys = SortedDict()
+        for group in self.groups:
+            if isinstance(group, BaseGroup):
+                head_words = [head_word for head_word, _ in group.head_words]
+                group_id = group.group_id
+            else:
+                head_words = [entry.headword for entry in group]
+                group_id = group[0].group_id
+            for head_word in head_words:
+                self.add_to_trie(head_word, group_id)
+
+    def write_synonym_groups(self, io_out):
+        """Writes the merged synonym groups to the specified output file.
+
+        Args:
+            io_out (BufferedWriter): an output stream
+        """
+        mark = io_out.tell()
+        io_out.seek(mark + 4 * len(self.groups) * 2 + 4)
+        group_offsets = []
+        self.logger.info('writing the word_infos...')
+        base = io_out.tell()
+        position = base
+        bytes_ = self._base.bytes_
+        self.byte_buffer.clear()
+        for group in self.groups:
+            if len(self.byte_buffer) >= WRITE_BUFFER_SIZE:
+                io_out.write(self.byte_buffer)
+                position += len(self.byte_buffer)
+                self.byte_buffer.clear()
+            record = position + len(self.byte_buffer)
+            if isinstance(group, BaseGroup):
+                group_offsets.append((group.group_id, record))
+                self.byte_buffer += bytes_[group.offset:group.end]
+                self.head_word_refs.append([record + offset - group.offset for _, offset in group.head_words])
+            else:
+                group_offsets.append((group[0].group_id, record))
+                self.head_word_refs.append(self.resolve_refs(self.write_synonym_group(group), position))
+        io_out.write(self.byte_buffer)
+        self.byte_buffer.clear()
+        self.logger.info('{} bytes\n'.format(io_out.tell() - base))
+
+        self.logger.info('writing synonym groups offsets...')
+        # sorted by group ID so that readers can find a group by binary search
+        group_offsets.sort(key=lambda pair: pair[0])
+        offsets = bytearray(_INT.pack(len(self.groups)))
+        for group_offset in group_offsets:
+            offsets += _INT_PAIR.pack(*group_offset)
+        io_out.seek(mark)
+        io_out.write(offsets)
+        self.logger.info('{} bytes\n'.format(len(offsets)))
+
+    def encode_expansion_table(self):
+        """Encodes the expansion table of the merged groups.
+
+        The groups copied from the base dictionary are decoded for it.
+
+        Returns:
+            bytes: the payload of the section
+        """
+        return build_expansion_table(self.trie_keys, self.decode_groups(), self.head_word_refs)
+
+    def encode_group_index(self):
+        """Encodes the group index of the merged groups.
+
+        The groups copied from the base dictionary are decoded for it.
+
+        Returns:
+            bytes: the payload of the section
+        """
+        return build_group_index(self.decode_groups(), self.head_word_refs)
+
+    def decode_groups(self):
+        """Returns the merged groups with those copied from the base dictionary decoded.
+
+        Returns:
+            list[list[SynonymWithGroupId]]: synonym groups in the order of ``self.groups``
+        """
+        synonym_groups = []
+        for group in self.groups:
+            if isinstance(group, BaseGroup):
+                synonym_group = self._group_list.read_synonym_group(group.group_id, group.offset)
+                group = [SynonymWithGroupId(group.group_id, synonym) for synonym in synonym_group.get_synonyms()]
+            synonym_groups.append(group)
+        return synonym_groups
@@ -0,0 +1,65 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+_MISS = (-1, -1)
+
+
+class MergedIndex(object):
+    """
+    One lookup table for the headwords of a stack of dictionaries
+
+    Each headword is mapped to the first dictionary in the stack which has it and its index in the ID table
+    of that dictionary, so that the precedence of the stack is kept with a single probe.
+    """
+    def __init__(self, dictionaries):
+        """Compiles the headwords of the ``dictionaries``.
+
+        Args:
+            dictionaries (list[Dictionary]): synonym dictionaries in the order of precedence
+        """
+        self.dictionaries = tuple(dictionaries)
+        self.group_id_position = -1
+        self._entries = {}
+        self._trie_entries = {}
+
+        for position, dictionary in enumerate(self.dictionaries):
+            if not dictionary.enable_trie and self.group_id_position < 0:
+                self.group_id_position = position
+            for word in dictionary.group_list.iter_head_words():
+                if word in self._entries:
+                    first = self._entries[word][0]
+                    if self.dictionaries[first].enable_trie or word in self._trie_entries or not dictionary.enable_trie:
+                        continue
+                    self._trie_entries[word] = (position, dictionary.lookup_index(word))
+                    continue
+                self._entries[word] = (position, dictionary.lookup_index(word))
+
+    def lookup(self, word, trie_only=False):
+        """Returns the first dictionary which has the specified headword.
+
+        Args:
+            word (str): a headword
+            trie_only (bool): ``True`` to skip the dictionaries whose ``enable_trie`` is ``False``
+
+        Returns:
+            tuple[int, int]: the position of the dictionary in the stack and the index of the ``word`` in its ID table,
+            or ``(-1, -1)`` if no dictionary has the ``word``
+        """
+        entry = self._entries.get(word, _MISS)
+        if trie_only and entry[0] >= 0 and not self.dictionaries[entry[0]].enable_trie:
+            return self._trie_entries.get(word, _MISS)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
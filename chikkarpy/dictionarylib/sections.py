@@ -0,0 +1,62 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+# the tags of optional sections
+EXPANSION_TABLE = 1
+GROUP_INDEX = 2
+STRING_POOL = 3
+
+_INT = struct.Struct('<i')
+_SECTION_HEADER = struct.Struct('<2i')
+
+
+def read_sections(bytes_, offset):
+    """Reads the list of optional sections.
+
+    The list starts with the number of sections, and each section consists of its tag, its size and its payload.
+
+    Args:
+        bytes_ (mmap.mmap): a memory-mapped dictionary
+        offset (int): byte offset of the list
+
+    Returns:
+        dict[int, tuple[int, int]]: byte offsets and sizes of the payloads by tag
+    """
+    sections = {}
+    if offset == 0:
+        return sections
+
+    n, = _INT.unpack_from(bytes_, offset)
+    offset += 4
+    for _ in range(n):
+        tag, size = _SECTION_HEADER.unpack_from(bytes_, offset)
+        offset += _SECTION_HEADER.size
+        sections[tag] = (offset, size)
+        offset += size
+    return sections
+
+
+def write_sections(io_out, sections):
+    """Writes optional sections at the current position of the output.
+
+    Args:
+        io_out (BufferedWriter): an output stream
+        sections (list[tuple[int, bytes]]): tags and payloads of the sections
+    """
+    io_out.write(_INT.pack(len(sections)))
+    for tag, payload in sections:
+        io_out.write(_SECTION_HEADER.pack(tag, len(payload)))
+        io_out.write(payload)
@@ -0,0 +1,195 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from io import BufferedWriter
+from itertools import groupby
+from operator import itemgetter
+
+from .dictionarybuilder import DictionaryBuilder, WRITE_BUFFER_SIZE
+
+# the number of (key, group ID) pairs held in memory before they are spilled to a file
+DEFAULT_SPILL_SIZE = 1 << 20
+
+_PAIR = struct.Struct('<iI')
+_INT = struct.Struct('<i')
+_INT_PAIR = struct.Struct('<2i')
+
+
+class StreamingDictionaryBuilder(DictionaryBuilder):
+    """
+    A dictionary builder which does not hold the parsed synonyms in memory
+
+    Each group record is encoded to a temporary file as soon as its block is read, and only compact
+    (UTF-8 headword, group ID) pairs are kept for the trie. When the pairs exceed ``spill_size``,
+    they are sorted and spilled to a file, and the sorted files are merged when the trie is built.
+    The output is identical to that of ``DictionaryBuilder``.
+    """
+    def __init__(self, *, logger=None, expansion_table=False, processes=1, spill_size=DEFAULT_SPILL_SIZE, temp_dir=None,
+                 group_index=False, string_pool=False):
+        """Constructs a new builder.
+
+        Args:
+            logger (Logger | None): a logger
+            expansion_table (bool): must be ``False``. The expansion table needs all the groups in memory.
+            processes (int): the number of worker processes to parse the input. ``1`` parses it in this process.
+            spill_size (int): the maximum number of (headword, group ID) pairs held in memory
+            temp_dir (str | None): a directory for the temporary files, or ``None`` for the default one
+            group_index (bool): must be ``False``. The group index needs all the groups in memory.
+            string_pool (bool): ``True`` to intern the head words and categories into the string pool section.
+                The distinct strings are kept in memory.
+
+        Raises:
+            ValueError: ``expansion_table`` or ``group_index`` is ``True``, or ``spill_size`` is not positive
+        """
+        if expansion_table:
+            raise ValueError('the expansion table cannot be built in the streaming mode')
+        if group_index:
+            raise ValueError('the group index cannot be built in the streaming mode')
+        if spill_size <= 0:
+            raise ValueError('spill_size must be positive')
+        super().__init__(logger=logger, expansion_table=False, processes=processes, string_pool=string_pool)
+        self.spill_size = spill_size
+        self.temp_dir = temp_dir
+        self.pairs = []
+        self.runs = []
+        self.group_ids = array('i')
+        self.group_offsets = array('i')
+        self._work_dir = None
+        self._groups_file = None
+        self._groups_size = 0
+
+    def build(self, input_path, out_stream):
+        """Builds the synonym dictionary from the specified input file and writes it to the specified output.
+
+        The header of the ``self.version`` must already be written to ``out_stream``.
+
+        Args:
+            input_path (str): an input file path
+            out_stream (BufferedWriter):
+        """
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as work_dir, \
+                tempfile.TemporaryFile(dir=self.temp_dir) as groups_file:
+            self._work_dir = work_dir
+            self._groups_file = groups_file
+            try:
+                super().build(input_path, out_stream)
+            finally:
+                self._work_dir = None
+                self._groups_file = None
+                self.pairs = []
+                self.runs = []
+
+    def add_synonym_group(self, entries):
+        """Encodes a block of synonyms sharing a group ID to the temporary file.
+
+        Args:
+            entries (list[SynonymWithGroupId]): synonyms in a group
+        """
+        if len(self.byte_buffer) >= WRITE_BUFFER_SIZE:
+            self._flush_groups()
+        self.group_ids.append(entries[0].group_id)
+        self.group_offsets.append(self._groups_size + len(self.byte_buffer))
+        self.write_synonym_group(entries)
+
+    def _flush_groups(self):
+        self._groups_file.write(self.byte_buffer)
+        self._groups_size += len(self.byte_buffer)
+        self.byte_buffer.clear()
+
+    def add_to_trie(self, headword, group_id):
+        """Adds ``headword``-``group_id`` pairs to a trie.
+
+        Args:
+            headword (str): a headword
+            group_id (int): a synonym group ID
+        """
+        self.pairs.append((headword.encode('utf-8'), group_id))
+        if len(self.pairs) >= self.spill_size:
+            self.spill()
+
+    def spill(self):
+        """Sorts the pairs in memory by their headwords and moves them to a new file."""
+        # the sort is stable, so the group IDs of a headword keep the order of appearance
+        self.pairs.sort(key=itemgetter(0))
+        path = os.path.join(self._work_dir, 'run{}'.format(len(self.runs)))
+        with open(path, 'wb') as wf:
+            for key, group_id in self.pairs:
+                wf.write(_PAIR.pack(group_id, len(key)))
+                wf.write(key)
+        self.runs.append(path)
+        self.pairs = []
+
+    def iter_trie_keys(self):
+        """Returns the keys of the trie in ascending order with their group IDs.
+
+        Returns:
+            Iterable[tuple[bytes, list[int]]]: UTF-8 encoded headwords and their group IDs in the order of appearance
+        """
+        if self.runs:
+            if self.pairs:
+                self.spill()
+            self.logger.info('merging {} sorted runs...'.format(len(self.runs)))
+            # ``heapq.merge`` takes equal keys from earlier runs first
+            pairs = heapq.merge(*[_read_run(path) for path in self.runs], key=itemgetter(0))
+        else:
+            self.pairs.sort(key=itemgetter(0))
+            pairs = self.pairs
+        for key, group in groupby(pairs, key=itemgetter(0)):
+            yield key, [group_id for _, group_id in group]
+
+    def write_synonym_groups(self, io_out):
+        """Writes the synonym group offsets and copies the encoded groups to the specified output file.
+
+        Args:
+            io_out (BufferedWriter): an output stream
+        """
+        n_groups = len(self.group_ids)
+        base = io_out.tell() + 4 + 8 * n_groups
+        self.logger.info('writing synonym groups offsets...')
+        offsets = bytearray(_INT.pack(n_groups))
+        # sorted by group ID so that readers can find a group by binary search
+        for i in sorted(range(n_groups), key=self.group_ids.__getitem__):
+            offsets += _INT_PAIR.pack(self.group_ids[i], base + self.group_offsets[i])
+        io_out.write(offsets)
+        self.logger.info('{} bytes\n'.format(len(offsets)))
+
+        self.logger.info('writing the word_infos...')
+        self._flush_groups()
+        self._groups_file.seek(0)
+        shutil.copyfileobj(self._groups_file, io_out)
+        self.logger.info('{} bytes\n'.format(io_out.tell() - base))
+
+
+def _read_run(path):
+    """Yields the pairs in a file written by ``StreamingDictionaryBuilder.spill()``.
+
+    Args:
+        path (str): a path of the file
+
+    Yields:
+        tuple[bytes, int]: a UTF-8 encoded headword and a group ID
+    """
+    with open(path, 'rb') as rf:
+        while True:
+            record = rf.read(_PAIR.size)
+            if not record:
+                break
+            group_id, length = _PAIR.unpack(record)
+            yield rf.read(length), group_id
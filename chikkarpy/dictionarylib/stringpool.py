@@ -0,0 +1,129 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from . import sections
+from .dictionaryversion import has_string_pool
+
+# the maximum number of bytes of a pooled string
+MAX_STRING_SIZE = 0x3FFF
+
+# bits of the first byte of a string
+_LONG = 0x80
+_UTF16 = 0x40
+
+
+class StringPool(object):
+    """
+    Distinct strings of a dictionary, each referred to by its byte offset in the pool
+
+    A string is encoded in UTF-8, or in UTF-16 if it is shorter that way as for kanji and kana,
+    after its byte length. The length takes one byte if it is less than 64 and two bytes with the highest bit set
+    otherwise, and the second highest bit of the first byte is set for UTF-16.
+    Strings are decoded in place from the memory-mapped file, so opening the pool reads nothing.
+    """
+    def __init__(self, bytes_, offset):
+        """Constructs a new string pool.
+
+        Args:
+            bytes_ (mmap.mmap): a memory-mapped dictionary
+            offset (int): byte offset of the section
+        """
+        self._bytes = bytes_
+        self._offset = offset
+
+    def read(self, ref):
+        """Decodes the string with the specified reference.
+
+        Args:
+            ref (int): byte offset of the string in the pool
+
+        Returns:
+            tuple[str, int]: the string and the reference next to it
+        """
+        bytes_ = self._bytes
+        position = self._offset + ref
+        first = bytes_[position]
+        if first & _LONG:
+            length = ((first & 0x3F) << 8) | bytes_[position + 1]
+            position += 2
+        else:
+            length = first & 0x3F
+            position += 1
+        end = position + length
+        return bytes_[position:end].decode('utf-16-le' if first & _UTF16 else 'utf-8'), end - self._offset
+
+
+def open_string_pool(dictionary):
+    """Returns the string pool of a dictionary if its synonym groups refer to one.
+
+    Args:
+        dictionary (BinaryDictionary): a binary dictionary
+
+    Returns:
+        StringPool | None: the string pool, or ``None`` if the dictionary does not pool strings
+
+    Raises:
+        ValueError: the dictionary pools strings, but the string pool section is missing
+    """
+    if not has_string_pool(dictionary.header.version):
+        return None
+    section = dictionary.get_section(sections.STRING_POOL)
+    if section is None:
+        raise ValueError('the string pool section is missing')
+    return StringPool(dictionary.bytes_, section[0])
+
+
+class StringPoolBuilder(object):
+    """
+    Interns strings into the payload of a string pool
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.refs = {}
+
+    def add(self, text):
+        """Adds a string to the pool unless it is already there.
+
+        Args:
+            text (str): a string
+
+        Returns:
+            int: the reference to the string
+
+        Raises:
+            ValueError: the string is too long
+        """
+        ref = self.refs.get(text)
+        if ref is not None:
+            return ref
+        data = text.encode('utf-8')
+        encoding = 0
+        utf16 = text.encode('utf-16-le')
+        if len(utf16) < len(data):
+            data = utf16
+            encoding = _UTF16
+        if len(data) > MAX_STRING_SIZE:
+            raise ValueError('{} is too long'.format(text[:16]))
+        ref = len(self.buffer)
+        if len(data) < 64:
+            self.buffer.append(encoding | len(data))
+        else:
+            self.buffer.append(_LONG | encoding | (len(data) >> 8))
+            self.buffer.append(len(data) & 0xFF)
+        self.buffer += data
+        self.refs[text] = ref
+        return ref
+
+    def __len__(self):
+        return len(self.refs)
@@ -13,86 +13,229 @@
 # limitations under the License.
 
 import struct
+import sys
+import time
+from array import array
 
 from ..dictionarylib.flags import Flags
+from ..dictionarylib.groupoffsettable import GroupOffsetTable
+from ..lrucache import LRUCache
 from ..synonym import Synonym
 from ..synonymgroup import SynonymGroup
 
+_SHORT = struct.Struct('<H')
+_INT = struct.Struct('<i')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
 
 class SynonymGroupList(object):
 
-    def __init__(self, bytes_, offset):
+    def __init__(self, bytes_, offset, cache_size=0, string_pool=None):
         """Constructs a new synonym group list.
 
+        Groups are decoded with offset-based reads and never move the file position of ``bytes_``,
+        so one list can be shared between threads.
+
         Args:
             bytes_ (mmap.mmap): a memory-mapped dictionary
             offset (int): byte offset
+            cache_size (int): the maximum number of decoded groups to be cached. ``0`` disables the cache.
+            string_pool (StringPool | None): the string pool which the groups refer to,
+                or ``None`` if the strings are stored in the groups
         """
         self.bytes_ = bytes_
-        self.orig_pos = self.bytes_.tell()
-        self.bytes_.seek(offset)
-        self.size = int.from_bytes(self.bytes_.read(4), 'little', signed=True)
+        self.string_pool = string_pool
+        # decodes a head word from its reference
+        self.read_string = string_pool.read if string_pool is not None else self.buffer_to_string
+        self.offset_table = GroupOffsetTable(bytes_, offset)
+        self.size = self.offset_table.size
 
-        self.group_id_to_offset = {}
-        for i in range(self.size):
-            group_id = int.from_bytes(self.bytes_.read(4), 'little', signed=True)
-            offset = int.from_bytes(self.bytes_.read(4), 'little', signed=True)
-            self.group_id_to_offset[group_id] = offset
+        self.cache = LRUCache(cache_size) if cache_size > 0 else None
+        # ``DictionaryStats`` counting the decoded groups, or ``None``
+        self.stats = None
 
     def get_synonym_group(self, group_id):
         """Search a synonym group with the ``group_id`` and return the ``SynonymGroup`` object.
 
+        If the cache is enabled, the same ``SynonymGroup`` object may be returned for the same ``group_id``,
+        so callers must not modify it.
+
         Args:
             group_id (int): a synonym group ID
 
         Returns:
             SynonymGroup | None: the ``SynonymGroup`` with the ``group_id``, or ``None`` if no group is found.
         """
-        if group_id not in self.group_id_to_offset:
+        if self.cache is None:
+            return self._decode_synonym_group(group_id)
+
+        synonym_group = self.cache.get(group_id)
+        if synonym_group is None:
+            synonym_group = self._decode_synonym_group(group_id)
+            if synonym_group is not None:
+                self.cache.put(group_id, synonym_group)
+        return synonym_group
+
+    def _decode_synonym_group(self, group_id):
+        """Decodes the synonym group with the ``group_id`` from the dictionary.
+
+        Args:
+            group_id (int): a synonym group ID
+
+        Returns:
+            SynonymGroup | None: the ``SynonymGroup`` with the ``group_id``, or ``None`` if no group is found.
+        """
+        offset = self.offset_table.get(group_id)
+        if offset is None:
             return None
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+            synonym_group, end = self._read_synonym_group(group_id, offset)
+            stats.add_decode(end - offset, time.perf_counter() - start)
+            return synonym_group
+        return self._read_synonym_group(group_id, offset)[0]
+
+    def read_synonym_group(self, group_id, offset):
+        """Decodes the synonym group record at the ``offset``.
+
+        Args:
+            group_id (int): the synonym group ID of the record
+            offset (int): byte offset of the record
+
+        Returns:
+            SynonymGroup: the decoded group
+        """
+        return self._read_synonym_group(group_id, offset)[0]
+
+    def _read_synonym_group(self, group_id, offset):
+        """Decodes the synonym group record at the ``offset``.
+
+        Returns:
+            tuple[SynonymGroup, int]: the decoded group and the offset next to the record
+        """
+        if self.string_pool is not None:
+            return self._read_pooled_synonym_group(group_id, offset)
+        synonyms = []
+        n, = _SHORT.unpack_from(self.bytes_, offset)
+        offset += 2
+        for i in range(n):
+            head_word, offset = self.buffer_to_string(offset)
+            lexeme_ids, offset = self.buffer_to_short_array(offset)
+            flags, = _SHORT.unpack_from(self.bytes_, offset)
+            offset += 2
+            category, offset = self.buffer_to_string(offset)
+            synonyms.append(Synonym(head_word, lexeme_ids, Flags.from_int(flags), category))
+
+        return SynonymGroup(group_id, synonyms), offset
 
-        offset = self.group_id_to_offset[group_id]
-        self.bytes_.seek(offset)  # ? self.bytes_.seek(self.group_id_to_offset[group_id])
+    def _read_pooled_synonym_group(self, group_id, offset):
+        """Decodes the synonym group record at the ``offset`` whose strings are in the string pool.
 
+        A synonym consists of the reference to its head word (int32), lexeme IDs, flags (short)
+        and the reference to its category (int32).
+        """
+        bytes_ = self.bytes_
+        read = self.string_pool.read
         synonyms = []
-        n = int.from_bytes(self.bytes_.read(2), 'little')
+        n, = _SHORT.unpack_from(bytes_, offset)
+        offset += 2
         for i in range(n):
-            head_word = self.buffer_to_string()
-            lexeme_ids = self.buffer_to_short_array()
-            flags = int.from_bytes(self.bytes_.read(2), 'little')
-            category = self.buffer_to_string()
+            head_word = read(_INT.unpack_from(bytes_, offset)[0])[0]
+            lexeme_ids, offset = self.buffer_to_short_array(offset + 4)
+            flags, = _SHORT.unpack_from(bytes_, offset)
+            category = read(_INT.unpack_from(bytes_, offset + 2)[0])[0]
+            offset += 6
             synonyms.append(Synonym(head_word, lexeme_ids, Flags.from_int(flags), category))
 
-        return SynonymGroup(group_id, synonyms)
+        return SynonymGroup(group_id, synonyms), offset
+
+    def read_head_words(self, offset):
+        """Decodes the head words of the synonym group record at the ``offset`` without the other fields.
 
-    def buffer_to_string_length(self):
+        Args:
+            offset (int): byte offset of the record
+
+        Returns:
+            tuple[list[tuple[str, int]], int]: the head words with their references for ``self.read_string()``,
+            and the offset next to the record
+        """
+        bytes_ = self.bytes_
+        head_words = []
+        n, = _SHORT.unpack_from(bytes_, offset)
+        offset += 2
+        if self.string_pool is not None:
+            read = self.string_pool.read
+            for _ in range(n):
+                ref, = _INT.unpack_from(bytes_, offset)
+                head_words.append((read(ref)[0], ref))
+                # skips lexeme IDs, flags and a category
+                offset += 4 + 1 + 2 * bytes_[offset + 4] + 2 + 4
+            return head_words, offset
+
+        for _ in range(n):
+            head_word_offset = offset
+            head_word, offset = self.buffer_to_string(offset)
+            head_words.append((head_word, head_word_offset))
+            # skips lexeme IDs, flags and a category
+            offset += 1 + 2 * bytes_[offset] + 2
+            length, offset = self.buffer_to_string_length(offset)
+            offset += 2 * length
+        return head_words, offset
+
+    def iter_head_words(self):
+        """Yields the head words of all the groups without decoding the other fields.
+
+        Yields:
+            str: a head word
+        """
+        for i in range(self.size):
+            head_words, _ = self.read_head_words(self.offset_table.offset_at(i))
+            for head_word, _ in head_words:
+                yield head_word
+
+    def buffer_to_string_length(self, offset):
         """Reads a byte with a length of a subsequent string and returns the string length.
 
+        Args:
+            offset (int): byte offset of the length
+
         Returns:
-            int: a string length
+            tuple[int, int]: a string length and the offset of the string
         """
-        length = self.bytes_.read_byte()
+        length = self.bytes_[offset]
         if length < 128:
-            return length
+            return length, offset + 1
         else:
-            low = self.bytes_.read_byte()
-            return ((length & 0x7F) << 8) | low
+            low = self.bytes_[offset + 1]
+            return ((length & 0x7F) << 8) | low, offset + 2
 
-    def buffer_to_string(self):
+    def buffer_to_string(self, offset):
         """Reads bytes with a string of the appropriate length and returns the string.
 
+        Args:
+            offset (int): byte offset of the string length
+
         Returns:
-            str: a string
+            tuple[str, int]: a string and the offset next to it
         """
-        length = self.buffer_to_string_length()
-        return self.bytes_.read(2 * length).decode('utf-16-le')
+        length, offset = self.buffer_to_string_length(offset)
+        end = offset + 2 * length
+        return self.bytes_[offset:end].decode('utf-16-le'), end
 
-    def buffer_to_short_array(self):
+    def buffer_to_short_array(self, offset):
         """Reads byte with a continuous value of short.
 
+        Args:
+            offset (int): byte offset of the array length
+
         Returns:
-            list[int]: a list of short
+            tuple[array, int]: an array of short and the offset next to it
         """
-        length = self.bytes_.read_byte()
-        _bytes = self.bytes_.read(2 * length)
-        return list(struct.unpack('{}h'.format(length), _bytes))
+        length = self.bytes_[offset]
+        offset += 1
+        end = offset + 2 * length
+        shorts = array('h', self.bytes_[offset:end])
+        if _BIG_ENDIAN:
+            shorts.byteswap()
+        return shorts, end
@@ -0,0 +1,68 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+class DictionaryWatcher(threading.Thread):
+    """
+    A thread which polls the file of a dictionary and reloads it into a ``Chikkar`` when the file is replaced
+    """
+    def __init__(self, chikkar, dictionary, interval=1.0):
+        """Constructs a watcher. Call ``self.start()`` to start watching.
+
+        Args:
+            chikkar (Chikkar): a ``Chikkar`` with the ``dictionary``
+            dictionary (Dictionary): a dictionary to be reloaded
+            interval (float): the polling interval in seconds
+        """
+        super().__init__(name='DictionaryWatcher({})'.format(dictionary.filename), daemon=True)
+        self.chikkar = chikkar
+        self.dictionary = dictionary
+        self.interval = interval
+        self.reloads = 0
+        self._stop_event = threading.Event()
+        # the file is stat-ed here so that a replacement just after ``start()`` is not missed
+        self._last = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.dictionary.filename)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            stat = self._stat()
+            if stat is None or stat == self._last:
+                continue
+            # waits until the file stops changing
+            if self._stop_event.wait(self.interval) or self._stat() != stat:
+                continue
+            try:
+                self.dictionary = self.chikkar.reload(self.dictionary)
+                self.reloads += 1
+            except Exception as e:
+                logger.warning('failed to reload {}: {}'.format(self.dictionary.filename, e))
+            self._last = stat
+
+    def stop(self):
+        """Stops watching and waits for the thread to finish."""
+        self._stop_event.set()
+        self.join()
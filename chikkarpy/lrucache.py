@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'size', 'maxsize'])
+
+
+class LRUCache(object):
+    """
+    A bounded mapping which evicts the least recently used entry
+
+    All the operations are guarded by a lock, so a cache can be shared between threads.
+    """
+    def __init__(self, maxsize):
+        """Constructs an empty cache.
+
+        Args:
+            maxsize (int): the maximum number of entries. ``0`` disables the cache.
+
+        Raises:
+            ValueError: ``maxsize`` is negative
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be 0 or more, but {} is given.'.format(maxsize))
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Returns the value for ``key`` and marks it as the most recently used.
+
+        Args:
+            key (Hashable): a key
+            default (Any): the value returned when ``key`` is not cached
+
+        Returns:
+            Any: the cached value, or ``default`` if ``key`` is not cached
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Caches ``value`` for ``key``, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): a key
+            value (Any): a value
+        """
+        if self._maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all the entries. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        """Returns the statistics of this cache.
+
+        Returns:
+            CacheInfo: the numbers of hits, misses and evictions, the current size and the maximum size
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self._maxsize)
+
+    @property
+    def maxsize(self):
+        """int: the maximum number of entries"""
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
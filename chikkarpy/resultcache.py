@@ -0,0 +1,241 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .lrucache import CacheInfo
+
+# the default maximum number of results kept in the file
+DEFAULT_MAX_ENTRIES = 1000000
+# the version of the tables, which are recreated when it changes
+_SCHEMA_VERSION = 2
+# the number of words looked up by a statement, below the limit of host parameters of old SQLite
+_BATCH_SIZE = 500
+# seconds in which a result used again is not marked as used, which saves writes for frequent words
+_TOUCH_INTERVAL = 60.0
+
+
+def fingerprint(dictionaries):
+    """Returns a digest identifying the contents of the dictionaries and the order of the search.
+
+    The digest covers the header (version, creation time and description), the file size and ``enable_trie``
+    of each dictionary, so it changes whenever a dictionary is rebuilt or replaced.
+
+    Args:
+        dictionaries (list[Dictionary]): the dictionaries in the order of the search
+
+    Returns:
+        str: a hex digest
+    """
+    digest = hashlib.sha256()
+    for dictionary in dictionaries:
+        header = dictionary.dict_.header
+        digest.update(json.dumps([header.version, header.create_time, header.description,
+                                  len(dictionary.dict_.bytes_), dictionary.enable_trie]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PersistentResultCache(object):
+    """
+    Results of ``Chikkar.find_many()`` kept in an SQLite file across runs and processes
+
+    A result is keyed by the ``fingerprint()`` of the dictionaries, the verb mode, the word and the group IDs,
+    so the results of old dictionaries are never returned after the dictionaries change; they are left
+    to be evicted. When the file holds more than ``max_entries`` results, the least recently used ones are evicted;
+    the time of use is updated at most once a minute for each result.
+
+    The file is opened in the write-ahead logging mode, so it can be shared by processes: readers do not block
+    each other, and a writer waits up to ``timeout`` seconds for another. An object can be shared between threads.
+    """
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, timeout=30.0):
+        """Opens or creates the cache file.
+
+        Args:
+            path (str): path of the SQLite file
+            max_entries (int): the maximum number of results in the file
+            timeout (float): seconds to wait for another process writing the file
+
+        Raises:
+            ValueError: ``max_entries`` is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError('max_entries must be 1 or more, but {} is given.'.format(max_entries))
+        self.path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # transactions are begun explicitly
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        try:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._create_tables()
+        except Exception:
+            self._connection.close()
+            raise
+
+    def _create_tables(self):
+        with self._transaction() as cursor:
+            version, = cursor.execute('PRAGMA user_version').fetchone()
+            if version != _SCHEMA_VERSION:
+                cursor.execute('DROP TABLE IF EXISTS results')
+                cursor.execute('DROP TABLE IF EXISTS metadata')
+                cursor.execute('CREATE TABLE results (fingerprint TEXT NOT NULL, verb INTEGER NOT NULL, '
+                               'word TEXT NOT NULL, group_ids TEXT NOT NULL, synonyms TEXT NOT NULL, '
+                               'used REAL NOT NULL, UNIQUE (fingerprint, verb, word, group_ids))')
+                cursor.execute('CREATE INDEX results_used ON results (used)')
+                # the number of rows of ``results``, kept by each write instead of counting them
+                cursor.execute('CREATE TABLE metadata (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+                cursor.execute("INSERT INTO metadata VALUES ('size', 0)")
+                cursor.execute('PRAGMA user_version = {}'.format(_SCHEMA_VERSION))
+
+    def _transaction(self):
+        return _Transaction(self._connection, self._lock)
+
+    def get_many(self, fingerprint_, can_search_verb, keys):
+        """Returns the cached results of the ``keys`` and marks them as the most recently used.
+
+        Args:
+            fingerprint_ (str): the ``fingerprint()`` of the dictionaries
+            can_search_verb (bool): the verb mode
+            keys (Iterable[tuple[str, tuple[int] | None]]): pairs of a word and its group IDs
+
+        Returns:
+            dict[tuple[str, tuple[int] | None], list[str]]: the results found
+        """
+        verb = int(can_search_verb)
+        encoded = {}
+        for key in keys:
+            encoded[(key[0], _encode_group_ids(key[1]))] = key
+        words = list({word for word, _ in encoded})
+        found = {}
+        touched = []
+        used = time.time()
+        with self._lock:
+            # reads in the autocommit mode do not wait for a writer in the write-ahead logging mode
+            execute = self._connection.execute
+            for i in range(0, len(words), _BATCH_SIZE):
+                batch = words[i:i + _BATCH_SIZE]
+                rows = execute('SELECT rowid, word, group_ids, synonyms, used FROM results '
+                               'WHERE fingerprint = ? AND verb = ? AND word IN ({})'.format(','.join('?' * len(batch))),
+                               [fingerprint_, verb] + batch)
+                for rowid, word, group_ids, synonyms, last_used in rows:
+                    key = encoded.get((word, group_ids))
+                    if key is None:
+                        continue
+                    found[key] = json.loads(synonyms)
+                    if last_used < used - _TOUCH_INTERVAL:
+                        touched.append((used, rowid))
+            self.hits += len(found)
+            self.misses += len(encoded) - len(found)
+        if touched:
+            with self._transaction() as cursor:
+                cursor.executemany('UPDATE results SET used = ? WHERE rowid = ?', touched)
+        return found
+
+    def put_many(self, fingerprint_, can_search_verb, results):
+        """Stores results, evicting the least recently used ones if the file holds more than ``max_entries``.
+
+        Args:
+            fingerprint_ (str): the ``fingerprint()`` of the dictionaries
+            can_search_verb (bool): the verb mode
+            results (dict[tuple[str, tuple[int] | None], list[str]]): the results by pairs of a word and its group IDs
+        """
+        if not results:
+            return
+        verb = int(can_search_verb)
+        used = time.time()
+        rows = [(fingerprint_, verb, word, _encode_group_ids(group_ids), json.dumps(synonyms, ensure_ascii=False), used)
+                for (word, group_ids), synonyms in results.items()]
+        with self._transaction() as cursor:
+            # a key stored by another process has the same result, as the fingerprint identifies the dictionaries
+            cursor.executemany('INSERT OR IGNORE INTO results (fingerprint, verb, word, group_ids, synonyms, used) '
+                               'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            inserted = cursor.rowcount
+            size = _read_size(cursor) + inserted
+            if size > self._max_entries:
+                cursor.execute('DELETE FROM results WHERE rowid IN '
+                               '(SELECT rowid FROM results ORDER BY used LIMIT ?)', (size - self._max_entries,))
+                self.evictions += cursor.rowcount
+                size -= cursor.rowcount
+            cursor.execute("UPDATE metadata SET value = ? WHERE name = 'size'", (size,))
+
+    def info(self):
+        """Returns the statistics of this cache.
+
+        Returns:
+            CacheInfo: the numbers of hits, misses and evictions in this object,
+            the current number of results in the file and the maximum number
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, _read_size(self._connection), self._max_entries)
+
+    def clear(self):
+        """Removes all the results from the file. The counters are kept."""
+        with self._transaction() as cursor:
+            cursor.execute('DELETE FROM results')
+            cursor.execute("UPDATE metadata SET value = 0 WHERE name = 'size'")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _Transaction(object):
+    """
+    A write transaction begun immediately, so that another process cannot write between the reads and the writes
+    """
+    def __init__(self, connection, lock):
+        self._connection = connection
+        self._lock = lock
+        self._cursor = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._cursor = self._connection.cursor()
+            self._cursor.execute('BEGIN IMMEDIATE')
+        except Exception:
+            self._lock.release()
+            raise
+        return self._cursor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._cursor.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+        finally:
+            self._cursor.close()
+            self._lock.release()
+
+
+def _read_size(cursor):
+    size, = cursor.execute("SELECT value FROM metadata WHERE name = 'size'").fetchone()
+    return size
+
+
+def _encode_group_ids(group_ids):
+    # ``None`` and no group IDs give different results
+    return 'null' if group_ids is None else json.dumps(list(group_ids))
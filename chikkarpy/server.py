@@ -0,0 +1,328 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from logging import getLogger
+
+from .chikkar import Chikkar
+
+logger = getLogger(__name__)
+
+# the default number of worker threads of a server
+DEFAULT_WORKERS = 8
+# the maximum size of a request line or body
+MAX_REQUEST_SIZE = 1 << 24
+# seconds after which an idle connection is closed to free its worker
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+class SynonymService(object):
+    """
+    Answers synonym queries written in JSON with a ``Chikkar`` loaded once
+    """
+    def __init__(self, dictionaries, enable_verb=False):
+        """Constructs a service.
+
+        Args:
+            dictionaries (list[Dictionary]): synonym dictionaries in the order they are added to ``Chikkar``
+            enable_verb (bool): ``True`` to answer verb and adjective synonyms unless a query specifies otherwise
+        """
+        self.enable_verb = enable_verb
+        self._chikkars = {}
+        for can_search_verb in (False, True):
+            chikkar = Chikkar()
+            if can_search_verb:
+                chikkar.enable_verb()
+            for dictionary in dictionaries:
+                chikkar.add_dictionary(dictionary)
+            self._chikkars[can_search_verb] = chikkar
+
+    def close(self):
+        for dictionary in self._chikkars[False]._dictionaries:
+            dictionary.close()
+
+    def answer(self, queries):
+        """Answers queries.
+
+        A query is an object with ``word``, and optionally ``group_ids`` and ``enable_verb``.
+        The answer is an object with ``word`` and ``synonyms``, or ``word`` and ``error`` if the query is invalid.
+
+        Args:
+            queries (list): decoded queries
+
+        Returns:
+            list[dict]: the answers in the same order as ``queries``
+        """
+        answers = [None] * len(queries)
+        batches = {False: [], True: []}
+        for i, query in enumerate(queries):
+            error = _check_query(query)
+            if error is not None:
+                answers[i] = {'word': query.get('word') if isinstance(query, dict) else None, 'error': error}
+                continue
+            batches[bool(query.get('enable_verb', self.enable_verb))].append(i)
+
+        for can_search_verb, indices in batches.items():
+            if not indices:
+                continue
+            chikkar = self._chikkars[can_search_verb]
+            words = [queries[i]['word'] for i in indices]
+            group_ids = [queries[i].get('group_ids') for i in indices]
+            try:
+                results = chikkar.find_many(words, group_ids)
+            except ValueError:
+                # finds the invalid queries one by one
+                results = []
+                for word, gids in zip(words, group_ids):
+                    try:
+                        results.append(chikkar.find(word, gids))
+                    except ValueError as e:
+                        results.append(e)
+            for i, word, synonyms in zip(indices, words, results):
+                if isinstance(synonyms, ValueError):
+                    answers[i] = {'word': word, 'error': str(synonyms)}
+                else:
+                    answers[i] = {'word': word, 'synonyms': synonyms}
+        return answers
+
+    def answer_lines(self, lines):
+        """Answers JSON lines. Each line is a query, or an array of queries to be answered with an array.
+
+        Args:
+            lines (list[bytes]): lines of UTF-8 encoded JSON
+
+        Returns:
+            list[bytes]: the answers, each terminated by a newline
+        """
+        queries = []
+        shapes = []
+        for line in lines:
+            try:
+                query = json.loads(line.decode('utf-8'))
+            except ValueError as e:
+                shapes.append(('invalid', str(e)))
+                continue
+            if isinstance(query, list):
+                shapes.append(('array', len(query)))
+                queries.extend(query)
+            else:
+                shapes.append(('object', 1))
+                queries.append(query)
+
+        answers = iter(self.answer(queries))
+        results = []
+        for shape, n in shapes:
+            if shape == 'invalid':
+                answer = {'error': 'invalid JSON: {}'.format(n)}
+            elif shape == 'array':
+                answer = [next(answers) for _ in range(n)]
+            else:
+                answer = next(answers)
+            results.append(json.dumps(answer, ensure_ascii=False).encode('utf-8') + b'\n')
+        return results
+
+
+def _check_query(query):
+    if not isinstance(query, dict):
+        return 'a query must be an object'
+    if not isinstance(query.get('word'), str):
+        return '"word" must be a string'
+    group_ids = query.get('group_ids')
+    # ``true`` and ``false`` are decoded as ``bool``, a subclass of ``int``
+    if group_ids is not None and not (isinstance(group_ids, list) and all(type(gid) is int for gid in group_ids)):
+        return '"group_ids" must be an array of integers'
+    if not isinstance(query.get('enable_verb', False), bool):
+        return '"enable_verb" must be a boolean'
+    return None
+
+
+class _PooledMixIn(object):
+    """
+    Handles connections in a fixed number of worker threads instead of a thread per connection
+    """
+    workers = DEFAULT_WORKERS
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+
+    def process_request(self, request, client_address):
+        if getattr(self, '_executor', None) is None:
+            self._executor = ThreadPoolExecutor(self.workers)
+            self._connections = set()
+        self._executor.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        self._connections.add(request)
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._connections.discard(request)
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if getattr(self, '_executor', None) is not None:
+            # wakes up the workers waiting on kept-alive connections
+            for request in list(self._connections):
+                try:
+                    request.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._executor.shutdown(wait=False)
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    # keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
+    # the headers and the body are written separately, which would wait for the delayed ACK of the client
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def do_POST(self):
+        if self.path != '/find':
+            self._send(404, b'{"error": "not found"}\n')
+            return
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self._send(411, b'{"error": "Content-Length is required"}\n')
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # the end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            self._send(400, b'{"error": "invalid Content-Length"}\n')
+            return
+        if length > MAX_REQUEST_SIZE:
+            self.close_connection = True
+            self._send(413, b'{"error": "too large"}\n')
+            return
+        body = self.rfile.read(length)
+        lines = [line for line in body.split(b'\n') if line.strip()]
+        self._send(200, b''.join(self.server.service.answer_lines(lines)))
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format_, *args):
+        logger.debug('%s - %s', self.address_string(), format_ % args)
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+
+    def setup(self):
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def handle(self):
+        service = self.server.service
+        while True:
+            try:
+                line = self.rfile.readline(MAX_REQUEST_SIZE)
+            except socket.timeout:
+                return
+            if not line:
+                return
+            if len(line) >= MAX_REQUEST_SIZE and not line.endswith(b'\n'):
+                # answers the whole line once, instead of each part of it
+                self.wfile.write(b'{"error": "too large"}\n')
+                if not self._skip_line():
+                    return
+                continue
+            if not line.strip():
+                continue
+            self.wfile.write(service.answer_lines([line])[0])
+
+    def _skip_line(self):
+        """Discards the rest of the line being read.
+
+        Returns:
+            bool: ``True`` if the line is discarded, or ``False`` if the connection is closed or idle
+        """
+        while True:
+            try:
+                line = self.rfile.readline(MAX_REQUEST_SIZE)
+            except socket.timeout:
+                return False
+            if not line:
+                return False
+            if line.endswith(b'\n'):
+                return True
+
+
+class SynonymHTTPServer(_PooledMixIn, HTTPServer):
+    """
+    An HTTP server which answers JSON lines posted to ``/find``
+    """
+    def __init__(self, server_address, service, workers=DEFAULT_WORKERS, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.service = service
+        self.workers = workers
+        self.idle_timeout = idle_timeout
+        super().__init__(server_address, _HTTPHandler)
+
+
+if hasattr(socket, 'AF_UNIX'):
+    class SynonymUnixServer(_PooledMixIn, socketserver.UnixStreamServer):
+        """
+        A Unix domain socket server which answers each JSON line with a JSON line
+        """
+        def __init__(self, server_address, service, workers=DEFAULT_WORKERS, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+            self.service = service
+            self.workers = workers
+            self.idle_timeout = idle_timeout
+            super().__init__(server_address, _LineHandler)
+
+        def server_close(self):
+            super().server_close()
+            if os.path.exists(self.server_address):
+                os.unlink(self.server_address)
+
+
+def make_server(service, host='127.0.0.1', port=8080, unix_path=None, workers=DEFAULT_WORKERS,
+                idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Makes a server of the ``service``. Call ``serve_forever()`` of the server to start it.
+
+    Each worker thread serves one connection at a time as long as it is kept alive,
+    so ``workers`` is also the number of connections served at once.
+
+    Args:
+        service (SynonymService): the service
+        host (str): the host name of an HTTP server
+        port (int): the port of an HTTP server, 0 for any free port
+        unix_path (str | None): the path of a Unix domain socket to listen on instead of HTTP
+        workers (int): the number of worker threads
+        idle_timeout (float): seconds after which an idle connection is closed
+
+    Returns:
+        socketserver.BaseServer: the server
+    """
+    if unix_path is not None:
+        return SynonymUnixServer(unix_path, service, workers, idle_timeout)
+    return SynonymHTTPServer((host, port), service, workers, idle_timeout)
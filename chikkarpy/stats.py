@@ -0,0 +1,220 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+# the counters of ``DictionaryStats`` in the order of the output
+DICTIONARY_COUNTERS = ('trie_probes', 'trie_hits', 'trie_misses', 'trie_seconds',
+                       'groups_decoded', 'decode_seconds', 'bytes_read', 'expansions')
+# the counters of ``ChikkarStats`` in the order of the output
+CHIKKAR_COUNTERS = ('finds', 'find_seconds', 'filter_seconds',
+                    'merged_index_probes', 'merged_index_hits', 'merged_index_misses')
+
+_HELP = {
+    'finds': 'Lookups of synonyms for a word.',
+    'find_seconds': 'Time spent on lookups of synonyms for a word.',
+    'filter_seconds': 'Time spent on choosing the synonyms from decoded groups.',
+    'merged_index_probes': 'Probes of the merged index.',
+    'merged_index_hits': 'Probes of the merged index which found the word.',
+    'merged_index_misses': 'Probes of the merged index which did not find the word.',
+    'result_cache_hits': 'Results of find_bytes answered from the result cache of the current dictionaries.',
+    'result_cache_misses': 'Results of find_bytes not found in the result cache of the current dictionaries.',
+    'trie_probes': 'Probes of the trie.',
+    'trie_hits': 'Probes of the trie which found a head word.',
+    'trie_misses': 'Probes of the trie which found no head word.',
+    'trie_seconds': 'Time spent on probes of the trie.',
+    'groups_decoded': 'Synonym groups decoded from the dictionary.',
+    'decode_seconds': 'Time spent on decoding synonym groups.',
+    'bytes_read': 'Bytes of synonym group records read from the dictionary.',
+    'expansions': 'Lookups of the expansion table.',
+    'group_cache_hits': 'Synonym groups found in the cache.',
+    'group_cache_misses': 'Synonym groups not found in the cache.',
+}
+
+
+class DictionaryStats(object):
+    """
+    Counters and cumulative timings of the lookups in a dictionary
+
+    All the updates are guarded by a lock, so the counters can be shared between threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.trie_probes = 0
+        self.trie_hits = 0
+        self.trie_misses = 0
+        self.trie_seconds = 0.0
+        self.groups_decoded = 0
+        self.decode_seconds = 0.0
+        self.bytes_read = 0
+        self.expansions = 0
+
+    def add_probe(self, found, seconds):
+        """Counts a probe of the trie.
+
+        Args:
+            found (bool): ``True`` if the probe found a head word
+            seconds (float): the time taken by the probe
+        """
+        with self._lock:
+            self.trie_probes += 1
+            if found:
+                self.trie_hits += 1
+            else:
+                self.trie_misses += 1
+            self.trie_seconds += seconds
+
+    def add_decode(self, n_bytes, seconds):
+        """Counts a decoded synonym group.
+
+        Args:
+            n_bytes (int): the size of the record read from the dictionary
+            seconds (float): the time taken by decoding
+        """
+        with self._lock:
+            self.groups_decoded += 1
+            self.bytes_read += n_bytes
+            self.decode_seconds += seconds
+
+    def add_expansion(self):
+        """Counts a lookup of the expansion table."""
+        with self._lock:
+            self.expansions += 1
+
+    def snapshot(self):
+        """Returns the current values of the counters.
+
+        Returns:
+            dict[str, int | float]: the values by the names in ``DICTIONARY_COUNTERS``
+        """
+        with self._lock:
+            return {name: getattr(self, name) for name in DICTIONARY_COUNTERS}
+
+
+class ChikkarStats(object):
+    """
+    Counters and cumulative timings of the lookups in ``Chikkar``
+
+    All the updates are guarded by a lock, so the counters can be shared between threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.finds = 0
+        self.find_seconds = 0.0
+        self.filter_seconds = 0.0
+        self.merged_index_probes = 0
+        self.merged_index_hits = 0
+        self.merged_index_misses = 0
+
+    def add_find(self, seconds):
+        """Counts a lookup of synonyms for a word.
+
+        Args:
+            seconds (float): the time taken by the lookup
+        """
+        with self._lock:
+            self.finds += 1
+            self.find_seconds += seconds
+
+    def add_filter(self, seconds):
+        """Adds the time taken by choosing the synonyms from a decoded group.
+
+        Args:
+            seconds (float): the time taken
+        """
+        with self._lock:
+            self.filter_seconds += seconds
+
+    def add_merged_probe(self, found):
+        """Counts a probe of the merged index.
+
+        Args:
+            found (bool): ``True`` if the probe found the word
+        """
+        with self._lock:
+            self.merged_index_probes += 1
+            if found:
+                self.merged_index_hits += 1
+            else:
+                self.merged_index_misses += 1
+
+    def timed_filter(self, gather_head_word):
+        """Wraps a function choosing the synonyms from a group so that its time is added to ``filter_seconds``.
+
+        Args:
+            gather_head_word (Callable): ``Chikkar._gather_head_word`` or ``Chikkar._gather_member_head_word``
+
+        Returns:
+            Callable: a function with the same arguments and result
+        """
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return gather_head_word(*args)
+            finally:
+                self.add_filter(clock() - start)
+        return timed
+
+    def snapshot(self):
+        """Returns the current values of the counters.
+
+        Returns:
+            dict[str, int | float]: the values by the names in ``CHIKKAR_COUNTERS``
+        """
+        with self._lock:
+            return {name: getattr(self, name) for name in CHIKKAR_COUNTERS}
+
+
+def to_prometheus(snapshot, prefix='chikkarpy'):
+    """Formats a snapshot of ``Chikkar.stats_snapshot()`` in the Prometheus text exposition format.
+
+    The counters of each dictionary are labeled with its position in the order of the search and its file name.
+
+    Args:
+        snapshot (dict): a snapshot returned by ``Chikkar.stats_snapshot()``
+        prefix (str): the prefix of the metric names
+
+    Returns:
+        str: the metrics, one sample per line
+    """
+    lines = []
+    for name in CHIKKAR_COUNTERS + ('result_cache_hits', 'result_cache_misses'):
+        _append_metric(lines, prefix, name, [('', snapshot[name])])
+
+    samples = {}
+    for position, dictionary in enumerate(snapshot['dictionaries']):
+        if dictionary is None:
+            continue
+        labels = '{{position="{}",dictionary="{}"}}'.format(position, _escape_label(dictionary['filename']))
+        for name in DICTIONARY_COUNTERS + ('group_cache_hits', 'group_cache_misses'):
+            samples.setdefault(name, []).append((labels, dictionary[name]))
+    for name in DICTIONARY_COUNTERS + ('group_cache_hits', 'group_cache_misses'):
+        if name in samples:
+            _append_metric(lines, prefix, name, samples[name])
+    return ''.join(line + '\n' for line in lines)
+
+
+def _append_metric(lines, prefix, name, samples):
+    metric = '{}_{}_total'.format(prefix, name)
+    lines.append('# HELP {} {}'.format(metric, _HELP[name]))
+    lines.append('# TYPE {} counter'.format(metric))
+    for labels, value in samples:
+        lines.append('{}{} {}'.format(metric, labels, repr(float(value)) if isinstance(value, float) else value))
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -19,12 +19,14 @@ class Synonym(object):
     """
     A synonym
     """
+    __slots__ = ('_head_word', '_lexeme_ids', '_flags', '_category')
+
     def __init__(self, head_word, lexeme_ids, flags, category):
         """Construct a new synonym with the specified parameter.
 
         Args:
             head_word (str): a notation string
-            lexeme_ids (list[int]): IDs of lexeme in the synonym group
+            lexeme_ids (Sequence[int]): IDs of lexeme in the synonym group
             flags (Flags): encoded flags
             category (str): category Information of the synonym
         """
@@ -40,7 +42,7 @@ class Synonym(object):
 
     @property
     def lexeme_ids(self):
-        """list[int]: the IDs of the lexemes that corresponds to this synonym"""
+        """Sequence[int]: the IDs of the lexemes that corresponds to this synonym"""
         return self._lexeme_ids
 
     @property
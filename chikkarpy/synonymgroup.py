@@ -19,6 +19,8 @@ class SynonymGroup(object):
     """
     A container of synonyms
     """
+    __slots__ = ('_group_id', '_synonyms')
+
     def __init__(self, group_id, synonyms):
         """Constructs a new group with the specified synonym group ID and the list of synonyms.
 
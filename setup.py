@@ -35,7 +35,10 @@ setup(
     install_requires=[
         "dartsclone~=0.9.0",
         "sortedcontainers>=2.1.0"
-    ]
+    ],
+    extras_require={
+        "numpy": ["numpy"]
+    }
 )
 
 # Downloads the Sudachi Synonym dictionary
@@ -0,0 +1,60 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import tempfile
+from unittest import TestCase
+
+from chikkarpy.command_line import build_dictionary
+from chikkarpy.dictionarylib import Dictionary
+
+
+class BuiltDictionaryTestCase(TestCase):
+    """
+    A base of tests which build the dictionaries in ``tests/resources`` with options in a temporary directory
+    """
+    def setUp(self):
+        self.resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources')
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.dictionaries = []
+
+    def tearDown(self):
+        for dictionary in self.dictionaries:
+            dictionary.close()
+        self.work_dir.cleanup()
+
+    def _resource(self, name):
+        """Returns the path of the dictionary built from ``{name}.csv`` without options."""
+        return os.path.join(self.resource_dir, '{}.dic'.format(name))
+
+    def _build(self, name, **options):
+        """Builds ``{name}.csv`` with the options of ``build_dictionary()`` once and returns the path."""
+        path = os.path.join(self.work_dir.name, '{}-{}.dic'.format(name, '-'.join(sorted(options))))
+        if not os.path.exists(path):
+            build_dictionary(os.path.join(self.resource_dir, '{}.csv'.format(name)), path, '', **options)
+        return path
+
+    def _open(self, path, enable_trie=True):
+        dictionary = Dictionary(path, enable_trie)
+        self.dictionaries.append(dictionary)
+        return dictionary
+
+    def _head_words(self, name):
+        with open(os.path.join(self.resource_dir, '{}.csv'.format(name)), encoding='utf-8') as f:
+            return [line.split(',')[8] for line in f if line.strip()] + ['nothing']
+
+    def _group_ids(self, name):
+        with open(os.path.join(self.resource_dir, '{}.csv'.format(name)), encoding='utf-8') as f:
+            return sorted({int(line.split(',')[0]) for line in f if line.strip()})
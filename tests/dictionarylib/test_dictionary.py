@@ -16,14 +16,15 @@ import os
 from unittest import TestCase
 
 from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.dictionary import DEFAULT_CACHE_SIZE
 
 
 class TestDictionary(TestCase):
 
     def setUp(self):
-        dic_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources', 'system.dic')
-        self.dict = Dictionary(dic_file, True)
-        self.dict_group_id = Dictionary(dic_file, False)
+        self.dic_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources', 'system.dic')
+        self.dict = Dictionary(self.dic_file, True)
+        self.dict_group_id = Dictionary(self.dic_file, False)
 
     def tearDown(self):
         self.dict.dict_.close()
@@ -44,3 +45,26 @@ class TestDictionary(TestCase):
         # non-existent group id in the dictionary
         synonym_group = self.dict.get_synonym_group(200)
         self.assertFalse(synonym_group)
+
+    def test_cache(self):
+        dic = Dictionary(self.dic_file, True, cache_size=DEFAULT_CACHE_SIZE)
+        try:
+            group = dic.get_synonym_group(6)
+            self.assertIs(dic.get_synonym_group(6), group)
+            dic.get_synonym_group(200)
+            info = dic.cache_info()
+            self.assertEqual(info.hits, 1)
+            self.assertEqual(info.misses, 2)
+            self.assertEqual(info.size, 1)
+        finally:
+            dic.close()
+
+    def test_cache_disabled_by_default(self):
+        dic = Dictionary(self.dic_file, True)
+        try:
+            self.assertIsNone(dic.cache_info())
+            group = dic.get_synonym_group(6)
+            self.assertIsNot(dic.get_synonym_group(6), group)
+            self.assertEqual(dic.get_synonym_group(6).get_id(), 6)
+        finally:
+            dic.close()
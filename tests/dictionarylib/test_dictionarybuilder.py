@@ -0,0 +1,99 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from logging import getLogger
+from unittest import TestCase
+from unittest.mock import patch
+
+from chikkarpy.dictionarylib import dictionarybuilder
+from chikkarpy.dictionarylib.dictionarybuilder import DictionaryBuilder
+from chikkarpy.dictionarylib.streamingdictionarybuilder import StreamingDictionaryBuilder
+
+
+class TestDictionaryBuilder(TestCase):
+
+    def setUp(self):
+        self.resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources')
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.logger = getLogger('chikkarpy.tests.builder')
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def _build(self, builder, input_path):
+        output = BytesIO()
+        builder.build(input_path, output)
+        return output.getvalue()
+
+    def _write_input(self, lines):
+        input_path = os.path.join(self.work_dir.name, 'input.csv')
+        with open(input_path, 'w', encoding='utf-8') as wf:
+            wf.writelines(lines)
+        return input_path
+
+    def _build_error(self, builder, input_path):
+        with self.assertLogs(self.logger, 'ERROR') as logs, self.assertRaises(ValueError) as cm:
+            self._build(builder, input_path)
+        return logs.output, str(cm.exception)
+
+    def test_output(self):
+        # the digests of the output of the builder which wrote each value with ``JTypedByteBuffer``
+        expected = {
+            ('system', False): 'c2397e4b1f03f9e3e115f10f0ab0051997d3dbbc580c54656cc39b3efa3c035c',
+            ('system', True): '1be55f51b5860e46007f30436e6dd168cf2839100db5836b6251f3e066acb841',
+            ('user', False): '4f918d25446b9c65dd33aeb1c1d972630e3d2c84d6055a4f0e8af365a4147ab1',
+            ('user', True): 'c58a452b03e3b16732f8357fca342d5f303949c7bee8a5ebe2292364840471c3',
+            ('user2', False): '6846d752381aa1d6c16da8da61f200a2f6a5ee1cce97588dfa910e03dbd5ff15',
+            ('user2', True): 'c5a5fdb78bb4ec7942070e38b24e555461e1a5c2bec3a4ee6fd3e6e3fe82e056',
+        }
+        for (name, expansion_table), digest in expected.items():
+            input_path = os.path.join(self.resource_dir, '{}.csv'.format(name))
+            output = self._build(DictionaryBuilder(logger=self.logger, expansion_table=expansion_table), input_path)
+            self.assertEqual(hashlib.sha256(output).hexdigest(), digest, (name, expansion_table))
+            if not expansion_table:
+                output = self._build(StreamingDictionaryBuilder(logger=self.logger), input_path)
+                self.assertEqual(hashlib.sha256(output).hexdigest(), digest, name)
+
+    def test_output_with_long_strings(self):
+        lines = []
+        for i, word in enumerate(['あ' * 127, 'い' * 128, '\U00020BB7' * 70, 'x' * 300, 'abc']):
+            lines.append('000003,1,0,{},0,0,0,{},{},,\n'.format('/'.join(map(str, range(1, i + 2))), 'c' * 130 * i, word))
+        lines += ['\n', '000001,2,0,7,1,2,3,,abc,,\n', '000001,1,0,-1,0,0,0,(),d,,\n']
+        input_path = self._write_input(lines)
+        output = self._build(DictionaryBuilder(logger=self.logger, expansion_table=True), input_path)
+        self.assertEqual(hashlib.sha256(output).hexdigest(), '1185693ad57329ec73cab897f123ee3c52b3ba94afa56d0bcb62651f175894f6')
+
+    def test_parallel_same_output(self):
+        with patch.object(dictionarybuilder, 'PARSE_CHUNK_SIZE', 2):
+            for name in ('system', 'user', 'user2'):
+                input_path = os.path.join(self.resource_dir, '{}.csv'.format(name))
+                expected = self._build(DictionaryBuilder(logger=self.logger), input_path)
+                self.assertEqual(self._build(DictionaryBuilder(logger=self.logger, processes=2), input_path), expected)
+                builder = StreamingDictionaryBuilder(logger=self.logger, processes=2, spill_size=3)
+                self.assertEqual(self._build(builder, input_path), expected)
+
+    def test_parallel_same_errors(self):
+        valid = ['000001,1,0,1,0,0,0,(),a,,\n', '000001,1,0,1,0,0,0,(),b,,\n', '\n', '\n',
+                 '000002,1,2,1,0,0,0,(),c,,\n', '000002,1,0,1,0,0,0,(),d,,\n', '\n']
+        for invalid in ('000002,1,0,1,0,0,0,(),e,,\n', '000003,3,0,1,0,0,0,(),e,,\n', '000003,1,0\n'):
+            input_path = self._write_input(valid * 3 + [invalid] + valid)
+            expected = self._build_error(DictionaryBuilder(logger=self.logger), input_path)
+            with patch.object(dictionarybuilder, 'PARSE_CHUNK_SIZE', 2):
+                self.assertEqual(self._build_error(DictionaryBuilder(logger=self.logger, processes=2), input_path), expected)
+        self.assertIn('at line 21 in', expected[0][0])
@@ -0,0 +1,66 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from chikkarpy import Chikkar
+
+from .builtdictionaries import BuiltDictionaryTestCase
+
+# the options of ``chikkarpy build``: none, -e, -g, -p and all of them
+OPTIONS = (
+    {},
+    {'expansion_table': True},
+    {'group_index': True},
+    {'string_pool': True},
+    {'expansion_table': True, 'group_index': True, 'string_pool': True},
+)
+
+
+class TestDictionaryOptions(BuiltDictionaryTestCase):
+
+    def test_same_as_version_1(self):
+        for options in OPTIONS:
+            for enable_verb in (False, True):
+                for enable_trie in (False, True):
+                    for names in (['system'], ['system', 'user'], ['system', 'user', 'user2']):
+                        with self.subTest(options=options, enable_verb=enable_verb, enable_trie=enable_trie, names=names):
+                            self._assert_same(options, enable_verb, enable_trie, names)
+
+    def _assert_same(self, options, enable_verb, enable_trie, names):
+        expected = Chikkar()
+        actual = Chikkar()
+        if enable_verb:
+            expected.enable_verb()
+            actual.enable_verb()
+        for name in names:
+            expected.add_dictionary(self._open(self._resource(name), enable_trie))
+            actual.add_dictionary(self._open(self._build(name, **options), enable_trie))
+        for name in names:
+            words = self._head_words(name)
+            for word in words:
+                self.assertListEqual(actual.find(word), expected.find(word), word)
+                for group_id in self._group_ids(name):
+                    try:
+                        result = expected.find(word, group_ids=[group_id])
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            actual.find(word, group_ids=[group_id])
+                        continue
+                    self.assertListEqual(actual.find(word, group_ids=[group_id]), result, word)
+            self.assertListEqual(actual.find_many(words), expected.find_many(words))
+            self.assertListEqual(list(actual.scan(''.join(words))), list(expected.scan(''.join(words))))
+        actual.build_merged_index()
+        for name in names:
+            words = self._head_words(name)
+            self.assertListEqual(actual.find_many(words), expected.find_many(words))
@@ -0,0 +1,36 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from chikkarpy.dictionarylib.dictionaryversion import SYSTEM_DICT_VERSION_1, SYSTEM_DICT_VERSION_2
+
+from .builtdictionaries import BuiltDictionaryTestCase
+
+
+class TestExpansionTable(BuiltDictionaryTestCase):
+
+    def test_version(self):
+        plain = self._open(self._resource('system'))
+        self.assertEqual(plain.dict_.header.version, SYSTEM_DICT_VERSION_1)
+        self.assertIsNone(plain.expansion_table)
+        dictionary = self._open(self._build('system', expansion_table=True))
+        self.assertEqual(dictionary.dict_.header.version, SYSTEM_DICT_VERSION_2)
+        self.assertIsNotNone(dictionary.expansion_table)
+
+    def test_expand(self):
+        dictionary = self._open(self._build('system', expansion_table=True))
+        self.assertListEqual(dictionary.expand('開店', False), ['始業', '営業開始', '店開き', 'オープン', 'open'])
+        self.assertListEqual(dictionary.expand('オープン', False), [])
+        self.assertIsNone(dictionary.expand('nothing', False))
+        with self.assertRaises(ValueError):
+            self._open(self._resource('system')).expand('開店', False)
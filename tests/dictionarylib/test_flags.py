@@ -39,3 +39,9 @@ class TestFlags(TestCase):
         self.assertEqual(new_flags.form_type, Form.MISNOMER)
         self.assertEqual(new_flags.acronym_type, Acronym.OTHERS)
         self.assertEqual(new_flags.variant_type, Variant.MISSPELLED)
+
+    def test_from_int_is_shared(self):
+        flags = Flags(True, False, Form.ALIAS, Acronym.ALPHABET, Variant.NONE)
+        self.assertIs(Flags.from_int(flags.encode()), Flags.from_int(flags.encode()))
+        self.assertEqual(Flags.from_int(flags.encode()), flags)
+        self.assertFalse(hasattr(flags, '__dict__'))
@@ -0,0 +1,52 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from chikkarpy.dictionarylib.dictionaryversion import SYSTEM_DICT_VERSION_2
+
+from .builtdictionaries import BuiltDictionaryTestCase
+
+
+class TestGroupIndex(BuiltDictionaryTestCase):
+
+    def test_version(self):
+        dictionary = self._open(self._build('system', group_index=True))
+        self.assertEqual(dictionary.dict_.header.version, SYSTEM_DICT_VERSION_2)
+        self.assertIsNotNone(dictionary.group_index)
+        self.assertIsNone(dictionary.expansion_table)
+        self.assertIsNone(self._open(self._resource('system')).group_index)
+
+    def test_get_group_members(self):
+        dictionary = self._open(self._build('system', group_index=True))
+        for group_id in self._group_ids('system'):
+            synonym_group = dictionary.get_synonym_group(group_id)
+            expected = [(synonym.head_word, synonym.has_ambiguity, synonym.is_noun) for synonym in synonym_group.get_synonyms()]
+            members = dictionary.get_group_members(group_id)
+            self.assertListEqual([(head_word, flags.has_ambiguity, flags.is_noun) for head_word, flags in members], expected)
+        self.assertIsNone(dictionary.get_group_members(0))
+        with self.assertRaises(ValueError):
+            self._open(self._resource('system')).get_group_members(6)
+
+    def test_shared_head_words(self):
+        dictionary = self._open(self._build('system', group_index=True))
+        refs = {}
+        index = dictionary.group_index
+        bytes_ = dictionary.dict_.bytes_
+        for i in range(index.size):
+            record = index._offset + int.from_bytes(bytes_[index._offset + 4 + 4 * i:index._offset + 8 + 4 * i], 'little')
+            n = int.from_bytes(bytes_[record:record + 2], 'little')
+            for j in range(n):
+                member = record + 2 + 6 * j
+                ref = int.from_bytes(bytes_[member + 2:member + 6], 'little')
+                head_word = dictionary.group_list.buffer_to_string(ref)[0]
+                self.assertEqual(refs.setdefault(head_word, ref), ref, head_word)
@@ -0,0 +1,72 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from unittest import TestCase
+from unittest.mock import patch
+
+from chikkarpy.dictionarylib.groupoffsettable import GroupOffsetTable
+
+
+def _table(pairs):
+    bytes_ = b'\x00\x00' + struct.pack('<i', len(pairs))
+    for group_id, offset in pairs:
+        bytes_ += struct.pack('<2i', group_id, offset)
+    return GroupOffsetTable(bytes_, 2)
+
+
+class TestGroupOffsetTable(TestCase):
+
+    def test_dense(self):
+        table = _table([(5, 100), (6, 200), (7, 300)])
+        self.assertEqual(table.get(5), 100)
+        self.assertEqual(table.get(7), 300)
+        self.assertIsNone(table.get(4))
+        self.assertIsNone(table.get(8))
+        self.assertEqual(table.index_of(6), 1)
+        self.assertEqual(table.storage_size(), 4 + 8 * 3)
+
+    def test_sorted(self):
+        table = _table([(5, 100), (6, 200), (100006, 300)])
+        self.assertEqual(table.get(5), 100)
+        self.assertEqual(table.get(6), 200)
+        self.assertEqual(table.get(100006), 300)
+        self.assertIsNone(table.get(7))
+        self.assertNotIn(100007, table)
+
+    def test_unsorted(self):
+        table = _table([(100006, 300), (6, 200), (5, 100), (6, 400)])
+        self.assertEqual(table.get(5), 100)
+        self.assertEqual(table.get(6), 400)
+        self.assertEqual(table.get(100006), 300)
+        self.assertIsNone(table.get(7))
+
+    def test_presumed_dense(self):
+        # the IDs at both ends span 4 IDs, but the table is not consecutive
+        table = _table([(5, 100), (7, 200), (6, 300), (8, 400)])
+        self.assertEqual(table.get(5), 100)
+        self.assertEqual(table.get(8), 400)
+        self.assertEqual(table.get(7), 200)
+        self.assertEqual(table.get(6), 300)
+        self.assertIsNone(table.get(9))
+
+    def test_dense_without_scan(self):
+        table = _table([(5, 100), (6, 200), (7, 300)])
+        with patch.object(table, '_scan', side_effect=AssertionError('the table was scanned')):
+            self.assertEqual(table.get(6), 200)
+
+    def test_empty(self):
+        table = _table([])
+        self.assertEqual(len(table), 0)
+        self.assertIsNone(table.get(0))
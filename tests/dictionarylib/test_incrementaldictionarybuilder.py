@@ -0,0 +1,95 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from logging import getLogger
+from unittest import TestCase
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.dictionarybuilder import DictionaryBuilder
+from chikkarpy.dictionarylib.dictionaryheader import DictionaryHeader
+from chikkarpy.dictionarylib.incrementaldictionarybuilder import IncrementalDictionaryBuilder
+
+GROUP_5 = ['000005,1,0,1,0,0,0,(),閉店,,\n', '000005,1,1,2,0,0,0,(),クローズ,,\n', '000005,1,1,2,0,0,1,(),close,,\n']
+GROUP_6 = ['000006,1,0,1,0,0,0,(),開店,,\n', '000006,1,1,5,0,0,0,(),オープン,,\n', '000006,1,1,5,0,0,1,(),open,,\n']
+GROUP_6_CHANGED = ['000006,1,0,1,0,0,0,(),開店,,\n', '000006,1,0,2,0,0,0,(),始業,,\n', '000006,1,1,5,0,0,1,(),open,,\n']
+GROUP_7 = ['000007,1,0,1,0,0,0,(),開放,,\n', '000007,2,0,2,0,0,0,(),開け放す,,\n', '000007,1,0,3,0,0,1,(),open,,\n']
+GROUP_100006 = ['100006,1,0,1,0,0,0,(),公然,,\n', '100006,1,1,2,0,0,0,(),オープン,,\n', '100006,1,1,2,0,0,1,(),open,,\n']
+
+
+class TestIncrementalDictionaryBuilder(TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.logger = getLogger('chikkarpy.tests.builder')
+        self.logger.propagate = False
+        self.dictionaries = []
+
+    def tearDown(self):
+        for dictionary in self.dictionaries:
+            dictionary.close()
+        self.work_dir.cleanup()
+
+    def _write(self, name, blocks):
+        path = os.path.join(self.work_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as wf:
+            for block in blocks:
+                wf.writelines(block)
+                wf.write('\n')
+        return path
+
+    def _build(self, builder, input_path, name):
+        path = os.path.join(self.work_dir.name, name)
+        with open(path, 'wb') as wf:
+            wf.write(DictionaryHeader(builder.version, 0, '').to_byte())
+            builder.build(input_path, wf)
+        return path
+
+    def _find_all(self, path, words):
+        dictionary = Dictionary(path, True)
+        self.dictionaries.append(dictionary)
+        chikkar = Chikkar()
+        chikkar.add_dictionary(dictionary)
+        results = [chikkar.find(word) for word in words]
+        chikkar.enable_verb()
+        return results + [chikkar.find(word) for word in words]
+
+    def _assert_same_as_full_build(self, expansion_table, processes=1, group_index=False):
+        base_path = self._build(DictionaryBuilder(logger=self.logger, expansion_table=expansion_table, group_index=group_index),
+                                self._write('base.csv', [GROUP_5, GROUP_6, GROUP_100006]), 'base.dic')
+        builder = IncrementalDictionaryBuilder(base_path, logger=self.logger, expansion_table=expansion_table,
+                                               processes=processes, removed_group_ids=[5], group_index=group_index)
+        updated_path = self._build(builder, self._write('changes.csv', [GROUP_7, GROUP_6_CHANGED]), 'updated.dic')
+        full_path = self._build(DictionaryBuilder(logger=self.logger, expansion_table=expansion_table, group_index=group_index),
+                                self._write('full.csv', [GROUP_6_CHANGED, GROUP_100006, GROUP_7]), 'full.dic')
+
+        words = ['閉店', 'クローズ', 'close', '開店', '始業', 'オープン', 'open', '開放', '開け放す', '公然', 'nothing']
+        self.assertListEqual(self._find_all(updated_path, words), self._find_all(full_path, words))
+        self.assertListEqual(self._find_all(updated_path, ['開店'])[0], ['始業', 'open'])
+        with open(updated_path, 'rb') as f1, open(full_path, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+
+    def test_same_as_full_build(self):
+        self._assert_same_as_full_build(False)
+
+    def test_same_as_full_build_with_expansion_table(self):
+        self._assert_same_as_full_build(True)
+
+    def test_same_as_full_build_with_group_index(self):
+        self._assert_same_as_full_build(False, group_index=True)
+
+    def test_same_as_full_build_in_parallel(self):
+        self._assert_same_as_full_build(False, processes=2)
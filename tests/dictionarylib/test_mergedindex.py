@@ -0,0 +1,96 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import TestCase
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.mergedindex import MergedIndex
+
+
+class TestMergedIndex(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+        self.system_dict = Dictionary(os.path.join(dict_dir, 'system.dic'), False)
+        self.user_dict = Dictionary(os.path.join(dict_dir, 'user.dic'), True)
+        self.user2_dict = Dictionary(os.path.join(dict_dir, 'user2.dic'), True)
+        self.words = set()
+        for dictionary in (self.system_dict, self.user_dict, self.user2_dict):
+            self.words.update(dictionary.group_list.iter_head_words())
+        self.words.add("nothing")
+
+    def tearDown(self):
+        self.system_dict.close()
+        self.user_dict.close()
+        self.user2_dict.close()
+
+    def test_iter_head_words(self):
+        words = list(self.system_dict.group_list.iter_head_words())
+        expected = []
+        for i in range(self.system_dict.group_list.size):
+            group_id = self.system_dict.group_list.offset_table.group_id_at(i)
+            group = self.system_dict.get_synonym_group(group_id)
+            expected.extend(s.head_word for s in group.get_synonyms())
+        self.assertListEqual(words, expected)
+        self.assertIn("開店", words)
+
+    def test_lookup(self):
+        index = MergedIndex([self.user2_dict, self.user_dict])
+        self.assertEqual(index.lookup("open"), (0, self.user2_dict.lookup_index("open")))
+        self.assertEqual(index.lookup("開放"), (1, self.user_dict.lookup_index("開放")))
+        self.assertEqual(index.lookup("nothing"), (-1, -1))
+        self.assertEqual(index.group_id_position, -1)
+
+    def test_lookup_trie_only(self):
+        index = MergedIndex([self.system_dict, self.user_dict])
+        self.assertEqual(index.group_id_position, 0)
+        self.assertEqual(index.lookup("開店")[0], 0)
+        self.assertEqual(index.lookup("開店", trie_only=True)[0], -1)
+        self.assertEqual(index.lookup("open", trie_only=True), (1, self.user_dict.lookup_index("open")))
+
+    def assert_same_results(self, dictionaries, group_ids_list):
+        chikkar = Chikkar()
+        merged = Chikkar()
+        for dictionary in dictionaries:
+            chikkar.add_dictionary(dictionary)
+            merged.add_dictionary(dictionary)
+        merged.build_merged_index()
+        for verb in (False, True):
+            if verb:
+                chikkar.enable_verb()
+                merged.enable_verb()
+            for word in sorted(self.words):
+                for group_ids in group_ids_list:
+                    try:
+                        expected = chikkar.find(word, group_ids)
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            merged.find(word, group_ids)
+                        continue
+                    self.assertListEqual(merged.find(word, group_ids), expected, (word, group_ids))
+
+    def test_find_with_user_dicts(self):
+        self.assert_same_results([self.system_dict, self.user_dict, self.user2_dict], [None, [], [6], [0]])
+
+    def test_find_with_trie_dicts(self):
+        self.assert_same_results([self.user_dict, self.user2_dict], [None, [6]])
+
+    def test_add_dictionary_drops_merged_index(self):
+        chikkar = Chikkar()
+        chikkar.add_dictionary(self.system_dict)
+        chikkar.build_merged_index()
+        chikkar.add_dictionary(self.user_dict)
+        self.assertCountEqual(chikkar.find("open"), ["開放", "オープン"])
@@ -0,0 +1,64 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from io import BytesIO
+from logging import NullHandler, getLogger
+from unittest import TestCase
+
+from chikkarpy.dictionarylib.dictionarybuilder import DictionaryBuilder
+from chikkarpy.dictionarylib.streamingdictionarybuilder import StreamingDictionaryBuilder
+
+
+class TestStreamingDictionaryBuilder(TestCase):
+
+    def setUp(self):
+        self.resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources')
+        self.logger = getLogger('chikkarpy.tests')
+        self.logger.addHandler(NullHandler())
+        self.logger.propagate = False
+
+    def _build(self, builder, input_path):
+        output = BytesIO()
+        builder.build(input_path, output)
+        return output.getvalue()
+
+    def test_same_output(self):
+        for name in ('system', 'user', 'user2'):
+            input_path = os.path.join(self.resource_dir, '{}.csv'.format(name))
+            expected = self._build(DictionaryBuilder(logger=self.logger), input_path)
+            for spill_size in (1, 3, 1000):
+                builder = StreamingDictionaryBuilder(logger=self.logger, spill_size=spill_size)
+                self.assertEqual(self._build(builder, input_path), expected, (name, spill_size))
+
+    def test_same_output_with_duplicated_headwords(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            input_path = os.path.join(work_dir, 'input.csv')
+            with open(input_path, 'w', encoding='utf-8') as wf:
+                for group_id, words in ((3, ['b', 'a', 'c']), (1, ['a', 'b']), (2, ['c', 'a', 'a'])):
+                    for word in words:
+                        wf.write('{:06d},1,0,1,0,0,0,(),{},,\n'.format(group_id, word))
+                    wf.write('\n')
+            expected = self._build(DictionaryBuilder(logger=self.logger), input_path)
+            for spill_size in (1, 2, 100):
+                builder = StreamingDictionaryBuilder(logger=self.logger, spill_size=spill_size, temp_dir=work_dir)
+                self.assertEqual(self._build(builder, input_path), expected)
+            self.assertListEqual(os.listdir(work_dir), ['input.csv'])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            StreamingDictionaryBuilder(expansion_table=True)
+        with self.assertRaises(ValueError):
+            StreamingDictionaryBuilder(spill_size=0)
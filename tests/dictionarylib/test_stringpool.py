@@ -0,0 +1,106 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from logging import getLogger
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib.dictionaryheader import DictionaryHeader
+from chikkarpy.dictionarylib.dictionaryversion import SYSTEM_DICT_VERSION_3
+from chikkarpy.dictionarylib.incrementaldictionarybuilder import IncrementalDictionaryBuilder
+from chikkarpy.dictionarylib.streamingdictionarybuilder import StreamingDictionaryBuilder
+from chikkarpy.dictionarylib.stringpool import MAX_STRING_SIZE, StringPool, StringPoolBuilder
+
+from .builtdictionaries import BuiltDictionaryTestCase
+
+
+class TestStringPool(BuiltDictionaryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = getLogger('chikkarpy.tests.builder')
+        self.logger.propagate = False
+
+    def test_builder(self):
+        builder = StringPoolBuilder()
+        long_string = 'あ' * 100
+        texts = ['', 'open', long_string, 'open', '', '開店', 'a' * 64, '(医療)']
+        refs = [builder.add(text) for text in texts]
+        self.assertListEqual(refs[:6], [0, 1, 6, 1, 0, 208])
+        self.assertEqual(len(builder), 6)
+        pool = StringPool(bytes(builder.buffer), 0)
+        self.assertTupleEqual(pool.read(1), ('open', 6))
+        self.assertTupleEqual(pool.read(6), (long_string, 208))
+        self.assertTupleEqual(pool.read(0), ('', 1))
+        # kanji and kana are stored in UTF-16, which is shorter than UTF-8
+        self.assertTupleEqual(pool.read(208), ('開店', 213))
+        for text, ref in zip(texts, refs):
+            self.assertEqual(pool.read(ref)[0], text)
+        with self.assertRaises(ValueError):
+            builder.add('a' * (MAX_STRING_SIZE + 1))
+
+    def test_version(self):
+        dictionary = self._open(self._build('system', string_pool=True))
+        self.assertEqual(dictionary.dict_.header.version, SYSTEM_DICT_VERSION_3)
+        self.assertIsNotNone(dictionary.group_list.string_pool)
+
+    def test_synonym_groups(self):
+        expected = self._open(self._resource('system'))
+        actual = self._open(self._build('system', string_pool=True))
+        offset_table = expected.group_list.offset_table
+        for i in range(len(offset_table)):
+            group_id = offset_table.group_id_at(i)
+            expected_group = expected.get_synonym_group(group_id)
+            actual_group = actual.get_synonym_group(group_id)
+            self.assertEqual(len(actual_group.get_synonyms()), len(expected_group.get_synonyms()))
+            for s1, s2 in zip(actual_group.get_synonyms(), expected_group.get_synonyms()):
+                self.assertEqual(s1.head_word, s2.head_word)
+                self.assertListEqual(list(s1.lexeme_ids), list(s2.lexeme_ids))
+                self.assertEqual(s1.category, s2.category)
+                self.assertEqual(s1.flags, s2.flags)
+        self.assertListEqual(list(actual.group_list.iter_head_words()), list(expected.group_list.iter_head_words()))
+
+    def test_builders(self):
+        input_path = os.path.join(self.resource_dir, 'system.csv')
+        with open(self._build('system', string_pool=True), 'rb') as f:
+            expected = f.read()
+
+        path = os.path.join(self.work_dir.name, 'streaming.dic')
+        builder = StreamingDictionaryBuilder(logger=self.logger, string_pool=True, spill_size=3)
+        with open(path, 'wb') as wf:
+            wf.write(expected[:DictionaryHeader(0, 0, '').storage_size()])
+            builder.build(input_path, wf)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+        # updates without changes, from version 1 and version 3
+        empty = os.path.join(self.work_dir.name, 'empty.csv')
+        open(empty, 'w').close()
+        for base_path in (self._resource('system'), self._build('system', string_pool=True)):
+            builder = IncrementalDictionaryBuilder(base_path, logger=self.logger, string_pool=True)
+            with open(path, 'wb') as wf:
+                wf.write(expected[:DictionaryHeader(0, 0, '').storage_size()])
+                builder.build(empty, wf)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), expected, base_path)
+
+        # back to version 1
+        builder = IncrementalDictionaryBuilder(self._build('system', string_pool=True), logger=self.logger)
+        with open(path, 'wb') as wf:
+            wf.write(DictionaryHeader(builder.version, 0, '').to_byte())
+            builder.build(empty, wf)
+        self.assertEqual(self._open(path).dict_.header.version, builder.version)
+        chikkar = Chikkar()
+        chikkar.add_dictionary(self._open(path))
+        self.assertListEqual(chikkar.find('開店'), ['始業', '営業開始', '店開き', 'オープン', 'open'])
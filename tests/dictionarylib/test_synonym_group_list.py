@@ -0,0 +1,86 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import threading
+from unittest import TestCase
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.binarydictionary import BinaryDictionary
+from chikkarpy.dictionarylib.synonym_group_list import SynonymGroupList
+
+
+class TestSynonymGroupList(TestCase):
+
+    def setUp(self):
+        self.dic_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources', 'system.dic')
+        self.dict_ = BinaryDictionary.from_system_dictionary(self.dic_file)
+        self.group_list = SynonymGroupList(self.dict_.bytes_, self.dict_.offset)
+
+    def tearDown(self):
+        self.dict_.close()
+
+    def test_get_synonym_group(self):
+        group = self.group_list.get_synonym_group(5)
+        self.assertEqual(group.get_id(), 5)
+        self.assertListEqual([s.head_word for s in group.get_synonyms()], ["閉店", "クローズ", "close", "店仕舞い"])
+        synonym = group.lookup("close")
+        self.assertListEqual(synonym.lexeme_ids.tolist(), [2])
+        self.assertTrue(synonym.has_ambiguity)
+        self.assertTrue(synonym.is_noun)
+        self.assertEqual(synonym.variant_type, 1)
+        self.assertEqual(synonym.category, "()")
+        self.assertIsNone(self.group_list.get_synonym_group(200))
+
+    def test_file_position_is_not_used(self):
+        self.dict_.bytes_.seek(3)
+        self.assertEqual(self.group_list.get_synonym_group(6).get_id(), 6)
+        self.assertEqual(self.dict_.bytes_.tell(), 3)
+
+    def test_concurrent_lookups(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            self._run_concurrent_lookups()
+        finally:
+            sys.setswitchinterval(interval)
+
+    def _run_concurrent_lookups(self):
+        for cache_size in (0, 1):
+            dictionary = Dictionary(self.dic_file, True, cache_size=cache_size)
+            chikkar = Chikkar()
+            chikkar.enable_verb()
+            chikkar.add_dictionary(dictionary)
+            words = ["開店", "閉店", "open", "オープン", "公然", "close", "nothing"]
+            expected = {word: chikkar.find(word) for word in words}
+            errors = []
+
+            def run():
+                try:
+                    for _ in range(300):
+                        for word in words:
+                            if chikkar.find(word) != expected[word]:
+                                errors.append(word)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=run) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            dictionary.close()
+            self.assertListEqual(errors, [])
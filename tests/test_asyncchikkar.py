@@ -0,0 +1,142 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from chikkarpy import AsyncChikkar, Chikkar
+from chikkarpy.dictionarylib import Dictionary
+
+
+class TestAsyncChikkar(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+        self.system_dict = Dictionary(os.path.join(dict_dir, 'system.dic'), False)
+        self.user_dict = Dictionary(os.path.join(dict_dir, 'user.dic'), True)
+
+        self.chikkar = Chikkar()
+        self.chikkar.add_dictionary(self.system_dict)
+        self.chikkar.add_dictionary(self.user_dict)
+        self.calls = []
+        find_many = self.chikkar.find_many
+
+        def counting_find_many(words, group_ids=None):
+            self.calls.append(list(words))
+            return find_many(words, group_ids)
+
+        self.chikkar.find_many = counting_find_many
+        self.executor = ThreadPoolExecutor(1)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.executor.shutdown()
+        self.system_dict.close()
+        self.user_dict.close()
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_find(self):
+        words = ["開店", "閉店", "nothing", "開店", "オープン"]
+        expected = [self.chikkar.find(word) for word in words]
+        self.calls.clear()
+
+        async def run():
+            async with AsyncChikkar(self.chikkar, executor=self.executor) as async_chikkar:
+                return await asyncio.gather(*[async_chikkar.find(word) for word in words])
+
+        self.assertListEqual(self._run(run()), expected)
+        self.assertListEqual(self.calls, [words])
+
+    def test_find_with_group_ids(self):
+        async def run():
+            async with AsyncChikkar(self.chikkar, executor=self.executor) as async_chikkar:
+                return await async_chikkar.find_many(["開店", "開店"], group_ids=[[6], None])
+
+        self.assertListEqual(self._run(run()), [self.chikkar.find("開店", group_ids=[6]), self.chikkar.find("開店")])
+
+    def test_max_batch_size(self):
+        words = ["開店"] * 10
+
+        async def run():
+            async with AsyncChikkar(self.chikkar, window=60, max_batch_size=4, executor=self.executor) as async_chikkar:
+                results = asyncio.ensure_future(async_chikkar.find_many(words))
+                await asyncio.sleep(0.01)
+                # the last two requests wait for the window
+                self.assertEqual(len(self.calls), 2)
+                async_chikkar.flush()
+                return await results
+
+        results = self._run(run())
+        self.assertEqual(len(results), 10)
+        self.assertListEqual([len(batch) for batch in self.calls], [4, 4, 2])
+
+    def test_back_pressure(self):
+        release = threading.Event()
+        find_many = self.chikkar.find_many
+
+        def blocking_find_many(words, group_ids=None):
+            result = find_many(words, group_ids)
+            release.wait()
+            return result
+
+        self.chikkar.find_many = blocking_find_many
+
+        async def run():
+            async_chikkar = AsyncChikkar(self.chikkar, window=0, max_pending=3, executor=self.executor)
+            tasks = [asyncio.ensure_future(async_chikkar.find("開店")) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            queued = sum(len(batch) for batch in self.calls)
+            release.set()
+            await asyncio.gather(*tasks)
+            await async_chikkar.close()
+            return queued
+
+        self.assertEqual(self._run(run()), 3)
+        self.assertEqual(sum(len(batch) for batch in self.calls), 5)
+
+    def test_error(self):
+        async def run():
+            async with AsyncChikkar(self.chikkar, executor=self.executor) as async_chikkar:
+                return await asyncio.gather(async_chikkar.find("開店"), async_chikkar.find("nothing", group_ids=[6]),
+                                            async_chikkar.find("閉店"), async_chikkar.find("開店", group_ids=[6]),
+                                            return_exceptions=True)
+
+        results = self._run(run())
+        # the batch falls back to looking up the requests one by one
+        self.assertEqual(len(self.calls), 1)
+        self.assertListEqual(results[0], self.chikkar.find("開店"))
+        self.assertIsInstance(results[1], ValueError)
+        self.assertListEqual(results[2], self.chikkar.find("閉店"))
+        self.assertListEqual(results[3], self.chikkar.find("開店", group_ids=[6]))
+
+    def test_cancel(self):
+        async def run():
+            async with AsyncChikkar(self.chikkar, window=0.01, executor=self.executor) as async_chikkar:
+                cancelled = asyncio.ensure_future(async_chikkar.find("開店"))
+                task = asyncio.ensure_future(async_chikkar.find("閉店"))
+                await asyncio.sleep(0)
+                cancelled.cancel()
+                return await task
+
+        self.assertListEqual(self._run(run()), self.chikkar.find("閉店"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncChikkar(self.chikkar, max_batch_size=0)
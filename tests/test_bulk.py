@@ -0,0 +1,117 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import TestCase, skipIf
+
+from chikkarpy import Chikkar
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.groupoffsettable import PRESUMED_DENSE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from chikkarpy.bulk import BulkExpander
+
+
+@skipIf(np is None, 'NumPy is not installed')
+class TestBulkExpander(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+        self.system_dict = Dictionary(os.path.join(dict_dir, 'system.dic'), False)
+        self.user_dict = Dictionary(os.path.join(dict_dir, 'user.dic'), False)
+
+    def tearDown(self):
+        self.system_dict.close()
+        self.user_dict.close()
+
+    def _words(self, expander, offsets, ids):
+        return [[expander.vocabulary[i] for i in ids[offsets[k]:offsets[k + 1]]] for k in range(len(offsets) - 1)]
+
+    def _assert_same_as_find(self, dictionary, tokens, can_search_verb):
+        chikkar = Chikkar()
+        chikkar.add_dictionary(dictionary)
+        if can_search_verb:
+            chikkar.enable_verb()
+        expander = BulkExpander(dictionary, can_search_verb=can_search_verb)
+        words = [word for word, _ in tokens]
+        group_ids = np.array([gid for _, gids in tokens for gid in gids], dtype=np.int32)
+        offsets = np.cumsum([0] + [len(gids) for _, gids in tokens])
+        result_offsets, ids = expander.expand(group_ids, offsets, expander.word_ids(words))
+        self.assertEqual(result_offsets.dtype, np.int64)
+        self.assertEqual(ids.dtype, np.int32)
+        self.assertListEqual(self._words(expander, result_offsets, ids),
+                             [chikkar.find(word, group_ids=gids) for word, gids in tokens])
+
+    def test_expand(self):
+        tokens = [("開店", [6]), ("閉店", [5]), ("オープン", [6, 100006]), ("公然", [100006]), ("開店", [6, 7]),
+                  ("クローズ", [5]), ("nothing", []), ("開店", [6])]
+        self._assert_same_as_find(self.system_dict, tokens, False)
+
+    def test_expand_verb(self):
+        tokens = [("開放", [1000001]), ("開く", [1000001]), ("open", [1000001])]
+        self._assert_same_as_find(self.user_dict, tokens, False)
+        self._assert_same_as_find(self.user_dict, tokens, True)
+
+    def test_expand_without_words(self):
+        expander = BulkExpander(self.system_dict)
+        offsets, ids = expander.expand(np.array([5, 4, 100006]))
+        self.assertListEqual(offsets.tolist(), [0, 4, 4, 7])
+        self.assertListEqual(self._words(expander, offsets, ids),
+                             [["閉店", "クローズ", "close", "店仕舞い"], [], ["公然", "オープン", "open"]])
+        # the vocabulary is shared between calls
+        offsets, ids = expander.expand(np.array([100006, 6]))
+        self.assertEqual(expander.vocabulary[ids[0]], "公然")
+        self.assertEqual(len(expander.vocabulary), len(set(expander.vocabulary)))
+
+    def test_positions(self):
+        expander = BulkExpander(self.system_dict)
+        self.assertListEqual(expander.positions(np.array([6, 5, 7, 100006, -1])).tolist(), [1, 0, -1, 2, -1])
+        expander = BulkExpander(self.user_dict)
+        self.assertListEqual(expander.positions(np.array([1000001, 1000002])).tolist(), [0, -1])
+
+    def test_layouts(self):
+        # the table of the dictionary presumes itself dense, while the expander checks all the IDs
+        self.assertEqual(self.user_dict.group_list.offset_table._inspect(), PRESUMED_DENSE)
+        expander = BulkExpander(self.user_dict)
+        self.assertListEqual(expander.positions(np.array([1000001, 1000002])).tolist(), [0, -1])
+        self.assertNotEqual(expander._layout, PRESUMED_DENSE)
+        # a layout which the expander does not handle must not be decoded as another one
+        expander._layout = PRESUMED_DENSE
+        with self.assertRaises(ValueError):
+            expander.positions(np.array([1000001]))
+
+    def test_word_not_in_group(self):
+        expander = BulkExpander(self.system_dict)
+        with self.assertRaises(ValueError):
+            expander.expand(np.array([5, 6]), word_ids=expander.word_ids(["閉店", "閉店"]))
+
+    def test_invalid_arguments(self):
+        expander = BulkExpander(self.system_dict)
+        with self.assertRaises(ValueError):
+            expander.expand(np.array([5, 6]), offsets=np.array([0, 1]))
+        with self.assertRaises(ValueError):
+            expander.expand(np.array([5, 6]), offsets=np.array([0, 2, 1, 2]))
+        with self.assertRaises(ValueError):
+            expander.expand(np.array([5, 6]), word_ids=np.array([0]))
+
+    def test_close_dictionary_after_expand(self):
+        dictionary = Dictionary(self.system_dict.filename)
+        expander = BulkExpander(dictionary)
+        expander.expand(np.array([5]))
+        dictionary.close()
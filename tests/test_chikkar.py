@@ -13,10 +13,18 @@
 # limitations under the License.
 
 import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
 from unittest import TestCase
 
 from chikkarpy import Chikkar
+from chikkarpy.chikkar import ALL_MATCHES, LONGEST_MATCH
+from chikkarpy.command_line import build_dictionary
 from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.dictionarylib.dictionary import DEFAULT_CACHE_SIZE
 
 
 class TestChikkar(TestCase):
@@ -24,7 +32,7 @@ class TestChikkar(TestCase):
     def setUp(self):
         dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
 
-        self.system_dict = Dictionary(os.path.join(dict_dir, 'system.dic'), False)
+        self.system_dict = Dictionary(os.path.join(dict_dir, 'system.dic'), False, cache_size=DEFAULT_CACHE_SIZE)
         self.user_dict = Dictionary(os.path.join(dict_dir, 'user.dic'), True)
         self.user2_dict = Dictionary(os.path.join(dict_dir, 'user2.dic'), True)
 
@@ -62,3 +70,298 @@ class TestChikkar(TestCase):
         self.chikkar.add_dictionary(self.user_dict)
         self.chikkar.enable_verb()
         self.assertCountEqual(self.chikkar.find("open"), ["開放", "開け放す", "開く", "オープン"])
+
+    def test_find_many(self):
+        self.chikkar.add_dictionary(self.user_dict)
+        words = ["開店", "open", "nothing", "開店", "閉店", "open"]
+        results = self.chikkar.find_many(words)
+        self.assertEqual(len(results), len(words))
+        for word, result in zip(words, results):
+            self.assertListEqual(result, self.chikkar.find(word))
+        self.assertIsNot(results[0], results[3])
+
+    def test_find_many_with_group_ids(self):
+        words = ["開店", "オープン", "nothing", "開店"]
+        group_ids = [[6], [6], [0], None]
+        results = self.chikkar.find_many(words, group_ids=group_ids)
+        for word, gids, result in zip(words, group_ids, results):
+            self.assertListEqual(result, self.chikkar.find(word, group_ids=gids))
+        with self.assertRaises(ValueError):
+            self.chikkar.find_many(["nothing"], group_ids=[[6]])
+
+    def test_find_bytes(self):
+        self.chikkar.add_dictionary(self.user_dict)
+        words = ["開店", "open", "nothing", "閉店", "開放"]
+        for enable_verb in (False, True):
+            if enable_verb:
+                self.chikkar.enable_verb()
+            for word in words + words:
+                self.assertListEqual(self.chikkar.find_bytes(word.encode("utf-8")), self.chikkar.find(word), word)
+        self.assertListEqual(self.chikkar.find_bytes(memoryview("開店".encode("utf-8"))), self.chikkar.find("開店"))
+        self.assertListEqual(self.chikkar.find_bytes("開店".encode("utf-8"), group_ids=[6]),
+                             self.chikkar.find("開店", group_ids=[6]))
+        with self.assertRaises(ValueError):
+            self.chikkar.find_bytes(b"nothing", group_ids=[6])
+
+        info = self.chikkar.result_cache_info()
+        self.assertEqual(info.size, 2 * len(words) + 1)
+        self.assertEqual(info.hits, 2 * len(words) + 1)
+
+        result = self.chikkar.find_bytes("開店".encode("utf-8"))
+        result.append("changed")
+        self.assertNotIn("changed", self.chikkar.find_bytes("開店".encode("utf-8")))
+
+    def test_find_bytes_cache(self):
+        chikkar = Chikkar(result_cache_size=2)
+        chikkar.add_dictionary(self.system_dict)
+        for word in ["開店", "閉店", "公然", "開店"]:
+            chikkar.find_bytes(word.encode("utf-8"))
+        info = chikkar.result_cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.size, info.maxsize), (0, 4, 2, 2, 2))
+
+        chikkar.build_merged_index()
+        chikkar.find_bytes("開店".encode("utf-8"))
+        self.assertEqual(chikkar.result_cache_info().hits, 1)
+
+        # the results of the previous dictionaries are discarded
+        chikkar.add_dictionary(self.user2_dict)
+        self.assertEqual(chikkar.result_cache_info().size, 0)
+        self.assertListEqual(chikkar.find_bytes("開店".encode("utf-8")), chikkar.find("開店"))
+
+        disabled = Chikkar(result_cache_size=0)
+        disabled.add_dictionary(self.system_dict)
+        self.assertListEqual(disabled.find_bytes("開店".encode("utf-8")), self.chikkar.find("開店"))
+        self.assertEqual(disabled.result_cache_info().size, 0)
+
+    def test_stats(self):
+        self.assertIsNone(self.chikkar.stats_snapshot())
+        self.chikkar.enable_stats()
+        self.chikkar.find("開店")
+        self.chikkar.find("開店")
+        self.chikkar.find("nothing")
+        self.chikkar.add_dictionary(self.user_dict)
+        self.chikkar.find("開店")
+
+        snapshot = self.chikkar.stats_snapshot()
+        self.assertEqual(snapshot["finds"], 4)
+        self.assertGreater(snapshot["find_seconds"], 0)
+        self.assertGreater(snapshot["filter_seconds"], 0)
+        self.assertEqual(snapshot["merged_index_probes"], 0)
+        user, system = snapshot["dictionaries"]
+        self.assertEqual(user["filename"], self.user_dict.filename)
+        self.assertEqual((user["trie_probes"], user["trie_hits"], user["trie_misses"]), (1, 0, 1))
+        self.assertEqual((system["trie_probes"], system["trie_hits"], system["trie_misses"]), (4, 3, 1))
+        self.assertEqual(system["groups_decoded"], 1)
+        self.assertGreater(system["bytes_read"], 0)
+        self.assertEqual((system["group_cache_hits"], system["group_cache_misses"]), (2, 1))
+
+        self.chikkar.build_merged_index()
+        self.chikkar.find("開店")
+        self.chikkar.find("nothing")
+        snapshot = self.chikkar.stats_snapshot()
+        self.assertEqual((snapshot["merged_index_probes"], snapshot["merged_index_hits"]), (2, 1))
+
+        self.chikkar.disable_stats()
+        self.assertIsNone(self.chikkar.stats_snapshot())
+        self.assertIsNone(self.system_dict.stats)
+        self.assertIsNone(self.system_dict.group_list.stats)
+
+    def test_stats_of_decoded_bytes(self):
+        dictionary = Dictionary(self.system_dict.filename, cache_size=0)
+        try:
+            dictionary.enable_stats()
+            group_list = dictionary.group_list
+            offset = group_list.offset_table.get(6)
+            _, end = group_list.read_head_words(offset)
+            dictionary.get_synonym_group(6)
+            dictionary.get_synonym_group(6)
+            self.assertIsNone(dictionary.get_synonym_group(0))
+            snapshot = dictionary.stats_snapshot()
+            self.assertEqual(snapshot["groups_decoded"], 2)
+            self.assertEqual(snapshot["bytes_read"], 2 * (end - offset))
+            self.assertEqual(snapshot["group_cache_hits"], 0)
+        finally:
+            dictionary.close()
+
+    def test_scan(self):
+        text = "明日開店して閉店"
+        self.assertListEqual(list(self.chikkar.scan(text)), [
+            (2, 4, ["始業", "営業開始", "店開き", "オープン", "open"]),
+            (6, 8, ["クローズ", "close", "店仕舞い"]),
+        ])
+        data = text.encode("utf-8")
+        spans = list(self.chikkar.scan(data))
+        self.assertListEqual([data[start:end].decode("utf-8") for start, end, _ in spans], ["開店", "閉店"])
+        # ambiguous headwords are not triggers
+        self.assertListEqual(list(self.chikkar.scan("オープンopen")), [])
+        with self.assertRaises(ValueError):
+            list(self.chikkar.scan(text, policy="shortest"))
+
+    def test_scan_with_user_dict(self):
+        self.chikkar.add_dictionary(self.user_dict)
+        self.assertListEqual(list(self.chikkar.scan("open開店")), [
+            (0, 4, ["開放", "オープン"]),
+            (4, 6, ["始業", "営業開始", "店開き", "オープン", "open"]),
+        ])
+
+
+class TestChikkarScan(TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        csv_path = os.path.join(self.work_dir.name, "scan.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("1,1,0,1,0,0,0,(),東京,,\n1,1,0,2,0,0,0,(),トウキョウ,,\n\n"
+                    "2,1,0,1,0,0,0,(),東京都,,\n2,1,0,2,0,0,0,(),都,,\n\n"
+                    "3,1,0,1,0,0,0,(),京都,,\n3,1,0,2,0,0,0,(),キョウト,,\n\n"
+                    "4,1,0,1,0,0,0,(),{},,\n4,1,0,2,0,0,0,(),長,,\n".format("ア" * 30))
+        dic_path = os.path.join(self.work_dir.name, "scan.dic")
+        build_dictionary(csv_path, dic_path, "")
+        self.dictionary = Dictionary(dic_path, True)
+        self.chikkar = Chikkar()
+        self.chikkar.add_dictionary(self.dictionary)
+
+    def tearDown(self):
+        self.dictionary.close()
+        self.work_dir.cleanup()
+
+    def test_longest_match(self):
+        self.assertListEqual(list(self.chikkar.scan("東京都へ", policy=LONGEST_MATCH)), [
+            (0, 3, ["都"]),
+        ])
+
+    def test_all_matches(self):
+        self.assertListEqual(list(self.chikkar.scan("東京都へ", policy=ALL_MATCHES)), [
+            (0, 2, ["トウキョウ"]),
+            (0, 3, ["都"]),
+            (1, 3, ["キョウト"]),
+            (2, 3, ["東京都"]),
+        ])
+
+    def test_key_longer_than_window(self):
+        text = "ア" * 31
+        self.assertListEqual(list(self.chikkar.scan(text)), [(0, 30, ["長"])])
+        self.assertListEqual(list(self.chikkar.scan(text.encode("utf-8"))), [(0, 90, ["長"])])
+
+
+class TestChikkarReload(TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.dic_a = self._build("a", "1,1,0,1,0,0,0,(),開店,,\n1,1,0,2,0,0,0,(),オープン,,\n")
+        self.dic_b = self._build("b", "1,1,0,1,0,0,0,(),開店,,\n1,1,0,2,0,0,0,(),店開き,,\n")
+        self.path = os.path.join(self.work_dir.name, "system.dic")
+        shutil.copyfile(self.dic_a, self.path)
+        self.dictionary = Dictionary(self.path, True, cache_size=16)
+        self.chikkar = Chikkar()
+        self.chikkar.add_dictionary(self.dictionary)
+
+    def tearDown(self):
+        for dictionary in self.chikkar._dictionaries:
+            dictionary.close()
+        self.work_dir.cleanup()
+
+    def _build(self, name, csv):
+        csv_path = os.path.join(self.work_dir.name, "{}.csv".format(name))
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(csv)
+        dic_path = os.path.join(self.work_dir.name, "{}.dic".format(name))
+        build_dictionary(csv_path, dic_path, "")
+        return dic_path
+
+    def test_reload(self):
+        self.assertListEqual(self.chikkar.find("開店"), ["オープン"])
+        new_dictionary = self.chikkar.reload(self.dictionary, self.dic_b)
+        self.assertListEqual(self.chikkar.find("開店"), ["店開き"])
+        self.assertTrue(new_dictionary.enable_trie)
+        self.assertEqual(new_dictionary.cache_size, 16)
+        self.assertTrue(self.dictionary.dict_.bytes_.closed)
+        with self.assertRaises(ValueError):
+            self.chikkar.reload(self.dictionary)
+
+    def test_reload_discards_results(self):
+        self.assertListEqual(self.chikkar.find_bytes("開店".encode("utf-8")), ["オープン"])
+        self.chikkar.reload(self.dictionary, self.dic_b)
+        self.assertListEqual(self.chikkar.find_bytes("開店".encode("utf-8")), ["店開き"])
+
+    def test_reload_continues_stats(self):
+        self.chikkar.enable_stats()
+        self.chikkar.find("開店")
+        new_dictionary = self.chikkar.reload(self.dictionary, self.dic_b)
+        self.chikkar.find("開店")
+        self.assertIs(new_dictionary.stats, self.dictionary.stats)
+        self.assertEqual(self.chikkar.stats_snapshot()["dictionaries"][0]["trie_probes"], 2)
+
+    def test_reload_with_merged_index(self):
+        self.chikkar.build_merged_index()
+        self.chikkar.reload(self.dictionary, self.dic_b)
+        self.assertIsNotNone(self.chikkar._merged_index)
+        self.assertListEqual(self.chikkar.find("開店"), ["店開き"])
+
+    def test_old_dictionary_is_closed_after_lookups(self):
+        spans = self.chikkar.scan("開店")
+        self.assertEqual(next(spans), (0, 2, ["オープン"]))
+        self.chikkar.reload(self.dictionary, self.dic_b)
+        self.assertFalse(self.dictionary.dict_.bytes_.closed)
+        self.assertListEqual(self.chikkar.find("開店"), ["店開き"])
+        spans.close()
+        self.assertTrue(self.dictionary.dict_.bytes_.closed)
+
+    def test_reload_broken_dictionary(self):
+        broken = os.path.join(self.work_dir.name, "broken.dic")
+        with open(self.dic_b, "rb") as rf, open(broken, "wb") as wf:
+            data = rf.read()
+            wf.write(data[:-4])
+        with self.assertRaises(ValueError):
+            self.chikkar.reload(self.dictionary, broken)
+        self.assertListEqual(self.chikkar.find("開店"), ["オープン"])
+        self.assertFalse(self.dictionary.dict_.bytes_.closed)
+
+    def test_lookups_during_reloads(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        errors = []
+        stopped = threading.Event()
+
+        def run():
+            try:
+                while not stopped.is_set():
+                    if self.chikkar.find("開店") not in (["オープン"], ["店開き"]):
+                        errors.append("unexpected result")
+                    self.chikkar.find_many(["開店", "nothing"])
+                    list(self.chikkar.scan("開店"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        try:
+            for thread in threads:
+                thread.start()
+            dictionary = self.dictionary
+            old_dictionaries = []
+            for i in range(50):
+                old_dictionaries.append(dictionary)
+                dictionary = self.chikkar.reload(dictionary, self.dic_b if i % 2 == 0 else self.dic_a)
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+            sys.setswitchinterval(interval)
+        self.assertListEqual(errors, [])
+        self.assertTrue(all(d.dict_.bytes_.closed for d in old_dictionaries))
+        self.assertListEqual(self.chikkar._dictionaries, [dictionary])
+
+    def test_watch(self):
+        watcher = self.chikkar.watch(self.dictionary, interval=0.01)
+        try:
+            replacement = os.path.join(self.work_dir.name, "replacement.dic")
+            shutil.copyfile(self.dic_b, replacement)
+            os.replace(replacement, self.path)
+            deadline = time.monotonic() + 10
+            while watcher.reloads == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual(watcher.reloads, 1)
+        self.assertListEqual(self.chikkar.find("開店"), ["店開き"])
+        self.assertIs(self.chikkar._dictionaries[0], watcher.dictionary)
@@ -0,0 +1,146 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from unittest import TestCase
+
+from chikkarpy import command_line
+from chikkarpy.command_line import build_dictionary, load_chikkar, read_group_ids, search_synonyms, search_synonyms_parallel, write_synonyms
+from chikkarpy.resultcache import PersistentResultCache
+
+
+class TestCommandLine(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+        self.system_csv = os.path.join(dict_dir, 'system.csv')
+        self.system_dic = os.path.join(dict_dir, 'system.dic')
+        self.user_dic = os.path.join(dict_dir, 'user.dic')
+
+        self.chikkar = None
+
+    def tearDown(self):
+        if self.chikkar is not None:
+            for dictionary in self.chikkar._dictionaries:
+                dictionary.close()
+
+    def test_write_synonyms(self):
+        self.chikkar = load_chikkar(False, [self.system_dic])
+        output = StringIO()
+        write_synonyms(self.chikkar, ["開店\n", "nothing\n", "閉店"], output)
+        lines = output.getvalue().split("\n")
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], "開店\t始業,営業開始,店開き,オープン,open")
+        self.assertEqual(lines[1], "nothing\t")
+        self.assertEqual(lines[2], "閉店\tクローズ,close,店仕舞い")
+        self.assertEqual(lines[3], "")
+
+    def test_search_synonyms(self):
+        logger = logging.getLogger("chikkarpy.tests.search")
+        logger.propagate = False
+        with self.assertLogs(logger, level="INFO") as logs:
+            search_synonyms(False, [self.system_dic], ["開店\n", "nothing\n"], logger)
+        self.assertListEqual([record.getMessage() for record in logs.records],
+                             ["開店\t始業,営業開始,店開き,オープン,open", "nothing\t"])
+
+    def test_load_chikkar(self):
+        self.chikkar = load_chikkar(True, [self.system_dic, self.user_dic])
+        self.assertEqual(len(self.chikkar._dictionaries), 2)
+        self.assertCountEqual(self.chikkar.find("open"), ["開放", "開け放す", "開く", "オープン"])
+
+    def test_search_synonyms_parallel(self):
+        lines = ["{}\n".format(word) for word in ["開店", "nothing", "閉店", "open", "公然"] * 7]
+        self.chikkar = load_chikkar(True, [self.system_dic, self.user_dic])
+        expected = StringIO()
+        write_synonyms(self.chikkar, lines, expected)
+        output = StringIO()
+        search_synonyms_parallel(True, [self.system_dic, self.user_dic], iter(lines), output, 2, chunk_size=3)
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_search_synonyms_parallel_with_missing_dictionary(self):
+        missing_dic = os.path.join(os.path.dirname(self.system_dic), 'missing.dic')
+        with self.assertRaises(FileNotFoundError):
+            search_synonyms_parallel(False, [missing_dic], iter(["開店\n"]), StringIO(), 2)
+        with tempfile.TemporaryDirectory() as work_dir:
+            input_file = os.path.join(work_dir, 'in.txt')
+            with open(input_file, 'w', encoding='utf-8') as wf:
+                wf.write('開店\n')
+            process = subprocess.run([sys.executable, '-m', 'chikkarpy.command_line', 'search', input_file,
+                                      '-j', '2', '-d', missing_dic],
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60,
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIn(b'FileNotFoundError', process.stderr)
+
+    def test_search_worker_error(self):
+        missing_dic = os.path.join(os.path.dirname(self.system_dic), 'missing.dic')
+        try:
+            command_line._init_search_worker(False, [missing_dic])
+            with self.assertRaises(FileNotFoundError):
+                command_line._search_chunk(["開店\n"])
+        finally:
+            command_line._worker_error = None
+
+    def test_search_synonyms_with_cache(self):
+        lines = ["{}\n".format(word) for word in ["開店", "nothing", "閉店", "open", "公然"] * 7]
+        self.chikkar = load_chikkar(True, [self.system_dic, self.user_dic])
+        expected = StringIO()
+        write_synonyms(self.chikkar, lines, expected)
+        with tempfile.TemporaryDirectory() as work_dir:
+            cache_path = os.path.join(work_dir, 'results.sqlite')
+            output = StringIO()
+            search_synonyms_parallel(True, [self.system_dic, self.user_dic], iter(lines), output, 2, chunk_size=3,
+                                     cache_path=cache_path)
+            self.assertEqual(output.getvalue(), expected.getvalue())
+            with PersistentResultCache(cache_path) as cache:
+                self.assertEqual(cache.info().size, 5)
+                output = StringIO()
+                write_synonyms(self.chikkar, lines, output, cache)
+                self.assertEqual(output.getvalue(), expected.getvalue())
+                self.assertEqual(cache.info().hits, 5)
+
+    def test_build_dictionary_with_base(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            changes = os.path.join(work_dir, 'changes.csv')
+            with open(changes, 'w', encoding='utf-8') as wf:
+                wf.write('000007,1,0,1,0,0,0,(),開放,,\n000007,1,0,2,0,0,0,(),開け放し,,\n')
+            removed = os.path.join(work_dir, 'removed.txt')
+            with open(removed, 'w', encoding='utf-8') as wf:
+                wf.write('5\n\n')
+            self.assertListEqual(read_group_ids(removed), [5])
+            updated = os.path.join(work_dir, 'updated.dic')
+            build_dictionary(changes, updated, '', base_file=self.system_dic, removed_group_ids=read_group_ids(removed))
+            with self.assertRaises(ValueError):
+                build_dictionary(changes, updated, '', streaming=True, base_file=self.system_dic)
+            with self.assertRaises(ValueError):
+                build_dictionary(changes, updated, '', removed_group_ids=[5])
+
+            process = subprocess.run([sys.executable, '-m', 'chikkarpy.command_line', 'build', '-i', changes,
+                                      '-o', updated, '-r', removed],
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60,
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            self.assertNotEqual(process.returncode, 0)
+            self.assertIn(b'-r can be used only with -b', process.stderr)
+
+            self.chikkar = load_chikkar(False, [updated])
+            self.assertListEqual(self.chikkar.find("開放"), ["開け放し"])
+            self.assertListEqual(self.chikkar.find("閉店"), [])
+            self.assertCountEqual(self.chikkar.find("開店"), ["始業", "営業開始", "店開き", "オープン", "open"])
+            self.tearDown()
+            self.chikkar = None
@@ -0,0 +1,42 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+from unittest import TestCase
+
+import chikkarpy
+
+
+class TestImport(TestCase):
+
+    def test_lookup_path_only(self):
+        # a fresh interpreter, as other tests have imported the modules already
+        code = ("import sys\n"
+                "from chikkarpy import Chikkar, Dictionary\n"
+                "print(' '.join(sorted(sys.modules)))\n")
+        modules = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').split()
+        self.assertIn('chikkarpy.chikkar', modules)
+        for module in ('asyncio', 'chikkarpy.asyncchikkar', 'chikkarpy.command_line', 'chikkarpy.config',
+                       'chikkarpy.dictionarylib.dictionarybuilder', 'chikkarpy.server', 'logging',
+                       'pkg_resources', 'sortedcontainers', 'typing', 'urllib.request'):
+            self.assertNotIn(module, modules)
+
+    def test_lazy_attributes(self):
+        from chikkarpy.asyncchikkar import AsyncChikkar
+        from chikkarpy.dictionarylib import Dictionary
+        self.assertIs(chikkarpy.AsyncChikkar, AsyncChikkar)
+        self.assertIs(chikkarpy.Dictionary, Dictionary)
+        with self.assertRaises(AttributeError):
+            chikkarpy.nothing
@@ -0,0 +1,62 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from chikkarpy.lrucache import LRUCache
+
+
+class TestLRUCache(TestCase):
+
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get(1))
+        cache.put(1, "a")
+        self.assertEqual(cache.get(1), "a")
+        self.assertEqual(cache.get(2, "default"), "default")
+        info = cache.info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.size, 1)
+        self.assertEqual(info.maxsize, 2)
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        cache.get(1)
+        cache.put(3, "c")
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertIn(3, cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.info().evictions, 1)
+
+    def test_disabled(self):
+        cache = LRUCache(0)
+        cache.put(1, "a")
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(1))
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.put(1, "a")
+        cache.get(1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info().hits, 1)
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
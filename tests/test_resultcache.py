@@ -0,0 +1,155 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import itertools
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase, mock
+
+from chikkarpy import Chikkar, resultcache
+from chikkarpy.command_line import build_dictionary
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.resultcache import PersistentResultCache, fingerprint
+
+
+class TestPersistentResultCache(TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "results.sqlite")
+        self.cache = PersistentResultCache(self.path, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self.work_dir.cleanup()
+
+    def test_get_many(self):
+        self.cache.put_many("a", False, {("開店", None): ["オープン"], ("閉店", (1, 2)): []})
+        found = self.cache.get_many("a", False, [("開店", None), ("閉店", (1, 2)), ("nothing", None)])
+        self.assertDictEqual(found, {("開店", None): ["オープン"], ("閉店", (1, 2)): []})
+        info = self.cache.info()
+        self.assertEqual((info.hits, info.misses, info.size, info.maxsize), (2, 1, 2, 3))
+
+    def test_keys(self):
+        self.cache.put_many("a", False, {("開店", None): ["オープン"]})
+        self.assertFalse(self.cache.get_many("b", False, [("開店", None)]))
+        self.assertFalse(self.cache.get_many("a", True, [("開店", None)]))
+        self.assertFalse(self.cache.get_many("a", False, [("開店", ())]))
+
+    def test_eviction(self):
+        # a minute passes between the calls
+        clock = mock.Mock(time=mock.Mock(side_effect=itertools.count(0, 100)))
+        with mock.patch.object(resultcache, "time", clock):
+            self.cache.put_many("a", False, {("1", None): ["1"], ("2", None): ["2"], ("3", None): ["3"]})
+            # the least recently used is "2"
+            self.cache.get_many("a", False, [("1", None)])
+            self.cache.get_many("a", False, [("3", None)])
+            self.cache.put_many("a", False, {("4", None): ["4"]})
+        found = self.cache.get_many("a", False, [("1", None), ("2", None), ("3", None), ("4", None)])
+        self.assertCountEqual(found.keys(), [("1", None), ("3", None), ("4", None)])
+        info = self.cache.info()
+        self.assertEqual((info.evictions, info.size), (1, 3))
+
+    def test_size(self):
+        self.cache.put_many("a", False, {("1", None): ["1"], ("2", None): ["2"]})
+        with PersistentResultCache(self.path, max_entries=3) as other:
+            other.put_many("a", False, {("2", None): ["2"], ("3", None): ["3"]})
+        self.cache.put_many("a", False, {("1", None): ["1"]})
+        self.assertEqual(self.cache.info().size, 3)
+        self.cache.put_many("a", False, {("4", None): ["4"], ("5", None): ["5"]})
+        info = self.cache.info()
+        self.assertEqual((info.evictions, info.size), (2, 3))
+        self.assertEqual(self.cache._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0], 3)
+
+    def test_clear(self):
+        self.cache.put_many("a", False, {("開店", None): ["オープン"]})
+        self.cache.clear()
+        self.assertEqual(self.cache.info().size, 0)
+        self.assertFalse(self.cache.get_many("a", False, [("開店", None)]))
+
+    def test_shared_file(self):
+        self.cache.put_many("a", False, {("開店", None): ["オープン"]})
+        with PersistentResultCache(self.path, max_entries=3) as other:
+            self.assertDictEqual(other.get_many("a", False, [("開店", None)]), {("開店", None): ["オープン"]})
+            other.put_many("a", False, {("閉店", None): ["クローズ"]})
+        self.assertDictEqual(self.cache.get_many("a", False, [("閉店", None)]), {("閉店", None): ["クローズ"]})
+
+    def test_schema_version(self):
+        self.cache.put_many("a", False, {("開店", None): ["オープン"]})
+        self.cache.close()
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA user_version = 0")
+        connection.close()
+        self.cache = PersistentResultCache(self.path, max_entries=3)
+        self.assertEqual(self.cache.info().size, 0)
+
+    def test_invalid_max_entries(self):
+        with self.assertRaises(ValueError):
+            PersistentResultCache(self.path, max_entries=0)
+
+
+class TestChikkarWithPersistentResultCache(TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.dic_path = self._build("1,1,0,1,0,0,0,(),開店,,\n1,1,0,2,0,0,0,(),オープン,,\n", "a")
+        self.dictionary = Dictionary(self.dic_path, False)
+        self.chikkar = Chikkar()
+        self.chikkar.add_dictionary(self.dictionary)
+        self.cache = PersistentResultCache(os.path.join(self.work_dir.name, "results.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        for dictionary in self.chikkar._dictionaries:
+            dictionary.close()
+        self.work_dir.cleanup()
+
+    def _build(self, csv, description):
+        csv_path = os.path.join(self.work_dir.name, "system.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(csv)
+        dic_path = os.path.join(self.work_dir.name, "system.dic")
+        build_dictionary(csv_path, dic_path, description)
+        return dic_path
+
+    def test_find_many(self):
+        words = ["開店", "nothing", "開店", "オープン"]
+        expected = [self.chikkar.find(word) for word in words]
+        self.assertListEqual(self.chikkar.find_many(words, persistent_cache=self.cache), expected)
+        self.assertEqual((self.cache.info().misses, self.cache.info().size), (3, 3))
+        self.assertListEqual(self.chikkar.find_many(words, persistent_cache=self.cache), expected)
+        self.assertEqual(self.cache.info().hits, 3)
+
+    def test_find_many_with_group_ids(self):
+        self.assertListEqual(self.chikkar.find_many(["開店"], [[1]], persistent_cache=self.cache), [["オープン"]])
+        with self.assertRaises(ValueError):
+            self.chikkar.find_many(["nothing"], [[1]], persistent_cache=self.cache)
+        self.assertEqual(self.cache.info().size, 1)
+
+    def test_verb_mode(self):
+        self.chikkar.find_many(["開店"], persistent_cache=self.cache)
+        self.chikkar.enable_verb()
+        self.chikkar.find_many(["開店"], persistent_cache=self.cache)
+        self.assertEqual((self.cache.info().hits, self.cache.info().size), (0, 2))
+
+    def test_dictionary_changes(self):
+        key = fingerprint([self.dictionary])
+        self.assertListEqual(self.chikkar.find_many(["開店"], persistent_cache=self.cache), [["オープン"]])
+        self._build("1,1,0,1,0,0,0,(),開店,,\n1,1,0,2,0,0,0,(),店開き,,\n", "b")
+        new_dictionary = self.chikkar.reload(self.dictionary)
+        self.assertNotEqual(fingerprint([new_dictionary]), key)
+        self.assertListEqual(self.chikkar.find_many(["開店"], persistent_cache=self.cache), [["店開き"]])
+        self.assertEqual(self.cache.info().hits, 0)
@@ -0,0 +1,169 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+from unittest import TestCase, mock, skipUnless
+
+from chikkarpy import server
+from chikkarpy.dictionarylib import Dictionary
+from chikkarpy.server import SynonymService, make_server
+
+
+class TestSynonymService(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+        self.service = SynonymService([Dictionary(os.path.join(dict_dir, 'system.dic'), False),
+                                       Dictionary(os.path.join(dict_dir, 'user.dic'), True)])
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_answer(self):
+        answers = self.service.answer([
+            {"word": "開店"},
+            {"word": "open"},
+            {"word": "open", "enable_verb": True},
+            {"word": "開店", "group_ids": [6]},
+            {"word": "nothing", "group_ids": [6]},
+            {"word": 1},
+            "開店",
+            {"word": "開店", "group_ids": [True]},
+        ])
+        self.assertCountEqual(answers[0]["synonyms"], ["始業", "営業開始", "店開き", "オープン", "open"])
+        self.assertCountEqual(answers[1]["synonyms"], ["開放", "オープン"])
+        self.assertCountEqual(answers[2]["synonyms"], ["開放", "開け放す", "開く", "オープン"])
+        self.assertListEqual(answers[3]["synonyms"], answers[0]["synonyms"])
+        self.assertEqual(answers[4]["word"], "nothing")
+        self.assertIn("error", answers[4])
+        self.assertIn("error", answers[5])
+        self.assertIn("error", answers[6])
+        self.assertIn("error", answers[7])
+
+    def test_answer_lines(self):
+        lines = self.service.answer_lines([
+            '{"word": "閉店"}'.encode("utf-8"),
+            '[{"word": "閉店"}, {"word": "nothing"}]'.encode("utf-8"),
+            b'{',
+        ])
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(line.endswith(b"\n") for line in lines))
+        single = json.loads(lines[0].decode("utf-8"))
+        self.assertEqual(single, {"word": "閉店", "synonyms": ["クローズ", "close", "店仕舞い"]})
+        self.assertListEqual(json.loads(lines[1].decode("utf-8")), [single, {"word": "nothing", "synonyms": []}])
+        self.assertIn("error", json.loads(lines[2].decode("utf-8")))
+
+
+class TestSynonymServer(TestCase):
+
+    def setUp(self):
+        dict_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+        self.service = SynonymService([Dictionary(os.path.join(dict_dir, 'system.dic'), False)])
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.service.close()
+
+    def _start(self, **options):
+        self.server = make_server(self.service, workers=2, **options)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def test_http(self):
+        self._start(port=0)
+        connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+        try:
+            for body in ('{"word": "閉店"}\n', '{"word": "閉店"}\n[{"word": "開店"}, {"word": "nothing"}]\n'):
+                connection.request("POST", "/find", body.encode("utf-8"))
+                response = connection.getresponse()
+                self.assertEqual(response.status, 200)
+                # the connection is kept alive
+                self.assertFalse(response.will_close)
+                lines = response.read().decode("utf-8").splitlines()
+                self.assertEqual(len(lines), body.count("\n"))
+                self.assertListEqual(json.loads(lines[0])["synonyms"], ["クローズ", "close", "店仕舞い"])
+            self.assertDictEqual(json.loads(lines[1])[1], {"word": "nothing", "synonyms": []})
+
+            connection.request("POST", "/unknown", b"")
+            response = connection.getresponse()
+            response.read()
+            self.assertEqual(response.status, 404)
+        finally:
+            connection.close()
+
+    def test_http_invalid_content_length(self):
+        self._start(port=0)
+        for length, status in (("-1", 400), ("ten", 400), (str(server.MAX_REQUEST_SIZE + 1), 413)):
+            connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+            try:
+                connection.putrequest("POST", "/find")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                response = connection.getresponse()
+                response.read()
+                self.assertEqual(response.status, status)
+                self.assertTrue(response.will_close)
+            finally:
+                connection.close()
+
+    @skipUnless(hasattr(socket, 'AF_UNIX'), 'requires Unix domain sockets')
+    def test_unix_too_long_line(self):
+        with tempfile.TemporaryDirectory() as work_dir, mock.patch.object(server, "MAX_REQUEST_SIZE", 32):
+            path = os.path.join(work_dir, "chikkarpy.sock")
+            self._start(unix_path=path)
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.settimeout(10)
+            try:
+                client.connect(path)
+                reader = client.makefile("rb")
+                client.sendall('{{"word": "{}"}}\n{{"word": "閉店"}}\n'.format("a" * 80).encode("utf-8"))
+                self.assertDictEqual(json.loads(reader.readline().decode("utf-8")), {"error": "too large"})
+                self.assertDictEqual(json.loads(reader.readline().decode("utf-8")),
+                                     {"word": "閉店", "synonyms": ["クローズ", "close", "店仕舞い"]})
+                reader.close()
+            finally:
+                client.close()
+
+    @skipUnless(hasattr(socket, 'AF_UNIX'), 'requires Unix domain sockets')
+    def test_unix(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "chikkarpy.sock")
+            self._start(unix_path=path)
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.settimeout(10)
+            try:
+                client.connect(path)
+                reader = client.makefile("rb")
+                for _ in range(2):
+                    client.sendall('{"word": "閉店"}\n\n'.encode("utf-8"))
+                    self.assertDictEqual(json.loads(reader.readline().decode("utf-8")),
+                                         {"word": "閉店", "synonyms": ["クローズ", "close", "店仕舞い"]})
+                client.sendall('[{"word": "開店", "group_ids": [6]}]\n'.encode("utf-8"))
+                answers = json.loads(reader.readline().decode("utf-8"))
+                self.assertEqual(len(answers), 1)
+                self.assertEqual(len(answers[0]["synonyms"]), 5)
+                reader.close()
+            finally:
+                client.close()
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.assertFalse(os.path.exists(path))
@@ -0,0 +1,70 @@
+# Copyright (c) 2021 Works Applications Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from chikkarpy.stats import ChikkarStats, DictionaryStats, to_prometheus
+
+
+class TestStats(TestCase):
+
+    def _snapshot(self):
+        stats = ChikkarStats()
+        stats.add_find(0.5)
+        stats.add_merged_probe(True)
+        stats.add_merged_probe(False)
+        dictionary_stats = DictionaryStats()
+        dictionary_stats.add_probe(True, 0.25)
+        dictionary_stats.add_decode(10, 0.125)
+        dictionary_stats.add_expansion()
+        snapshot = stats.snapshot()
+        snapshot["result_cache_hits"] = 3
+        snapshot["result_cache_misses"] = 4
+        dictionary = dictionary_stats.snapshot()
+        dictionary.update(filename='C:\\dic\\"user".dic', group_cache_hits=5, group_cache_misses=6)
+        snapshot["dictionaries"] = [dictionary, None]
+        return snapshot
+
+    def test_counters(self):
+        snapshot = self._snapshot()
+        self.assertEqual(snapshot["finds"], 1)
+        self.assertEqual(snapshot["find_seconds"], 0.5)
+        self.assertEqual((snapshot["merged_index_probes"], snapshot["merged_index_hits"], snapshot["merged_index_misses"]),
+                         (2, 1, 1))
+        dictionary = snapshot["dictionaries"][0]
+        self.assertEqual((dictionary["trie_probes"], dictionary["trie_hits"], dictionary["trie_misses"]), (1, 1, 0))
+        self.assertEqual((dictionary["groups_decoded"], dictionary["bytes_read"]), (1, 10))
+        self.assertEqual(dictionary["expansions"], 1)
+
+    def test_timed_filter(self):
+        stats = ChikkarStats()
+        timed = stats.timed_filter(lambda *args: list(args))
+        self.assertListEqual(timed(1, 2), [1, 2])
+        self.assertGreater(stats.filter_seconds, 0)
+
+    def test_to_prometheus(self):
+        text = to_prometheus(self._snapshot())
+        lines = text.splitlines()
+        self.assertTrue(text.endswith("\n"))
+        self.assertIn("# TYPE chikkarpy_finds_total counter", lines)
+        self.assertIn("chikkarpy_finds_total 1", lines)
+        self.assertIn("chikkarpy_find_seconds_total 0.5", lines)
+        self.assertIn("chikkarpy_result_cache_misses_total 4", lines)
+        self.assertIn('chikkarpy_bytes_read_total{position="0",dictionary="C:\\\\dic\\\\\\"user\\".dic"} 10', lines)
+        self.assertIn('chikkarpy_group_cache_misses_total{position="0",dictionary="C:\\\\dic\\\\\\"user\\".dic"} 6', lines)
+        # a dictionary whose stats are disabled is skipped
+        self.assertFalse([line for line in lines if 'position="1"' in line])
+        for line in lines:
+            if not line.startswith("#"):
+                self.assertRegex(line, r'^chikkarpy_[a-z_]+_total(\{.*\})? [0-9.e-]+$')
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pickle
+from array import array
 from unittest import TestCase
 
 from chikkarpy.dictionarylib.flags import Flags
@@ -51,3 +53,13 @@ class TestSynonymGroup(TestCase):
         self.assertEqual(s.head_word, "aaa")
         s = self.group.lookup("ccc")
         self.assertIsNone(s)
+
+    def test_pickle(self):
+        synonym = Synonym("ccc", array('h', [3, 4]), Flags.from_int(0x83), "cat")
+        group = pickle.loads(pickle.dumps(SynonymGroup(3, [synonym])))
+        self.assertEqual(group.get_id(), 3)
+        s = group.lookup("ccc")
+        self.assertListEqual(s.lexeme_ids.tolist(), [3, 4])
+        self.assertIs(s.flags, Flags.from_int(0x83))
+        self.assertEqual(s.category, "cat")
+        self.assertFalse(hasattr(s, '__dict__'))